@@ -0,0 +1,4 @@
+"""End-to-end sync benchmarks against synthetic document trees and a fake WordPress.
+
+Run from the `python/` directory with `python -m benchmarks --help`.
+"""
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+_API_PREFIX = "/wp-json/"
+_ITEM = re.compile(r"wp/v2/(\w+)/(\d+)")
+_COLLECTION = re.compile(r"wp/v2/(\w+)")
+
+Reply = tuple[int, Any, dict[str, str]] # status, JSON body, extra headers
+
+
+class FakeWordPress:
+    """The slice of the WordPress REST API that sync uses, served on localhost.
+
+    Posts, tags and the batch endpoint are kept in memory. Every HTTP request waits
+    `latency` seconds before it is answered, and is counted by method and route
+    (`POST wp/v2/docs/:id`), so runs can be compared by the requests they send.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests: Counter[str] = Counter()
+        self._posts: dict[int, dict[str, Any]] = {}
+        self._by_key: dict[tuple[str, str], int] = {}
+        self._tags: dict[str, int] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("FakeWordPress is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}{_API_PREFIX}"
+
+    def __enter__(self) -> FakeWordPress:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.wordpress = self # type: ignore[attr-defined]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+    def _allocate_id(self) -> int:
+        post_id = self._next_id
+        self._next_id += 1
+        return post_id
+
+    def handle(self, method: str, route: str, query: dict[str, str], body: Any) -> Reply:
+        """Answer one REST request; route is relative to /wp-json/ without a leading slash"""
+        if route == "batch/v1" and method == "POST":
+            return self._batch(body)
+        if route == "wp/v2/tags":
+            return self._list_tags(query) if method == "GET" else self._create_tag(body)
+
+        item = _ITEM.fullmatch(route)
+        if item is not None:
+            post_id = int(item.group(2))
+            with self._lock:
+                if post_id not in self._posts:
+                    return 404, {"code": "rest_post_invalid_id"}, {}
+                if method == "DELETE":
+                    del self._posts[post_id]
+                    return 200, {"deleted": True, "previous": {"id": post_id}}, {}
+                self._posts[post_id].update(_stored(body))
+                return 200, {"id": post_id}, {}
+
+        collection = _COLLECTION.fullmatch(route)
+        if collection is not None:
+            content_type = collection.group(1)
+            if method == "GET":
+                return self._list_posts(content_type, query)
+            with self._lock:
+                post_id = self._allocate_id()
+                post = {"type": content_type, **_stored(body)}
+                self._posts[post_id] = post
+                self._by_key[(content_type, post["document_key"])] = post_id
+            return 201, {"id": post_id}, {}
+
+        return 404, {"code": "rest_no_route"}, {}
+
+    def _list_posts(self, content_type: str, query: dict[str, str]) -> Reply:
+        with self._lock:
+            if "meta_value" in query:
+                post_id = self._by_key.get((content_type, query["meta_value"]))
+                return 200, [{"id": post_id}] if post_id in self._posts else [], {}
+            posts = [
+                {"id": post_id, "meta": {"document_key": post["document_key"], "document_hash": post["document_hash"]}}
+                for post_id, post in self._posts.items() if post["type"] == content_type
+            ]
+        return _page(posts, query)
+
+    def _list_tags(self, query: dict[str, str]) -> Reply:
+        with self._lock:
+            tags = [{"id": tag_id, "name": slug, "slug": slug} for slug, tag_id in self._tags.items()]
+        return _page(tags, query)
+
+    def _create_tag(self, body: Any) -> Reply:
+        name = str(body["name"])
+        with self._lock:
+            if name in self._tags:
+                return 400, {"code": "term_exists", "data": {"term_id": self._tags[name]}}, {}
+            tag_id = self._tags[name] = self._allocate_id()
+        return 201, {"id": tag_id, "name": name, "slug": name}, {}
+
+    def _batch(self, body: Any) -> Reply:
+        responses = []
+        for sub in body["requests"]:
+            status, payload, _ = self.handle(sub["method"], sub["path"].lstrip("/"), {}, sub.get("body"))
+            responses.append({"status": status, "body": payload})
+        return 207, {"responses": responses}, {}
+
+
+def _stored(body: Any) -> dict[str, Any]:
+    meta = (body or {}).get("meta") or {}
+    return {"document_key": str(meta.get("document_key", "")), "document_hash": meta.get("document_hash")}
+
+
+def _page(items: list[Any], query: dict[str, str]) -> Reply:
+    per_page = int(query.get("per_page", 10))
+    page = int(query.get("page", 1))
+    total_pages = max(1, -(-len(items) // per_page))
+    return 200, items[(page - 1) * per_page:page * per_page], {"X-WP-TotalPages": str(total_pages)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep connections alive, as a real server would
+    # Headers and body go out in separate writes; with Nagle on, each response would
+    # stall on the client's delayed ACK and swamp the latency being measured
+    disable_nagle_algorithm = True
+
+    def _respond(self) -> None:
+        wordpress: FakeWordPress = self.server.wordpress # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        route = url.path.removeprefix(_API_PREFIX).strip("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        pattern = _ITEM.sub(r"wp/v2/\1/:id", route)
+        with wordpress._lock:
+            wordpress.requests[f"{self.command} {pattern}"] += 1
+        if wordpress.latency:
+            time.sleep(wordpress.latency)
+
+        status, payload, headers = wordpress.handle(self.command, route, query, body)
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _respond
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
@@ -0,0 +1,202 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from d2cms.config import D2CMSConfig
+from d2cms.wordpress import sync
+
+from .fake_wordpress import FakeWordPress
+from .trees import SHAPES, Shape, edit_tree, generate_tree
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None # type: ignore[assignment]
+
+# Each case syncs a fresh tree (every document is created), then again with nothing
+# changed, then after editing EDIT_FRACTION of the documents
+PHASES = ("cold", "noop", "edit")
+EDIT_FRACTION = 0.1
+
+
+@dataclass(frozen=True)
+class Settings:
+    latency_ms: float = 2.0
+    workers: int = 4
+    batch_size: int = 0
+    jobs: int = 1
+
+
+@dataclass(frozen=True)
+class PhaseResult:
+    documents: int
+    wall_s: float
+    docs_per_s: float
+    requests: int
+    requests_per_doc: float
+    requests_by_endpoint: dict[str, int]
+    sync_phases: dict[str, float] # seconds per SyncReport phase, summed across workers
+    failures: int
+    peak_rss_mb: float | None # of the whole process so far, fake server included
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(shape: Shape, count: int, settings: Settings) -> dict[str, PhaseResult]:
+    """Generate one tree and time each phase of syncing it to a fresh FakeWordPress"""
+    results: dict[str, PhaseResult] = {}
+    with tempfile.TemporaryDirectory(prefix="d2cms-bench-") as tmp, FakeWordPress(settings.latency_ms / 1000) as wordpress:
+        docs_dir = Path(tmp)
+        paths = generate_tree(docs_dir, shape, count)
+        cfg = D2CMSConfig(
+            wp_api_root=wordpress.url,
+            wp_api_key="benchmark",
+            wp_api_user="benchmark",
+            docs_dir=docs_dir,
+            auth_mode="token",
+        )
+
+        for phase in PHASES:
+            if phase == "edit":
+                edit_tree(paths, EDIT_FRACTION)
+            before = wordpress.requests.copy()
+            started = time.perf_counter()
+            report = sync(cfg, workers=settings.workers, jobs=settings.jobs, batch_size=settings.batch_size)
+            wall_s = time.perf_counter() - started
+
+            sent = wordpress.requests - before
+            requests = sum(sent.values())
+            results[phase] = PhaseResult(
+                documents=count,
+                wall_s=round(wall_s, 3),
+                docs_per_s=round(count / wall_s, 1),
+                requests=requests,
+                requests_per_doc=round(requests / count, 3),
+                requests_by_endpoint=dict(sorted(sent.items())),
+                sync_phases={name: round(timing.seconds, 3) for name, timing in report.phases.items()},
+                failures=report.failure_count,
+                peak_rss_mb=_peak_rss_mb(),
+            )
+    return results
+
+
+def _run_isolated(shape: Shape, count: int, settings: Settings) -> dict[str, PhaseResult]:
+    # A process per case, so peak RSS and warm caches never carry over between cases
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, shape, count, settings).result()
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Describe each case and phase that got slower than tolerance allows, or sends more requests
+
+    Throughput varies between machines and runs; request counts do not, so any
+    increase in requests per document is a regression.
+    """
+    regressions = []
+    for case, phases in results["cases"].items():
+        for phase, result in phases.items():
+            expected = baseline["cases"].get(case, {}).get(phase)
+            if expected is None:
+                continue
+            if result["docs_per_s"] < expected["docs_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"{case} {phase}: {result['docs_per_s']} docs/s, baseline {expected['docs_per_s']} "
+                    f"({result['docs_per_s'] / expected['docs_per_s'] - 1:+.0%})"
+                )
+            if result["requests_per_doc"] > expected["requests_per_doc"]:
+                regressions.append(
+                    f"{case} {phase}: {result['requests_per_doc']} requests/doc, "
+                    f"baseline {expected['requests_per_doc']}"
+                )
+    return regressions
+
+
+def _counts(value: str) -> list[int]:
+    counts = [int(part) for part in value.split(",")]
+    if any(count < 1 for count in counts):
+        raise argparse.ArgumentTypeError("document counts must be at least 1")
+    return counts
+
+
+def _shapes(value: str) -> list[Shape]:
+    shapes = value.split(",")
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown shape(s): {', '.join(unknown)}; choose from {', '.join(SHAPES)}")
+    return shapes # type: ignore[return-value]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time sync() end to end against synthetic trees and an in-process fake WordPress",
+    )
+    parser.add_argument("--shapes", type=_shapes, default=list(SHAPES), help=f"Comma-separated tree shapes (default: {','.join(SHAPES)})")
+    parser.add_argument("--docs", type=_counts, default=[100, 1000], help="Comma-separated document counts per tree (default: 100,1000)")
+    parser.add_argument("--latency-ms", type=float, default=Settings.latency_ms, help=f"Delay before the fake WordPress answers each request (default: {Settings.latency_ms})")
+    parser.add_argument("--workers", type=int, default=Settings.workers, help=f"sync --workers (default: {Settings.workers})")
+    parser.add_argument("--batch-size", type=int, default=Settings.batch_size, help="sync --batch-size (default: off)")
+    parser.add_argument("--jobs", type=int, default=Settings.jobs, help=f"sync --jobs (default: {Settings.jobs})")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with results saved by an earlier --output; none is shipped")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed drop in docs/s against the baseline (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    settings = Settings(args.latency_ms, args.workers, args.batch_size, args.jobs)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    if baseline is not None and baseline["settings"] != asdict(settings):
+        print(f"Error: {args.baseline} was recorded with different settings: {baseline['settings']}", file=sys.stderr)
+        sys.exit(2)
+
+    results: dict[str, Any] = {
+        "settings": asdict(settings),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": multiprocessing.cpu_count()},
+        "cases": {},
+    }
+    print(f"{'case':<16}{'phase':<7}{'docs/s':>10}{'req/doc':>9}{'wall s':>9}{'RSS MB':>9}")
+    for shape in args.shapes:
+        for count in args.docs:
+            case = f"{shape}-{count}"
+            phases = _run_isolated(shape, count, settings)
+            results["cases"][case] = {phase: asdict(result) for phase, result in phases.items()}
+            for phase, result in phases.items():
+                rss = f"{result.peak_rss_mb:.0f}" if result.peak_rss_mb is not None else "-"
+                failed = f"  ({result.failures} failed)" if result.failures else ""
+                print(
+                    f"{case:<16}{phase:<7}{result.docs_per_s:>10.1f}{result.requests_per_doc:>9.2f}"
+                    f"{result.wall_s:>9.2f}{rss:>9}{failed}"
+                )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        if baseline.get("environment") != results["environment"]:
+            print(
+                f"Warning: {args.baseline} was recorded in another environment ({baseline.get('environment')}); "
+                "docs/s comparisons may not be meaningful",
+                file=sys.stderr,
+            )
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
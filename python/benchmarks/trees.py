@@ -0,0 +1,104 @@
+import random
+import uuid
+from pathlib import Path
+from typing import Literal, get_args
+
+Shape = Literal["flat", "nested", "tagged", "large"]
+SHAPES: tuple[Shape, ...] = get_args(Shape)
+
+# nested: this many top-level documents, each parent holding this many children
+_ROOTS = 8
+_FANOUT = 8
+# tagged: tags per document, drawn from a pool that grows with the tree
+_TAGS_PER_DOC = 10
+_WORDS = (
+    "sync", "post", "page", "document", "tree", "parent", "child", "render", "markdown",
+    "frontmatter", "hash", "state", "request", "batch", "token", "worker", "queue", "index",
+    "cache", "slug", "title", "content", "table", "list", "code", "heading", "link", "image",
+)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 16))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 6)))
+
+
+def _body(rng: random.Random, sections: int) -> str:
+    """Markdown with the block types documents actually use"""
+    parts = []
+    for n in range(sections):
+        parts.append(f"## Section {n + 1}\n\n{_paragraph(rng)}\n\n{_paragraph(rng)}")
+        kind = n % 3
+        if kind == 0:
+            parts.append("\n".join(f"- {_sentence(rng)}" for _ in range(4)))
+        elif kind == 1:
+            parts.append("```python\n" + "\n".join(
+                f"{rng.choice(_WORDS)}_{i} = {rng.randint(0, 999)}" for i in range(6)
+            ) + "\n```")
+        else:
+            rows = "\n".join(f"| {rng.choice(_WORDS)} | {rng.randint(0, 99)} |" for _ in range(5))
+            parts.append(f"| name | value |\n| --- | --- |\n{rows}")
+    return "\n\n".join(parts) + "\n"
+
+
+def _write(
+    file_path: Path,
+    document_key: uuid.UUID,
+    rng: random.Random,
+    sections: int,
+    parent_key: uuid.UUID | None = None,
+    tags: list[str] | None = None,
+) -> None:
+    slug = file_path.stem
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        f"---\ndocument_key: {document_key}\ntitle: {slug.replace('-', ' ').title()}\nslug: {slug}\n"
+        f"order: 0\nparent_key: {parent_key or ''}\ntags: [{', '.join(tags or [])}]\n"
+        f"wordpress_id: \ndocument_hash: \n---\n\n{_body(rng, sections)}"
+    )
+
+
+def generate_tree(docs_dir: Path, shape: Shape, count: int, seed: int = 0) -> list[Path]:
+    """Write `count` never-synced documents of the given shape under docs_dir/docs
+
+    flat: one directory of short documents. nested: parents with children several
+    levels deep. tagged: flat, with many tags per document from a large pool.
+    large: flat, with documents of roughly 50 KB each. The same seed always writes
+    the same tree.
+    """
+    rng = random.Random(seed)
+    root = docs_dir / "docs"
+    sections = 60 if shape == "large" else 2
+    tag_pool = [f"tag-{n}" for n in range(max(20, count // 5))]
+
+    paths: list[Path] = []
+    keys: list[uuid.UUID] = []
+    for n in range(count):
+        document_key = uuid.UUID(int=rng.getrandbits(128), version=4)
+        parent_key = None
+        if shape == "nested" and n >= _ROOTS:
+            parent = (n - _ROOTS) // _FANOUT
+            file_path = paths[parent].with_suffix("") / f"doc-{n}.md"
+            parent_key = keys[parent]
+        else:
+            file_path = root / f"doc-{n}.md"
+        tags = rng.sample(tag_pool, _TAGS_PER_DOC) if shape == "tagged" else None
+
+        _write(file_path, document_key, rng, sections, parent_key, tags)
+        paths.append(file_path)
+        keys.append(document_key)
+    return paths
+
+
+def edit_tree(paths: list[Path], fraction: float, seed: int = 0) -> list[Path]:
+    """Append a paragraph to a random `fraction` of the documents, as a day of edits might"""
+    rng = random.Random(seed)
+    edited = rng.sample(paths, max(1, int(len(paths) * fraction)))
+    for file_path in edited:
+        with file_path.open("a") as f:
+            f.write(f"\n{_paragraph(rng)}\n")
+    return edited
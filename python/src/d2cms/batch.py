@@ -0,0 +1,66 @@
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import httpx
+from httpx import Client
+
+from .http import IDEMPOTENT
+
+logger = logging.getLogger(__name__)
+
+# WordPress' default limit on sub-requests per call (filterable server-side)
+MAX_BATCH_SIZE = 25
+
+
+class BatchError(RuntimeError):
+    """Raised when a batch response cannot be matched to the requests that were sent"""
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    method: str
+    path: str # relative to the API root, as passed to the client (e.g. "wp/v2/docs/12")
+    body: dict[str, object] | None = None
+
+
+def send_batch(client: Client, requests: Sequence[BatchRequest]) -> list[httpx.Response]:
+    """Send requests in one call to the REST batch endpoint (`batch/v1`, WordPress 5.6+).
+
+    Sub-requests run independently, so one failing does not stop the rest. Each
+    sub-response is returned in request order as an `httpx.Response`, to be handled
+    exactly as if its request had been sent alone. The call is only resent after a
+    transient failure if no sub-request creates anything.
+    """
+    if not requests:
+        return []
+    if len(requests) > MAX_BATCH_SIZE:
+        raise ValueError(f"at most {MAX_BATCH_SIZE} requests fit in one batch, got {len(requests)}")
+
+    payload = {
+        "validation": "normal",
+        "requests": [
+            {"method": r.method, "path": f"/{r.path}", **({"body": r.body} if r.body is not None else {})}
+            for r in requests
+        ],
+    }
+    # A POST to a collection creates a post; one to an item (wp/v2/docs/12) updates it
+    creates = any(r.method == "POST" and not r.path.rstrip("/").split("/")[-1].isdigit() for r in requests)
+
+    logger.debug("[batch] POST batch/v1 (%d request(s))", len(requests))
+    response = client.post("batch/v1", json=payload, extensions={} if creates else {IDEMPOTENT: True})
+    response.raise_for_status()
+
+    results = response.json().get("responses")
+    if not isinstance(results, list) or len(results) != len(requests):
+        count = len(results) if isinstance(results, list) else 0
+        raise BatchError(f"batch/v1 returned {count} response(s) for {len(requests)} request(s)")
+
+    return [
+        httpx.Response(
+            int(result.get("status", 500)),
+            json=result.get("body"),
+            request=client.build_request(request.method, request.path),
+        )
+        for request, result in zip(requests, results, strict=True)
+    ]
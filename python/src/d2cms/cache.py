@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import TracebackType
+
+from .state import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_FILE = "render-cache.sqlite3"
+DEFAULT_RENDER_CACHE_MB = 64
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS renders (
+    key TEXT PRIMARY KEY,
+    html TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used_ns INTEGER NOT NULL
+)
+"""
+
+
+class RenderCache:
+    """Content-addressed store of rendered HTML, shared across runs.
+
+    Lives in `.d2cms/render-cache.sqlite3` under the docs directory. Keys come from
+    `docs.render_key()`, so an entry is never stale — it is only ever evicted, least
+    recently used first, once the cache grows past `max_bytes`. New entries and hits
+    are kept in memory and written back in one transaction on close.
+    """
+
+    def __init__(self, docs_dir: Path, max_bytes: int = DEFAULT_RENDER_CACHE_MB * 1024 * 1024) -> None:
+        self._path = docs_dir / STATE_DIR / RENDER_CACHE_FILE
+        self._max_bytes = max_bytes
+        self._conn: sqlite3.Connection | None = None
+        self._added: dict[str, str] = {}
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> RenderCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS renders")
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection | None:
+        if self._conn is None and self._path.exists():
+            try:
+                self._conn = self._connect()
+            except sqlite3.DatabaseError as e:
+                logger.warning("[cache] ignoring unreadable render cache %s — %s", self._path, e)
+                self._path.unlink(missing_ok=True)
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            html = self._added.get(key)
+            if html is None and (conn := self._reader()) is not None:
+                row = conn.execute("SELECT html FROM renders WHERE key = ?", (key,)).fetchone()
+                html = row[0] if row else None
+
+            if html is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._used.add(key)
+            return html
+
+    def put(self, key: str, html: str) -> None:
+        with self._lock:
+            self._added[key] = html
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM renders ORDER BY used_ns"):
+            if total <= self._max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM renders WHERE key = ?", evicted)
+        logger.debug("[cache] evicted %d rendered document(s)", len(evicted))
+
+    def flush(self) -> None:
+        """Write renders and hits so far to disk, then evict down to the size cap."""
+        with self._lock:
+            if not (self._added or self._used):
+                return
+            if self._conn is None:
+                self._path.parent.mkdir(exist_ok=True)
+                self._conn = self._connect()
+
+            now = time.time_ns()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE renders SET used_ns = ? WHERE key = ?",
+                    [(now, key) for key in self._used],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?)",
+                    [(key, html, len(html.encode()), now) for key, html in self._added.items()],
+                )
+                self._evict(self._conn)
+            self._added.clear()
+            self._used.clear()
+
+    def close(self) -> None:
+        """Write this run's renders and hits to disk, then evict down to the size cap."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
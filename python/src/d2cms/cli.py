@@ -1,14 +1,30 @@
 import argparse
+import contextlib
+import json
 import logging
 import sys
+from dataclasses import replace
 from datetime import datetime
+from pathlib import Path
 
-import frontmatter
 from dotenv import load_dotenv
 
-from d2cms.config import ConfigError, load_config_from_env
-from d2cms.docs import ContentType, generate_template_doc, reparent_and_relocate_children
-from d2cms.wordpress import sync
+from d2cms.batch import MAX_BATCH_SIZE
+from d2cms.config import ConfigError, D2CMSConfig, load_config_from_env
+from d2cms.deprecate import (
+    DeprecateError,
+    apply_deprecation,
+    pending_journal,
+    plan_deprecation,
+    resume_deprecation,
+    rollback_deprecation,
+)
+from d2cms.docs import ContentType, generate_template_doc
+from d2cms.gitdiff import GitDiffError
+from d2cms.plan import ACTIONS
+from d2cms.remote import ReconcileError
+from d2cms.report import REPORT_FORMATS, ReportStream, SyncReport
+from d2cms.wordpress import gc, plan_sync, rehash, sync, watch
 
 
 def _cmd_add_doc(args: argparse.Namespace) -> None:
@@ -38,6 +54,34 @@ def _cmd_add_doc(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def _read_path_list(list_file: Path) -> list[str]:
+    """Paths or globs from a --from-file list, one per line; blank lines and # comments are skipped"""
+    lines = sys.stdin.read().splitlines() if str(list_file) == "-" else list_file.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _deprecation_targets(docs_dir: Path, patterns: list[str]) -> list[Path]:
+    """Expand paths, globs and directories relative to docs_dir into the documents they name"""
+    root = docs_dir.resolve()
+    targets: set[Path] = set()
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = [path for path in docs_dir.glob(pattern) if path.suffix == ".md" and path.is_file()]
+        elif (docs_dir / pattern).is_dir():
+            matches = [path for path in (docs_dir / pattern).rglob("*.md") if path.is_file()]
+        else:
+            matches = [docs_dir / pattern] if (docs_dir / pattern).is_file() else []
+        if not matches:
+            print(f"Error: file not found: {docs_dir / pattern}", file=sys.stderr)
+            sys.exit(1)
+        for path in matches:
+            if not path.resolve().is_relative_to(root) or path.suffix != ".md":
+                print(f"Error: not a document under D2CMS_DOCS_DIR: {path}", file=sys.stderr)
+                sys.exit(1)
+            targets.add(path)
+    return sorted(targets)
+
+
 def _cmd_deprecate(args: argparse.Namespace) -> None:
     try:
         config = load_config_from_env()
@@ -45,19 +89,48 @@ def _cmd_deprecate(args: argparse.Namespace) -> None:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    file_path = config.docs_dir / args.path
+    try:
+        if args.resume:
+            left = resume_deprecation(config.docs_dir)
+            print(f"Resumed the interrupted deprecation; {left} step(s) were left.")
+            return
+        if args.rollback:
+            undone = rollback_deprecation(config.docs_dir)
+            print(f"Rolled back the interrupted deprecation ({undone} step(s) undone).")
+            return
+    except DeprecateError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    journal = pending_journal(config.docs_dir)
+    if journal is not None:
+        print(
+            f"Error: an interrupted deprecation left {journal}; "
+            "run `d2cms deprecate --resume` or `--rollback` first",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
-    if not file_path.exists():
-        print(f"Error: file not found: {file_path}", file=sys.stderr)
+    patterns = list(args.paths)
+    if args.from_file:
+        patterns.extend(_read_path_list(args.from_file))
+    if not patterns:
+        print("Error: give the documents to deprecate as paths, globs or --from-file", file=sys.stderr)
         sys.exit(1)
 
-    post = frontmatter.load(file_path)
-    post.metadata["deprecated"] = True
-    with file_path.open("w") as f:
-        f.write(frontmatter.dumps(post))
+    plan = plan_deprecation(config.docs_dir, _deprecation_targets(config.docs_dir, patterns))
+    if plan.collisions:
+        print(f"Error: {len(plan.collisions)} relocation(s) would collide; nothing was changed:", file=sys.stderr)
+        for target, sources in plan.collisions.items():
+            landing = ", ".join(str(source.relative_to(config.docs_dir)) for source in sources)
+            print(f"  {target.relative_to(config.docs_dir)} <- {landing}", file=sys.stderr)
+        sys.exit(1)
 
-    reparent_and_relocate_children(file_path)
-    print(f"Deprecated: {file_path}")
+    apply_deprecation(plan)
+    for file_path in plan.deprecated:
+        print(f"Deprecated: {file_path}")
+    if plan.moves:
+        print(f"Moved {len(plan.moves)} item(s) up out of the deprecated documents' directories.")
 
 
 def _cmd_sync(args: argparse.Namespace) -> None:
@@ -70,22 +143,265 @@ def _cmd_sync(args: argparse.Namespace) -> None:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    config = _with_globs(config, args)
     path = config.docs_dir / args.path if args.path else None
-    report = sync(config, force=args.force, path=path)
+    if args.plan:
+        _print_plan(config, path, args)
+        return
+    if args.json:
+        print("Error: --json is only used with --plan", file=sys.stderr)
+        sys.exit(1)
+
+    report_dir = config.docs_dir / "d2cms-sync-results"
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    # Rows are written as documents finish, so a large run never holds them all in memory
+    stream = ReportStream(
+        report_dir / f"{timestamp}.{args.report_format}", args.report_format, include_outcomes=args.report_all
+    )
+    try:
+        with stream:
+            report = sync(
+                config,
+                force=args.force,
+                path=path,
+                workers=args.workers,
+                rescan=args.rescan,
+                since=args.since,
+                jobs=args.jobs,
+                batch_size=args.batch_size,
+                reconcile=args.reconcile,
+                report=SyncReport(stream),
+            )
+    except GitDiffError as e:
+        print(f"Error: --since {args.since}: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ReconcileError as e:
+        print(f"Error: --reconcile: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    outcomes = report.outcomes
+    if outcomes:
+        print(
+            f"Created {outcomes.get('created', 0)}, updated {outcomes.get('updated', 0)}, "
+            f"skipped {outcomes.get('skipped', 0)}, deleted {outcomes.get('deleted', 0)} document(s)."
+        )
+
+    reconciled = report.reconciled
+    if reconciled:
+        print(
+            f"Reconciled with WordPress: adopted {reconciled.get('adopted', 0)} existing post(s); "
+            f"{reconciled.get('current', 0)} document(s) were already up to date remotely."
+        )
+
+    if report.retry_count:
+        reasons = ", ".join(f"{reason}: {n}" for reason, n in sorted(report.retries_by_reason.items()))
+        print(f"Retried {report.retry_count} request(s) ({reasons}).", file=sys.stderr)
 
+    throttle = report.throttle
+    if throttle is not None:
+        notes = []
+        if throttle.throttled:
+            notes.append(f"{throttle.throttled} throttled response(s)")
+        if throttle.decreases:
+            notes.append(f"concurrency limit {throttle.limit} (lowest {throttle.lowest_limit})")
+        if throttle.rate_waits:
+            notes.append(f"{throttle.rate_wait_seconds:.1f}s waiting for D2CMS_MAX_RPS")
+        if notes:
+            print(f"Throttling: {'; '.join(notes)}.", file=sys.stderr)
+
+    if args.metrics:
+        report_dir.mkdir(exist_ok=True)
+        report.write_json(report_dir / f"{timestamp}.json")
+        # One fixed name, so a textfile collector always reads the latest run
+        report.write_prometheus(report_dir / "d2cms_sync.prom")
+        print(f"Metrics written to {report_dir / f'{timestamp}.json'} and {report_dir / 'd2cms_sync.prom'}")
 
     if report.has_failures:
         print(f"{report.failure_count} document(s) failed to sync.", file=sys.stderr)
-        
-        report_dir = config.docs_dir / "d2cms-sync-results"
-        report_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
-        report_path = report_dir / f"{timestamp}.csv"
-        report.write_csv(report_path)
-    
-        print(f"Sync report written to {report_path}")
+
+    if stream.rows:
+        print(f"Sync report written to {stream.path}")
+    if report.has_failures:
+        sys.exit(1)
+
+
+def _print_plan(config: D2CMSConfig, path: Path | None, args: argparse.Namespace) -> None:
+    if args.since or args.reconcile:
+        print("Error: --plan cannot be combined with --since or --reconcile", file=sys.stderr)
+        sys.exit(1)
+
+    sync_plan = plan_sync(config, force=args.force, path=path, batch_size=args.batch_size)
+    if args.json:
+        print(json.dumps(sync_plan.to_dict(), indent=2))
+        return
+
+    print("Sync plan (nothing was sent to WordPress):")
+    print(f"  {'':<12}" + "".join(f"{action:>9}" for action in ACTIONS))
+    rows = {**sync_plan.counts_by_content_type(), "total": sync_plan.counts()}
+    for content_type, counts in rows.items():
+        print(f"  {content_type:<12}" + "".join(f"{counts[action]:>9}" for action in ACTIONS))
+
+    requests = sync_plan.requests
+    writes = (
+        f"{requests.batch} batch call(s) for {requests.post} POST and {requests.delete} DELETE"
+        if requests.batch else f"{requests.post} POST, {requests.delete} DELETE"
+    )
+    print(
+        f"Estimated requests: {requests.total} ({writes}, {requests.parent_lookup} parent lookup(s), "
+        f"{requests.tag_listing} tag listing, up to {requests.tag_create} tag create(s))"
+    )
+
+    blocked = [document for document in sync_plan.documents if document.action == "blocked"]
+    if blocked:
+        print(f"{len(blocked)} document(s) cannot be synced:")
+        for document in blocked:
+            print(f"  {document.path}: {document.reason}")
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def _with_globs(config: D2CMSConfig, args: argparse.Namespace) -> D2CMSConfig:
+    return replace(config, include=tuple(args.include or ()), exclude=tuple(args.exclude or ()))
+
+
+def _add_glob_arguments(cmd: argparse.ArgumentParser) -> None:
+    cmd.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Only sync documents matching this glob, relative to D2CMS_DOCS_DIR (repeatable)",
+    )
+    cmd.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="Skip documents and directories matching this glob, as in .d2cmsignore (repeatable)",
+    )
+
+
+def _batch_size(value: str) -> int:
+    number = _positive_int(value)
+    if number > MAX_BATCH_SIZE:
+        raise argparse.ArgumentTypeError(f"WordPress accepts at most {MAX_BATCH_SIZE} requests per batch")
+    return number
+
+
+def _cmd_rehash(args: argparse.Namespace) -> None:
+    log_level = logging.DEBUG if args.debug else logging.INFO
+    logging.basicConfig(level=log_level, format="%(message)s")
+
+    try:
+        config = load_config_from_env()
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    path = config.docs_dir / args.path if args.path else None
+    summary = rehash(config, path=path)
+
+    print(f"Rehashed {summary.rewritten} document(s); {summary.current} already current.")
+    if summary.changed:
+        print(
+            f"{len(summary.changed)} document(s) changed since their last sync and were left "
+            "as-is; run `d2cms sync` to update them:"
+        )
+        for file_path in summary.changed:
+            print(f"  {file_path.relative_to(config.docs_dir)}")
+    if summary.failed:
+        print(f"{len(summary.failed)} document(s) could not be read.", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_gc(args: argparse.Namespace) -> None:
+    log_level = logging.DEBUG if args.debug else logging.INFO
+    logging.basicConfig(level=log_level, format="%(message)s")
+
+    try:
+        config = load_config_from_env()
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        summary = gc(config, apply=args.apply, workers=args.workers, batch_size=args.batch_size)
+    except ReconcileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not summary.orphans:
+        print("No orphaned posts.")
+    else:
+        print(f"Found {len(summary.orphans)} orphaned post(s):")
+        for orphan in summary.orphans:
+            note = " (duplicate)" if orphan.duplicate else ""
+            print(f"  {orphan.content_type} id={orphan.wordpress_id} document_key={orphan.document_key}{note}")
+
+    if summary.unreadable:
+        print(
+            f"{len(summary.unreadable)} document(s) could not be read, so their posts may look "
+            "orphaned; nothing was trashed:",
+            file=sys.stderr,
+        )
+        for file_path in summary.unreadable:
+            print(f"  {file_path.relative_to(config.docs_dir)}", file=sys.stderr)
+        sys.exit(1)
+
+    if not args.apply:
+        if summary.orphans:
+            print("Run `d2cms gc --apply` to move them to the trash.")
+        return
+
+    print(f"Trashed {len(summary.trashed)} post(s).")
+    if summary.failed:
+        print(f"{len(summary.failed)} post(s) could not be trashed:", file=sys.stderr)
+        for orphan, error in summary.failed:
+            print(f"  {orphan.content_type} id={orphan.wordpress_id}: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_watch(args: argparse.Namespace) -> None:
+    log_level = logging.DEBUG if args.debug else logging.INFO
+    logging.basicConfig(level=log_level, format="%(message)s")
+
+    try:
+        config = load_config_from_env()
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    config = _with_globs(config, args)
+
+    def _synced(report: SyncReport, paths: set[Path] | None) -> None:
+        what = "Initial sync" if paths is None else f"Synced {len(paths)} changed path(s)"
+        if report.has_failures:
+            print(f"{what}: {report.failure_count} document(s) failed to sync.", file=sys.stderr)
+        else:
+            print(f"{what}: done.")
+
+    path = config.docs_dir / args.path if args.path else None
+    with contextlib.suppress(KeyboardInterrupt):
+        watch(
+            config,
+            path=path,
+            workers=args.workers,
+            debounce=args.debounce,
+            polling=args.poll,
+            on_sync=_synced,
+        )
+    print("Stopped.")
+
+
+def _seconds(value: str) -> float:
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("must not be negative")
+    return number
+
 
 def main() -> None:
     load_dotenv()
@@ -108,16 +424,142 @@ def main() -> None:
     add_doc.add_argument("--tags", metavar="TAGS", help="Comma-delimited list of tags to assign to the document")
 
     deprecate_cmd = subparsers.add_parser(
-        "deprecate", help="Mark a document as deprecated and relocate its children"
+        "deprecate", help="Mark documents as deprecated and relocate their children"
+    )
+    deprecate_cmd.add_argument(
+        "paths",
+        nargs="*",
+        metavar="path",
+        help="Documents, globs or directories relative to D2CMS_DOCS_DIR (a directory means every document in it)",
     )
     deprecate_cmd.add_argument(
-        "path", help="Path to the document relative to D2CMS_DOCS_DIR"
+        "--from-file", type=Path, metavar="FILE", help="Read more paths or globs from FILE, one per line ('-' for stdin)"
     )
+    recovery = deprecate_cmd.add_mutually_exclusive_group()
+    recovery.add_argument("--resume", action="store_true", help="Finish a deprecation that was interrupted")
+    recovery.add_argument("--rollback", action="store_true", help="Undo what an interrupted deprecation changed")
 
     sync_cmd = subparsers.add_parser("sync", help="Sync all documents in D2CMS_DOCS_DIR to WordPress")
     sync_cmd.add_argument("--debug", action="store_true", help="Enable debug logging")
     sync_cmd.add_argument("--force", action="store_true", help="Sync all documents regardless of content hash")
     sync_cmd.add_argument("--path", help="Subdirectory relative to D2CMS_DOCS_DIR to sync")
+    sync_cmd.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Sync up to N documents concurrently; children wait for their parent (default: 1)",
+    )
+    sync_cmd.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore and rebuild the local sync state, re-reading every document",
+    )
+    sync_cmd.add_argument(
+        "--since",
+        metavar="REF",
+        help="Only sync markdown files added, modified, renamed or deleted since this git ref",
+    )
+    sync_cmd.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Parse, hash and render documents in N processes before syncing (default: 1)",
+    )
+    sync_cmd.add_argument(
+        "--batch-size",
+        type=_batch_size,
+        default=0,
+        metavar="N",
+        help=f"Send up to N creates, updates and deletes per REST batch call (max {MAX_BATCH_SIZE}; "
+        "requires WordPress 5.6+; default: off)",
+    )
+
+    sync_cmd.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="List every post on WordPress first, adopting existing posts for documents "
+        "that lost their wordpress_id and skipping those WordPress already has",
+    )
+
+    sync_cmd.add_argument(
+        "--plan",
+        action="store_true",
+        help="Show what sync would do and the requests it would send, without contacting WordPress",
+    )
+    sync_cmd.add_argument("--json", action="store_true", help="With --plan, print the plan as JSON")
+    sync_cmd.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Write per-phase timings and per-endpoint request metrics to d2cms-sync-results/ "
+        "as JSON and as a Prometheus textfile",
+    )
+    sync_cmd.add_argument(
+        "--report-format",
+        choices=REPORT_FORMATS,
+        default="csv",
+        help="Format of the sync report in d2cms-sync-results/ (default: csv)",
+    )
+    sync_cmd.add_argument(
+        "--report-all",
+        action="store_true",
+        help="Add a row to the sync report for every created, updated, skipped and deleted "
+        "document, not just failures",
+    )
+    _add_glob_arguments(sync_cmd)
+
+    rehash_cmd = subparsers.add_parser(
+        "rehash", help="Rewrite stored document hashes in the current format (no network calls)"
+    )
+    rehash_cmd.add_argument("--debug", action="store_true", help="Enable debug logging")
+    rehash_cmd.add_argument("--path", help="Subdirectory relative to D2CMS_DOCS_DIR to rehash")
+
+    gc_cmd = subparsers.add_parser(
+        "gc", help="Find posts whose markdown file was removed without `deprecate`"
+    )
+    gc_cmd.add_argument("--debug", action="store_true", help="Enable debug logging")
+    gc_cmd.add_argument("--apply", action="store_true", help="Move the orphaned posts to the trash")
+    gc_cmd.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=4,
+        metavar="N",
+        help="List and trash posts with up to N concurrent requests (default: 4)",
+    )
+    gc_cmd.add_argument(
+        "--batch-size",
+        type=_batch_size,
+        default=0,
+        metavar="N",
+        help=f"Trash up to N posts per REST batch call (max {MAX_BATCH_SIZE}; default: off)",
+    )
+
+    watch_cmd = subparsers.add_parser(
+        "watch", help="Sync D2CMS_DOCS_DIR, then keep syncing documents as they are saved"
+    )
+    watch_cmd.add_argument("--debug", action="store_true", help="Enable debug logging")
+    watch_cmd.add_argument("--path", help="Subdirectory relative to D2CMS_DOCS_DIR to watch")
+    watch_cmd.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Sync up to N documents concurrently; children wait for their parent (default: 1)",
+    )
+    watch_cmd.add_argument(
+        "--debounce",
+        type=_seconds,
+        default=0.3,
+        metavar="SECONDS",
+        help="Wait until no file has changed for this long before syncing (default: 0.3)",
+    )
+    watch_cmd.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll for changes instead of using OS notifications (e.g. on network mounts)",
+    )
+    _add_glob_arguments(watch_cmd)
 
     args = parser.parse_args()
 
@@ -127,5 +569,11 @@ def main() -> None:
         _cmd_deprecate(args)
     elif args.command == "sync":
         _cmd_sync(args)
+    elif args.command == "rehash":
+        _cmd_rehash(args)
+    elif args.command == "gc":
+        _cmd_gc(args)
+    elif args.command == "watch":
+        _cmd_watch(args)
     else:
         parser.print_help()
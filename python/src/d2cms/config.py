@@ -1,9 +1,11 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Literal, cast, get_args
 
 AuthMode = Literal["token", "basic"]
+HashAlgorithm = Literal["sha256", "blake2b"]
+DeleteMode = Literal["trash", "force"]
 
 
 
@@ -31,6 +33,83 @@ def _normalize_api_root(url: str) -> str:
 
 
 
+def _getenv_int(name: str, default: int, minimum: int = 1) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        raise ConfigError(f"{name} must be an integer") from None
+
+    if value < minimum:
+        raise ConfigError(f"{name} must be at least {minimum}")
+    return value
+
+
+
+def _getenv_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+
+    try:
+        value = float(raw.strip())
+    except ValueError:
+        raise ConfigError(f"{name} must be a number") from None
+
+    if value <= 0:
+        raise ConfigError(f"{name} must be greater than zero")
+    return value
+
+
+
+def _getenv_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+
+    value = raw.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ConfigError(f"{name} must be a boolean (true/false)")
+
+
+
+def _getenv_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+
+    value = raw.strip().lower()
+    if value in choices:
+        return value
+    raise ConfigError(f"{name} must be either " + " or ".join(f'"{choice}"' for choice in choices))
+
+
+
+def _getenv_statuses(name: str, default: frozenset[int]) -> frozenset[int]:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+
+    try:
+        statuses = frozenset(int(part) for part in raw.split(",") if part.strip())
+    except ValueError:
+        raise ConfigError(f"{name} must be a comma-separated list of HTTP status codes") from None
+
+    if not all(400 <= status <= 599 for status in statuses):
+        raise ConfigError(f"{name} may only contain 4xx and 5xx status codes")
+    return statuses
+
+
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
 @dataclass(frozen=True)
 class D2CMSConfig:
     wp_api_root: str
@@ -38,7 +117,26 @@ class D2CMSConfig:
     wp_api_user: str
     docs_dir: Path
     auth_mode: AuthMode
-    
+    http_pool_size: int = 10 # max pooled (and keep-alive) connections per run
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 10.0
+    http_pool_timeout: float = 10.0 # max wait for a free connection from the pool
+    http2: bool = False # requires the optional `h2` dependency
+    http_retries: int = 3 # extra attempts after a transient failure; 0 disables retries
+    http_backoff: float = 0.5 # first retry delay in seconds, doubled on each attempt
+    http_backoff_max: float = 30.0 # cap on any one delay, including a server's Retry-After
+    http_retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES
+    max_rps: float | None = None # client-side request rate cap; None is unlimited
+    adaptive_concurrency: bool = True # back off in-flight requests on 429s and slow responses
+    render_cache_mb: int = 64 # size cap of the on-disk render cache; 0 disables it
+    hash_algorithm: HashAlgorithm = "sha256" # for new document hashes; old ones still compare
+    scan_threads: int = 1 # directories listed ahead of the walk; more helps on network filesystems
+    include: tuple[str, ...] = () # globs a document must match; empty keeps every document
+    exclude: tuple[str, ...] = () # globs skipped on top of .d2cmsignore
+    upload_media: bool = False # upload local files documents reference and point them at WordPress
+    media_upload_workers: int = 4
+    delete_mode: DeleteMode = "trash" # how deprecated documents' posts go; "force" bypasses the trash
+
 
 def load_config_from_env() -> D2CMSConfig:
     auth_mode_raw = os.getenv("D2CMS_AUTH_MODE", "basic").strip().lower()
@@ -58,5 +156,24 @@ def load_config_from_env() -> D2CMSConfig:
         wp_api_key = _getenv_required("D2CMS_WP_API_KEY"),
         wp_api_user = _getenv_required("D2CMS_WP_API_USER"),
         docs_dir = docs_dir,
-        auth_mode = auth_mode_raw
+        auth_mode = auth_mode_raw,
+        http_pool_size = _getenv_int("D2CMS_HTTP_POOL_SIZE", 10),
+        http_connect_timeout = _getenv_float("D2CMS_HTTP_CONNECT_TIMEOUT", 5.0),
+        http_read_timeout = _getenv_float("D2CMS_HTTP_READ_TIMEOUT", 10.0),
+        http_pool_timeout = _getenv_float("D2CMS_HTTP_POOL_TIMEOUT", 10.0),
+        http2 = _getenv_bool("D2CMS_HTTP2", False),
+        http_retries = _getenv_int("D2CMS_HTTP_RETRIES", 3, minimum=0),
+        http_backoff = _getenv_float("D2CMS_HTTP_BACKOFF", 0.5),
+        http_backoff_max = _getenv_float("D2CMS_HTTP_BACKOFF_MAX", 30.0),
+        http_retry_statuses = _getenv_statuses("D2CMS_HTTP_RETRY_STATUSES", DEFAULT_RETRY_STATUSES),
+        max_rps = _getenv_float("D2CMS_MAX_RPS", 0.0) or None, # 0.0 only when unset
+        adaptive_concurrency = _getenv_bool("D2CMS_ADAPTIVE_CONCURRENCY", True),
+        render_cache_mb = _getenv_int("D2CMS_RENDER_CACHE_MB", 64, minimum=0),
+        hash_algorithm = cast(
+            HashAlgorithm, _getenv_choice("D2CMS_HASH_ALGORITHM", "sha256", get_args(HashAlgorithm))
+        ),
+        scan_threads = _getenv_int("D2CMS_SCAN_THREADS", 1),
+        upload_media = _getenv_bool("D2CMS_UPLOAD_MEDIA", False),
+        media_upload_workers = _getenv_int("D2CMS_MEDIA_UPLOAD_WORKERS", 4),
+        delete_mode = cast(DeleteMode, _getenv_choice("D2CMS_DELETE_MODE", "trash", get_args(DeleteMode))),
     )
\ No newline at end of file
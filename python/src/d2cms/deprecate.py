@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import frontmatter
+
+from .docs import write_frontmatter_fields
+from .state import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "deprecate-journal.jsonl"
+
+
+class DeprecateError(RuntimeError):
+    """Raised when a deprecation cannot start, resume or roll back"""
+
+
+@dataclass(frozen=True)
+class Move:
+    source: Path
+    target: Path
+
+
+@dataclass
+class DeprecationPlan:
+    """Every change that deprecating a set of documents makes, worked out before any is made.
+
+    Each document is marked deprecated and stays where it is, since the next sync
+    deletes it. Everything else in the directory named after it moves up past that
+    directory, and the markdown files directly inside it inherit its parent_key. When
+    a deprecated document's parent is also deprecated, its children go up past both
+    and inherit the nearest parent that is not.
+    """
+    docs_dir: Path
+    deprecated: list[Path] = field(default_factory=list)
+    edits: dict[Path, dict[str, object]] = field(default_factory=dict) # frontmatter fields to set, by path
+    moves: list[Move] = field(default_factory=list)
+    emptied: list[Path] = field(default_factory=list) # directories left empty, deepest first
+    collisions: dict[Path, list[Path]] = field(default_factory=dict) # target -> what would land on it
+
+    def steps(self) -> list[dict[str, Any]]:
+        """The plan as journal steps, paths relative to docs_dir, in the order they are applied"""
+        def _relative(path: Path) -> str:
+            return path.relative_to(self.docs_dir).as_posix()
+
+        steps: list[dict[str, Any]] = [
+            {"op": "edit", "path": _relative(path), "fields": fields, "original": path.read_bytes().decode()}
+            for path, fields in self.edits.items()
+        ]
+        created: set[Path] = set()
+        for move in self.moves:
+            # Directories this move creates, so a rollback can remove them again
+            missing = [
+                parent for parent in move.target.parents
+                if parent.is_relative_to(self.docs_dir) and not parent.exists() and parent not in created
+            ]
+            created.update(missing)
+            steps.append({
+                "op": "move",
+                "source": _relative(move.source),
+                "target": _relative(move.target),
+                "created": [_relative(parent) for parent in missing],
+            })
+        steps.extend({"op": "rmdir", "path": _relative(directory)} for directory in self.emptied)
+        return steps
+
+
+def _inherited_parent_keys(documents: dict[Path, frontmatter.Post]) -> dict[Path, str]:
+    """The parent_key each deprecated document's children take: its nearest live ancestor's"""
+    by_key = {
+        str(document.metadata["document_key"]): document
+        for document in documents.values() if document.metadata.get("document_key")
+    }
+    inherited: dict[Path, str] = {}
+    for path, document in documents.items():
+        parent_key = str(document.metadata.get("parent_key") or "")
+        seen: set[str] = set()
+        while parent_key in by_key and parent_key not in seen:
+            seen.add(parent_key)
+            parent_key = str(by_key[parent_key].metadata.get("parent_key") or "")
+        inherited[path] = str(UUID(parent_key)) if parent_key else ""
+    return inherited
+
+
+def plan_deprecation(docs_dir: Path, paths: Iterable[Path]) -> DeprecationPlan:
+    """Plan deprecating documents together, against one view of the tree read up front.
+
+    Only the deprecated documents are parsed. A relocation that would land on an existing
+    file, or on the same target as another, is recorded in `collisions` instead of moves.
+    """
+    plan = DeprecationPlan(docs_dir, sorted(set(paths)))
+    deprecated = set(plan.deprecated)
+    documents = {path: frontmatter.load(path) for path in plan.deprecated}
+    inherited = _inherited_parent_keys(documents)
+    for path in plan.deprecated:
+        plan.edits[path] = {"deprecated": True}
+
+    # Directories named after a deprecated document; their contents move up past them
+    dropped = {path.parent / path.stem: path for path in plan.deprecated if (path.parent / path.stem).is_dir()}
+    for directory, owner in sorted(dropped.items()):
+        for child in sorted(directory.glob("*.md")):
+            if child.is_file() and child not in deprecated:
+                plan.edits[child] = {"parent_key": inherited[owner]}
+
+    def _relocated(path: Path) -> Path:
+        kept = docs_dir
+        current = docs_dir
+        for part in path.relative_to(docs_dir).parts:
+            current = current / part
+            if current not in dropped:
+                kept = kept / part
+        return kept
+
+    targets: dict[Path, list[Path]] = {}
+    directories: list[Path] = []
+    staying: set[Path] = set() # directories that keep a deprecated document
+    roots = [directory for directory in sorted(dropped) if not any(parent in dropped for parent in directory.parents)]
+    for root in roots:
+        for current, dirnames, filenames in os.walk(root):
+            current_dir = Path(current)
+            directories.append(current_dir)
+            # Symlinked directories move as links rather than being walked
+            entries = [name for name in dirnames if (current_dir / name).is_symlink()] + filenames
+            dirnames[:] = sorted(name for name in dirnames if name not in entries)
+            target = _relocated(current_dir)
+            if not dirnames and not entries and target != current_dir and not target.exists():
+                targets.setdefault(target, []).append(current_dir) # an empty directory moves up too
+            for name in sorted(entries):
+                source = current_dir / name
+                if source in deprecated:
+                    staying.update(source.parents)
+                    continue
+                targets.setdefault(_relocated(source), []).append(source)
+
+    for target, sources in sorted(targets.items()):
+        if len(sources) > 1 or os.path.lexists(target):
+            plan.collisions[target] = sources
+        else:
+            plan.moves.append(Move(sources[0], target))
+    plan.emptied = sorted(
+        (directory for directory in directories if directory not in staying),
+        key=lambda directory: len(directory.parts),
+        reverse=True,
+    )
+    return plan
+
+
+def _journal_path(docs_dir: Path) -> Path:
+    return docs_dir / STATE_DIR / JOURNAL_FILE
+
+
+def pending_journal(docs_dir: Path) -> Path | None:
+    """The journal an interrupted deprecation left behind, if any"""
+    path = _journal_path(docs_dir)
+    return path if path.exists() else None
+
+
+def _apply(step: dict[str, Any], docs_dir: Path) -> None:
+    if step["op"] == "edit":
+        write_frontmatter_fields(docs_dir / step["path"], step["fields"])
+    elif step["op"] == "move":
+        source, target = docs_dir / step["source"], docs_dir / step["target"]
+        if not os.path.lexists(source) and os.path.lexists(target):
+            return # moved before the run was interrupted
+        if os.path.lexists(target):
+            raise DeprecateError(f"{target} appeared since the deprecation was planned")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        source.rename(target)
+    elif step["op"] == "rmdir":
+        directory = docs_dir / step["path"]
+        try:
+            directory.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning("[deprecate] leaving %s, which is not empty", directory)
+
+
+def _undo(step: dict[str, Any], docs_dir: Path) -> None:
+    if step["op"] == "edit":
+        (docs_dir / step["path"]).write_bytes(step["original"].encode())
+    elif step["op"] == "move":
+        source, target = docs_dir / step["source"], docs_dir / step["target"]
+        if os.path.lexists(target) and not os.path.lexists(source):
+            source.parent.mkdir(parents=True, exist_ok=True)
+            target.rename(source)
+        for directory in step["created"]: # deepest first
+            with contextlib.suppress(OSError):
+                (docs_dir / directory).rmdir()
+    elif step["op"] == "rmdir":
+        (docs_dir / step["path"]).mkdir(parents=True, exist_ok=True)
+
+
+def _read_journal(docs_dir: Path) -> tuple[list[dict[str, Any]], set[int]]:
+    path = pending_journal(docs_dir)
+    if path is None:
+        raise DeprecateError("no interrupted deprecation to resume or roll back")
+    with path.open(encoding="utf-8") as f:
+        try:
+            steps = json.loads(f.readline())["steps"]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise DeprecateError(f"{path} is unreadable ({e}); remove it to start over") from e
+        done = set()
+        for line in f:
+            try:
+                done.add(json.loads(line)["done"])
+            except (json.JSONDecodeError, KeyError):
+                break # the line being written when the run stopped
+    return steps, done
+
+
+def _run(steps: list[dict[str, Any]], done: set[int], docs_dir: Path) -> None:
+    journal = _journal_path(docs_dir)
+    with journal.open("a", encoding="utf-8") as f:
+        for i, step in enumerate(steps):
+            if i in done:
+                continue
+            _apply(step, docs_dir)
+            f.write(json.dumps({"done": i}) + "\n")
+            f.flush()
+    journal.unlink()
+
+
+def apply_deprecation(plan: DeprecationPlan) -> None:
+    """Make a plan's changes, journaling each so an interrupted run can be resumed or rolled back.
+
+    Frontmatter edits go first, then moves, then empty directories are removed. The
+    journal, with the original text of every edited file, is written to
+    `.d2cms/deprecate-journal.jsonl` before anything is touched and removed once the
+    last step is done.
+    """
+    if plan.collisions:
+        raise DeprecateError(f"{len(plan.collisions)} relocation(s) would overwrite a file")
+    journal = _journal_path(plan.docs_dir)
+    if journal.exists():
+        raise DeprecateError(f"an interrupted deprecation left {journal}; resume or roll it back first")
+
+    steps = plan.steps()
+    journal.parent.mkdir(exist_ok=True)
+    with journal.open("x", encoding="utf-8") as f:
+        f.write(json.dumps({"steps": steps}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    logger.info("[deprecate] %d step(s) journaled in %s", len(steps), journal)
+    _run(steps, set(), plan.docs_dir)
+
+
+def resume_deprecation(docs_dir: Path) -> int:
+    """Finish an interrupted deprecation, returning how many steps were left"""
+    steps, done = _read_journal(docs_dir)
+    _run(steps, done, docs_dir)
+    return len(steps) - len(done)
+
+
+def rollback_deprecation(docs_dir: Path) -> int:
+    """Undo the steps an interrupted deprecation completed, newest first, returning how many"""
+    steps, done = _read_journal(docs_dir)
+    # A step may have finished without being recorded; undoing it is safe either way
+    attempted = max(done, default=-1) + 1
+    for i in reversed(range(min(attempted + 1, len(steps)))):
+        _undo(steps[i], docs_dir)
+    _journal_path(docs_dir).unlink()
+    return len(done)
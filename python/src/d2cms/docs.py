@@ -1,18 +1,34 @@
 import hashlib
+import json
+import os
 import re
-import shutil
+import stat
+import tempfile
 from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
 from typing import Literal, get_args
 from uuid import UUID, uuid7
 
 import frontmatter
+import markdown_it
 import yaml
 from frontmatter import Post
 from markdown_it import MarkdownIt
 
+from .cache import RenderCache
+from .config import HashAlgorithm
+
 ContentType = Literal["posts", "pages", "docs"]
 
+HASH_VERSION = "v2"
+# Written back by sync itself, so they must not make a synced document look changed
+_UNHASHED_FIELDS = frozenset({"document_hash", "wordpress_id"})
+
+
+class DocumentChangedError(ValueError):
+    """Raised when a document's stored hash no longer matches its content"""
+
 
 def content_type_from_path(file_path: Path, docs_dir: Path) -> ContentType:
     """Derive the WordPress content type from the file's top-level directory."""
@@ -48,7 +64,7 @@ def _title_to_slug(title: str) -> str:
 
 
 
-def generate_doc_hash(post: Post, relative_path: Path) -> str:
+def _generate_v1_doc_hash(post: Post, relative_path: Path) -> str:
     metadata_for_hash = {k: v for k, v in post.metadata.items() if k != "document_hash"}
     hash_input = "\n".join([
         str(relative_path),
@@ -58,6 +74,128 @@ def generate_doc_hash(post: Post, relative_path: Path) -> str:
     return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
 
 
+def generate_doc_hash(post: Post, relative_path: Path, algorithm: HashAlgorithm = "sha256") -> str:
+    """Hash a document as `v2:<algorithm>:<hexdigest>`.
+
+    Metadata is encoded as canonical JSON. `document_hash` and `wordpress_id` are left
+    out: both are written back by sync and say nothing about the document's content.
+    """
+    metadata = {k: v for k, v in post.metadata.items() if k not in _UNHASHED_FIELDS}
+    # blake2b is cut to sha256's length so both fit the same document_hash field
+    digest = hashlib.blake2b(digest_size=32) if algorithm == "blake2b" else hashlib.sha256()
+    digest.update(relative_path.as_posix().encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(
+        metadata, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode())
+    digest.update(b"\0")
+    digest.update(post.content.encode())
+    return f"{HASH_VERSION}:{algorithm}:{digest.hexdigest()}"
+
+
+FieldGroup = Literal["content", "title", "parent", "order", "tags", "other"]
+# Frontmatter fields in each group sent on its own; any other field falls in "other"
+_GROUP_FIELDS: dict[FieldGroup, tuple[str, ...]] = {
+    "title": ("title", "slug"),
+    "parent": ("parent_key",),
+    "order": ("order",),
+    "tags": ("tags",),
+}
+# A link or image the renderer resolves against the document's directory
+_RELATIVE_REF_RE = re.compile(
+    r"(?:\]\(|^[ \t]*\[[^\]]+\]:|\b(?:src|href)=[\"'])(?![ \t]*<?(?:[a-zA-Z][a-zA-Z0-9+.-]*:|/|#))",
+    re.MULTILINE,
+)
+
+
+def _canonical(value: object) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def field_hashes(post: Post, relative_path: Path, media: str | None = None) -> dict[str, str]:
+    """Hash each group of fields that sync can send on its own, to tell which changed.
+
+    "content" covers what the rendered body depends on: the markdown, whether its first
+    line is the title heading to_html() drops, and the document's directory only when
+    the markdown has relative links or images, so moving a document without any leaves
+    its content unchanged. `media`, the digest of the local files the document
+    references, is folded into "content" and also kept on its own under "media".
+    """
+    metadata = post.metadata
+    content = post.content
+    grouped = {name for names in _GROUP_FIELDS.values() for name in names}
+    lines = content.split("\n", 1)
+    directory = relative_path.parent.as_posix() if _RELATIVE_REF_RE.search(content) else None
+    inputs: dict[FieldGroup, object] = {
+        "content": [content, lines[0].strip() == f"# {metadata.get('title')}", directory]
+        + ([media] if media is not None else []),
+        **{group: [metadata.get(name) for name in names] for group, names in _GROUP_FIELDS.items()},
+        "other": {
+            key: value for key, value in metadata.items()
+            if key not in _UNHASHED_FIELDS and key not in grouped
+        },
+    }
+    hashes: dict[str, str] = {
+        group: hashlib.sha256(_canonical(value)).hexdigest()[:32] for group, value in inputs.items()
+    }
+    if media is not None:
+        hashes["media"] = media
+    return hashes
+
+
+def _hash_format(document_hash: str) -> str:
+    # "v2:sha256:" for current hashes, "" for unprefixed v1 hashes
+    return document_hash[:document_hash.rfind(":") + 1]
+
+
+def doc_hash_matches(
+    post: Post, relative_path: Path, current_hash: str | None = None, stored_hash: str | None = None
+) -> bool:
+    """Whether the stored document_hash still describes the document.
+
+    The stored hash is recomputed in its own format, so documents hashed by an older
+    version (or another algorithm) are not all seen as changed. Pass the document's
+    current hash to avoid hashing it again when the formats agree, and stored_hash to
+    check a hash kept elsewhere (e.g. on WordPress) instead of the frontmatter's.
+    """
+    stored = stored_hash if stored_hash is not None else str(post.metadata.get("document_hash") or "")
+    if not stored:
+        return False
+
+    if current_hash is not None and _hash_format(current_hash) == _hash_format(stored):
+        return stored == current_hash
+
+    if stored.startswith(f"{HASH_VERSION}:"):
+        algorithm = stored.split(":")[1]
+        if algorithm not in get_args(HashAlgorithm):
+            return False
+        return generate_doc_hash(post, relative_path, algorithm) == stored  # type: ignore[arg-type]
+    return _generate_v1_doc_hash(post, relative_path) == stored
+
+
+def rehash_document(
+    file_path: Path,
+    docs_dir: Path,
+    algorithm: HashAlgorithm = "sha256",
+) -> str | None:
+    """Rewrite a document's stored hash in the current format, returning the new hash.
+
+    Returns None if the stored hash is already current.
+    Only documents whose stored hash still matches are migrated; changed documents keep
+    their old hash so the next sync still sends them.
+    """
+    post = frontmatter.load(file_path)
+    relative_path = file_path.relative_to(docs_dir)
+    current_hash = generate_doc_hash(post, relative_path, algorithm)
+    if post.metadata.get("document_hash") == current_hash:
+        return None
+    if not doc_hash_matches(post, relative_path, current_hash):
+        raise DocumentChangedError(f"Document changed since it was last synced: {file_path}")
+
+    update_frontmatter(file_path, document_hash=current_hash)
+    return current_hash
+
+
 
 def generate_template_doc(
         docs_root: Path,
@@ -111,18 +249,66 @@ Doc content here
 
 
 
-def read_directory(doc_path: Path):
-    files = []
-    directories = []
-
-    for entry in doc_path.iterdir():
-        if entry.is_dir():
-            directories.append(entry)
-        else:
-            files.append(entry)
-
-    return files, directories
-
+def _frontmatter_line(key: str, value: object, newline: str) -> str:
+    line: str = yaml.safe_dump(
+        {key: value}, default_flow_style=False, allow_unicode=True, width=float("inf")
+    )
+    return line.rstrip("\n") + newline
+
+
+def set_frontmatter_fields(text: str, fields: dict[str, object]) -> str:
+    """Set top-level frontmatter fields in a document's text, leaving every other line as-is.
+
+    Existing `key:` lines (with any indented continuation) are replaced in place and new
+    keys are added at the end of the block. Documents without a frontmatter block are
+    re-serialised in full.
+    """
+    lines = text.splitlines(keepends=True)
+    end = next(
+        (i for i, line in enumerate(lines[1:], start=1) if line.rstrip() == "---"), None
+    ) if lines and lines[0].rstrip() == "---" else None
+    if end is None:
+        post = frontmatter.loads(text)
+        post.metadata.update(fields)
+        return frontmatter.dumps(post)
+
+    newline = "\r\n" if lines[0].endswith("\r\n") else "\n"
+    header = lines[1:end]
+    for key, value in fields.items():
+        new_line = _frontmatter_line(key, value, newline)
+        start = next((i for i, line in enumerate(header) if line.startswith(f"{key}:")), None)
+        if start is None:
+            header.append(new_line)
+            continue
+
+        stop = start + 1
+        while stop < len(header) and header[stop][:1] in (" ", "\t"):
+            stop += 1
+        header[start:stop] = [new_line]
+
+    return "".join([lines[0], *header, *lines[end:]])
+
+
+def write_atomic(file_path: Path, text: str) -> None:
+    """Replace file_path's contents so readers (and crashes) only ever see old or new text."""
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, stat.S_IMODE(file_path.stat().st_mode))
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_frontmatter_fields(file_path: Path, fields: dict[str, object]) -> None:
+    """Set frontmatter fields in file_path in place, atomically."""
+    with file_path.open(encoding="utf-8", newline="") as f:
+        text = f.read()
+    write_atomic(file_path, set_frontmatter_fields(text, fields))
 
 
 class _NotProvided:
@@ -138,44 +324,64 @@ def update_frontmatter(
     document_hash: str | None = None,
     parent_key: UUID | None | _NotProvided = _NOT_PROVIDED,
 ) -> None:
-    post = frontmatter.load(file_path)
+    fields: dict[str, object] = {}
 
     if wordpress_id is not None:
-        post.metadata["wordpress_id"] = wordpress_id
+        fields["wordpress_id"] = wordpress_id
 
     if document_hash is not None:
-        post.metadata["document_hash"] = document_hash
+        fields["document_hash"] = document_hash
 
     if not isinstance(parent_key, _NotProvided):
-        post.metadata["parent_key"] = str(parent_key) if parent_key is not None else ""
+        fields["parent_key"] = str(parent_key) if parent_key is not None else ""
+
+    if fields:
+        write_frontmatter_fields(file_path, fields)
 
-    with file_path.open("w") as f:
-        f.write(frontmatter.dumps(post))
 
+# Bump whenever the renderer's plugins or link rewriting change, so cached HTML is
+# not reused across incompatible versions
+RENDERER_VERSION = f"1:{markdown_it.__version__}"
 
-def reparent_and_relocate_children(doc_path: Path) -> None:
-    """Move sibling directory contents up one level and update their parent_key."""
-    sibling_dir = doc_path.parent / doc_path.stem
-    if not sibling_dir.is_dir():
-        return
+_MD_LINK_RE = re.compile(r']\(([./]*[\w/-]+)\.md\)')
 
-    deleted_post = frontmatter.load(doc_path)
-    raw_key = deleted_post.metadata.get("parent_key")
-    inherited_parent_key: UUID | None = UUID(str(raw_key)) if raw_key else None
 
-    for child in sibling_dir.iterdir():
-        if child.is_file() and child.suffix == ".md":
-            update_frontmatter(child, parent_key=inherited_parent_key)
+@cache
+def _renderer() -> MarkdownIt:
+    # Built once per process; MarkdownIt keeps no per-render state so it is safe to share
+    return MarkdownIt("commonmark").enable("table")
 
-    for item in list(sibling_dir.iterdir()):
-        shutil.move(str(item), str(doc_path.parent / item.name))
 
-    sibling_dir.rmdir()
+def render_key(document: Post, file_path: Path, docs_dir: Path) -> str:
+    """Content-address of the HTML to_html() would produce for this document.
 
+    Links are rewritten relative to the document's directory, so the key covers that
+    directory as well as the title and body.
+    """
+    try:
+        link_context = file_path.parent.relative_to(docs_dir).as_posix()
+    except ValueError:
+        link_context = f"{file_path.parent}\0{docs_dir}"
 
+    digest = hashlib.sha256()
+    for part in (RENDERER_VERSION, link_context, str(document.metadata.get("title") or ""), document.content):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
 
-def to_html(document: Post, file_path: Path, docs_dir: Path) -> str:
-    md = MarkdownIt("commonmark").enable("table")
+
+def to_html(
+    document: Post,
+    file_path: Path,
+    docs_dir: Path,
+    renders: RenderCache | None = None,
+) -> str:
+    key = None
+    if renders is not None:
+        key = render_key(document, file_path, docs_dir)
+        cached = renders.get(key)
+        if cached is not None:
+            return cached
 
     title = document.metadata.get("title")
     content = document.content
@@ -197,6 +403,9 @@ def to_html(document: Post, file_path: Path, docs_dir: Path) -> str:
             return f"](/{'/'.join(parts)})"
         except ValueError:
             return f"]({link_path})"
-    content = re.sub(r']\(([./]*[\w/-]+)\.md\)', _rewrite_md_link, content)
+    content = _MD_LINK_RE.sub(_rewrite_md_link, content)
 
-    return md.render(content)
\ No newline at end of file
+    html = _renderer().render(content)
+    if renders is not None and key is not None:
+        renders.put(key, html)
+    return html
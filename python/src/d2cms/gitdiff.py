@@ -0,0 +1,87 @@
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+ChangeStatus = Literal["added", "modified", "deleted", "renamed"]
+
+
+class GitDiffError(RuntimeError):
+    """Raised when git cannot produce a diff for the docs directory"""
+
+
+@dataclass(frozen=True)
+class FileChange:
+    status: ChangeStatus
+    path: Path # current path, or the removed path for deletions
+    old_path: Path | None = None # previous path of a rename
+
+
+def _git(docs_dir: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(docs_dir), *args],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        raise GitDiffError("git is not installed or not on PATH") from None
+
+    if result.returncode != 0:
+        raise GitDiffError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def _is_markdown(path: str) -> bool:
+    return path.endswith(".md")
+
+
+def changed_markdown_files(docs_dir: Path, ref: str) -> list[FileChange]:
+    """List markdown files under docs_dir that differ between ref and the working tree.
+
+    Untracked (not ignored) markdown files are reported as added so documents created
+    since the last commit are not missed. Renames are detected by git and reported once
+    as a rename rather than as a delete plus an add.
+    """
+    changes: list[FileChange] = []
+    fields = _git(docs_dir, "diff", "--name-status", "-z", "-M", "--relative", ref, "--").split("\0")
+
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in ("R", "C"):
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+            if not _is_markdown(new):
+                if status == "R" and _is_markdown(old):
+                    changes.append(FileChange("deleted", docs_dir / old)) # renamed away from markdown
+                continue
+            if status == "R" and _is_markdown(old):
+                changes.append(FileChange("renamed", docs_dir / new, old_path=docs_dir / old))
+            else:
+                changes.append(FileChange("added", docs_dir / new))
+            continue
+
+        path = fields[i + 1]
+        i += 2
+        if not _is_markdown(path):
+            continue
+        if status == "A":
+            changes.append(FileChange("added", docs_dir / path))
+        elif status == "D":
+            changes.append(FileChange("deleted", docs_dir / path))
+        else:
+            changes.append(FileChange("modified", docs_dir / path))
+
+    for path in _git(docs_dir, "ls-files", "-z", "--others", "--exclude-standard").split("\0"):
+        if path and _is_markdown(path):
+            changes.append(FileChange("added", docs_dir / path))
+
+    return changes
+
+
+def read_file_at(docs_dir: Path, ref: str, file_path: Path) -> str:
+    """Return the content of file_path as it was at ref."""
+    relative = file_path.relative_to(docs_dir).as_posix()
+    return _git(docs_dir, "show", f"{ref}:./{relative}")
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from frontmatter import Post
+
+
+@dataclass
+class SyncNode:
+    file_path: Path
+    document: Post
+    dependencies: set[Path] = field(default_factory=set) # docs that must sync before this one
+    dependents: list[Path] = field(default_factory=list) # docs waiting on this one
+
+
+def build_sync_graph(documents: dict[Path, Post]) -> dict[Path, SyncNode]:
+    """Link each document to the parents that must have a wordpress_id before it can sync.
+
+    A parent is either the document named by `parent_key` or the markdown file that sits
+    next to the document's directory (`guides.md` for `guides/intro.md`). Parents outside
+    `documents` are assumed to already exist remotely and add no dependency.
+    """
+    nodes = {path: SyncNode(path, document) for path, document in documents.items()}
+    paths_by_key = {
+        str(document.metadata["document_key"]): path
+        for path, document in documents.items()
+        if document.metadata.get("document_key")
+    }
+
+    for path, node in nodes.items():
+        parent_key = node.document.metadata.get("parent_key")
+        if parent_key and str(parent_key) in paths_by_key:
+            node.dependencies.add(paths_by_key[str(parent_key)])
+
+        nesting_parent = Path(f"{path.parent}.md")
+        if nesting_parent in nodes:
+            node.dependencies.add(nesting_parent)
+
+        node.dependencies.discard(path)
+
+    # Insertion order of `documents` is kept so dependents release in scan order
+    for path, node in nodes.items():
+        for dependency in node.dependencies:
+            nodes[dependency].dependents.append(path)
+
+    return nodes
@@ -1,11 +1,168 @@
 from __future__ import annotations
 
+import email.utils
+import importlib.util
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
 import httpx
 
-from .config import D2CMSConfig
+from .config import ConfigError, D2CMSConfig
+from .throttle import Throttle, ThrottleTransport
+
+logger = logging.getLogger(__name__)
+
+RetryCallback = Callable[[str, str, str], None] # (method, path, reason)
+ResponseCallback = Callable[[str, str, int, float], None] # (method, route, status, seconds)
+
+# Request extensions understood by RetryTransport
+IDEMPOTENT = "d2cms.idempotent" # True if resending a POST cannot duplicate its effect
+BEFORE_RETRY = "d2cms.before_retry" # () -> Response | None, run before resending a POST
+_SENT_AT = "d2cms.sent_at" # perf_counter() when the client started sending the request
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+# The request never reached the server, so it is safe to resend whatever it was
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# The server refused the request without acting on it
+_REFUSED_STATUSES = frozenset({429, 503})
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Resends requests that failed transiently, with exponential backoff and full jitter.
+
+    GET, PUT and DELETE are retried after any transient failure. A POST is only resent
+    when the server cannot have acted on it (connection never made, 429 or 503), unless
+    it is marked idempotent or carries a BEFORE_RETRY check that looks for the effect
+    of the earlier attempt; a response returned by that check ends the retries.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        retries: int,
+        backoff: float,
+        backoff_max: float,
+        statuses: frozenset[int],
+        on_retry: RetryCallback | None = None,
+    ) -> None:
+        self._transport = transport
+        self._retries = retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._statuses = statuses
+        self._on_retry = on_retry
+
+    def _resendable(self, request: httpx.Request, sent: bool) -> bool:
+        return (
+            not sent
+            or request.method in _IDEMPOTENT_METHODS
+            or bool(request.extensions.get(IDEMPOTENT))
+            or BEFORE_RETRY in request.extensions
+        )
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self._backoff_max, self._backoff * 2 ** attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except _RETRYABLE_ERRORS as e:
+                sent = not isinstance(e, _UNSENT_ERRORS)
+                if attempt >= self._retries or not self._resendable(request, sent):
+                    raise
+                reason = type(e).__name__
+                delay = self._delay(attempt)
+            else:
+                if response.status_code not in self._statuses or attempt >= self._retries:
+                    return response
+                sent = response.status_code not in _REFUSED_STATUSES
+                if not self._resendable(request, sent):
+                    return response
 
+                delay = self._delay(attempt)
+                # Only a refusal tells us when the server will be ready again
+                retry_after = None if sent else _retry_after(response)
+                if retry_after is not None:
+                    if retry_after > self._backoff_max:
+                        return response
+                    delay = retry_after
+                reason = str(response.status_code)
+                response.close()
 
-def make_client(cfg: D2CMSConfig) -> httpx.Client:
+            check = request.extensions.get(BEFORE_RETRY)
+            if sent and check is not None and not request.extensions.get(IDEMPOTENT):
+                existing: httpx.Response | None = check()
+                if existing is not None:
+                    logger.info(
+                        "[http] %s %s took effect despite %s — not resending",
+                        request.method, request.url.path, reason,
+                    )
+                    return existing
+
+            attempt += 1
+            logger.info(
+                "[http] retrying %s %s in %.1fs after %s (attempt %d of %d)",
+                request.method, request.url.path, delay, reason, attempt, self._retries,
+            )
+            if self._on_retry is not None:
+                self._on_retry(request.method, request.url.path, reason)
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def _response_hooks(api_root: str, on_response: ResponseCallback) -> dict[str, list[Callable[..., None]]]:
+    base_path = httpx.URL(api_root).path
+
+    def _sent(request: httpx.Request) -> None:
+        request.extensions[_SENT_AT] = time.perf_counter()
+
+    def _received(response: httpx.Response) -> None:
+        request = response.request
+        sent_at = request.extensions.get(_SENT_AT)
+        if sent_at is None:
+            return
+        route = request.url.path.removeprefix(base_path)
+        on_response(request.method, route, response.status_code, time.perf_counter() - sent_at)
+
+    return {"request": [_sent], "response": [_received]}
+
+
+def make_client(
+    cfg: D2CMSConfig,
+    on_retry: RetryCallback | None = None,
+    throttle: Throttle | None = None,
+    on_response: ResponseCallback | None = None,
+) -> httpx.Client:
+    """Build the pooled client shared by every request in a sync run.
+
+    Every attempt, retries included, passes through the throttle, which is built from
+    cfg unless one is given (e.g. to read its summary after the run). on_response is
+    called once per request with its route relative to the API root and the time
+    until its final response's headers arrived.
+    """
     headers = {
         "Accept": "application/json",
         "User-Agent": "d2cms/0.1",
@@ -15,11 +172,35 @@ def make_client(cfg: D2CMSConfig) -> httpx.Client:
     if cfg.auth_mode == "token":
         headers['Authorization'] = f"Bearer {cfg.wp_api_key}"
 
+    if cfg.http2 and importlib.util.find_spec("h2") is None:
+        raise ConfigError('D2CMS_HTTP2 requires the "h2" package (pip install "docs-2-cms[http2]")')
+
+    transport = httpx.HTTPTransport(
+        limits=httpx.Limits(
+            max_connections=cfg.http_pool_size,
+            max_keepalive_connections=cfg.http_pool_size,
+        ),
+        http2=cfg.http2,
+    )
+
     client = httpx.Client(
         base_url=cfg.wp_api_root,
         headers=headers,
-        timeout=httpx.Timeout(10.0),
+        timeout=httpx.Timeout(
+            cfg.http_read_timeout,
+            connect=cfg.http_connect_timeout,
+            pool=cfg.http_pool_timeout,
+        ),
+        transport=RetryTransport(
+            ThrottleTransport(transport, throttle or Throttle.from_config(cfg)),
+            retries=cfg.http_retries,
+            backoff=cfg.http_backoff,
+            backoff_max=cfg.http_backoff_max,
+            statuses=cfg.http_retry_statuses,
+            on_retry=on_retry,
+        ),
         auth=auth if cfg.auth_mode == "basic" else None,
+        event_hooks=_response_hooks(cfg.wp_api_root, on_response) if on_response is not None else None,
     )
 
-    return client
\ No newline at end of file
+    return client
@@ -0,0 +1,69 @@
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from frontmatter import Post
+
+from .docs import ContentType, content_type_from_path
+
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    path: Path
+    wordpress_id: int | None
+    content_type: ContentType | None
+
+
+class DocumentIndex:
+    """Run-wide map of document_key -> local path, wordpress_id and content type.
+
+    Entries are replaced whole, never mutated, so readers on other worker threads
+    always see a consistent entry.
+    """
+
+    def __init__(self, docs_dir: Path) -> None:
+        self._docs_dir = docs_dir
+        self._entries: dict[str, IndexedDocument] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, file_path: Path, document: Post) -> None:
+        wordpress_id = document.metadata.get("wordpress_id")
+        self.put(
+            document.metadata.get("document_key"),
+            file_path,
+            wordpress_id if isinstance(wordpress_id, int) and wordpress_id else None,
+        )
+
+    def put(self, document_key: object, file_path: Path, wordpress_id: int | None) -> None:
+        if not document_key:
+            return
+
+        try:
+            content_type: ContentType | None = content_type_from_path(file_path, self._docs_dir)
+        except ValueError:
+            content_type = None
+
+        self._entries[str(document_key)] = IndexedDocument(
+            path=file_path,
+            wordpress_id=wordpress_id,
+            content_type=content_type,
+        )
+
+    def under(self, path: Path) -> list[tuple[str, IndexedDocument]]:
+        """Return the key and entry of each document indexed at path, or inside it if a directory."""
+        return [
+            (document_key, entry) for document_key, entry in list(self._entries.items())
+            if entry.path.is_relative_to(path)
+        ]
+
+    def get(self, document_key: object) -> IndexedDocument | None:
+        return self._entries.get(str(document_key))
+
+    def set_wordpress_id(self, document_key: object, wordpress_id: int | None) -> None:
+        entry = self._entries.get(str(document_key))
+        if entry is not None:
+            self._entries[str(document_key)] = replace(entry, wordpress_id=wordpress_id)
+
+    def remove(self, document_key: object) -> None:
+        self._entries.pop(str(document_key), None)
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import hashlib
+import html
+import logging
+import mimetypes
+import re
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from urllib.parse import unquote, urlsplit
+
+import httpx
+from httpx import Client
+
+from .http import BEFORE_RETRY
+from .state import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+MEDIA_CACHE_FILE = "media.sqlite3"
+DEFAULT_UPLOAD_WORKERS = 4
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    sha256 TEXT PRIMARY KEY,
+    media_id INTEGER NOT NULL,
+    url TEXT NOT NULL
+)
+"""
+
+# Attributes that can point at a local file in rendered HTML; the URL is group 2
+_REFERENCE_RE = re.compile(r'(<(?:img|source|video|audio)\b[^>]*?\ssrc="|<a\b[^>]*?\shref=")([^"]*)"')
+# Link, image and attribute targets in markdown source; one of the groups is the URL
+_SOURCE_REFERENCE_RE = re.compile(
+    r"""\]\(\s*<?([^)\s>]+)|^[ \t]*\[[^\]]+\]:[ \t]*<?([^\s>]+)|\b(?:src|href)=["']([^"']+)""",
+    re.MULTILINE,
+)
+# Uploaded file names carry this much of the content hash, so an upload can be found again
+_TAG_LENGTH = 16
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass(frozen=True)
+class Media:
+    media_id: int
+    url: str
+
+
+class MediaCache:
+    """Which content hashes are already in the WordPress media library, shared across runs.
+
+    Lives in `.d2cms/media.sqlite3` under the docs directory. Rows are loaded once and
+    new uploads are written back in one transaction on flush or close. Deleting it
+    costs one search request per file on the next run, not a second upload.
+    """
+
+    def __init__(self, docs_dir: Path) -> None:
+        self._path = docs_dir / STATE_DIR / MEDIA_CACHE_FILE
+        self._rows = self._load()
+        self._added: dict[str, Media] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> MediaCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS media")
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _load(self) -> dict[str, Media]:
+        if not self._path.exists():
+            return {}
+
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute("SELECT sha256, media_id, url FROM media").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError as e:
+            logger.warning("[media] ignoring unreadable media cache %s — %s", self._path, e)
+            self._path.unlink(missing_ok=True)
+            return {}
+
+        return {digest: Media(media_id, url) for digest, media_id, url in rows}
+
+    def get(self, digest: str) -> Media | None:
+        with self._lock:
+            return self._rows.get(digest)
+
+    def put(self, digest: str, media: Media) -> None:
+        with self._lock:
+            self._rows[digest] = media
+            self._added[digest] = media
+
+    def flush(self) -> None:
+        """Write this run's uploads to disk."""
+        with self._lock:
+            if not self._added:
+                return
+
+            self._path.parent.mkdir(exist_ok=True)
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO media VALUES (?, ?, ?)",
+                        [(digest, media.media_id, media.url) for digest, media in self._added.items()],
+                    )
+            finally:
+                conn.close()
+            self._added.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _upload_name(file_path: Path, digest: str) -> str:
+    stem = _UNSAFE_NAME_RE.sub("-", file_path.stem).strip("-") or "file"
+    return f"{stem}-{digest[:_TAG_LENGTH]}{file_path.suffix.lower()}"
+
+
+def _local_target(reference: str, file_path: Path, docs_dir: Path) -> tuple[Path, str] | None:
+    """The file a relative reference points at under docs_dir, with any #fragment, or None"""
+    url = urlsplit(html.unescape(reference))
+    if url.scheme or url.netloc or not url.path or url.path.startswith("/"):
+        return None
+    target = (file_path.parent / unquote(url.path)).resolve()
+    if target.suffix == ".md" or not target.is_relative_to(docs_dir.resolve()) or not target.is_file():
+        return None
+    return target, f"#{url.fragment}" if url.fragment else ""
+
+
+class MediaLibrary:
+    """Uploads the local files that documents reference to `wp/v2/media`, once per content.
+
+    Files are addressed by their SHA-256, so a file referenced by many documents, or
+    copied under several names, is uploaded once; the hash-to-URL mapping is kept in
+    a MediaCache so unchanged files are never uploaded again. A hash missing from the
+    cache is first searched for in the media library (uploads are named after it), so
+    losing the cache does not duplicate media. Uploads run on their own thread pool
+    and are shared between documents syncing at the same time.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        docs_dir: Path,
+        cache: MediaCache,
+        workers: int = DEFAULT_UPLOAD_WORKERS,
+    ) -> None:
+        self._client = client
+        self._docs_dir = docs_dir
+        self._cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-media")
+        self._pending: dict[str, Future[Media]] = {}
+        self._digests: dict[Path, tuple[int, int, str]] = {} # path -> (mtime_ns, size, sha256)
+        self._lock = threading.Lock()
+        self.uploaded = 0
+        self.reused = 0
+
+    def __enter__(self) -> MediaLibrary:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _digest(self, file_path: Path) -> str:
+        stat_result = file_path.stat()
+        with self._lock:
+            known = self._digests.get(file_path)
+        if known is not None and known[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+            return known[2]
+
+        with file_path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        with self._lock:
+            self._digests[file_path] = (stat_result.st_mtime_ns, stat_result.st_size, digest)
+        return digest
+
+    def _find(self, digest: str) -> httpx.Response | None:
+        """The attachment an earlier upload of this content created, if WordPress has one"""
+        tag = digest[:_TAG_LENGTH]
+        response = self._client.get("wp/v2/media", params={"search": tag, "per_page": 10})
+        response.raise_for_status()
+        for item in response.json():
+            if tag in str(item.get("source_url", "")):
+                return httpx.Response(200, json=item, request=response.request)
+        return None
+
+    def _upload(self, file_path: Path, digest: str) -> Media:
+        try:
+            existing = self._find(digest)
+            if existing is not None:
+                item = existing.json()
+                logger.info("[media] %s is already in the media library (id=%s)", file_path, item["id"])
+            else:
+                logger.info("[media] uploading %s", file_path)
+                response = self._client.post(
+                    "wp/v2/media",
+                    content=file_path.read_bytes(),
+                    headers={
+                        "Content-Type": mimetypes.guess_type(file_path.name)[0] or "application/octet-stream",
+                        "Content-Disposition": f'attachment; filename="{_upload_name(file_path, digest)}"',
+                    },
+                    extensions={BEFORE_RETRY: lambda: self._find(digest)},
+                )
+                response.raise_for_status()
+                item = response.json()
+                with self._lock:
+                    self.uploaded += 1
+
+            media = Media(int(item["id"]), str(item["source_url"]))
+            self._cache.put(digest, media)
+            return media
+        finally:
+            with self._lock:
+                self._pending.pop(digest, None)
+
+    def _media(self, file_path: Path) -> Future[Media]:
+        digest = self._digest(file_path)
+        with self._lock:
+            future = self._pending.get(digest)
+            if future is not None:
+                return future
+            known = self._cache.get(digest)
+            if known is not None:
+                self.reused += 1
+                future = Future()
+                future.set_result(known)
+                return future
+            future = self._pending[digest] = self._pool.submit(self._upload, file_path, digest)
+            return future
+
+    def references_digest(self, markdown: str, file_path: Path) -> str | None:
+        """A hash over the local files a document's markdown references, or None if there are none
+
+        It goes into the document's content field hash, so replacing an image re-sends
+        the documents that use it even though their markdown did not change.
+        """
+        targets = set()
+        for match in _SOURCE_REFERENCE_RE.finditer(markdown):
+            reference = next(group for group in match.groups() if group)
+            if target := _local_target(reference, file_path, self._docs_dir):
+                targets.add(target[0])
+        if not targets:
+            return None
+        digest = hashlib.sha256()
+        for file_digest in sorted(self._digest(path) for path in targets):
+            digest.update(file_digest.encode())
+        return digest.hexdigest()[:32]
+
+    def rewrite(self, rendered: str, file_path: Path) -> str:
+        """Point the rendered document's references to local files at their WordPress URLs
+
+        Missing files are uploaded first, in parallel; if one fails, the error is raised
+        and the document is not sent.
+        """
+        targets: dict[str, tuple[Path, str]] = {}
+        for match in _REFERENCE_RE.finditer(rendered):
+            reference = match.group(2)
+            if reference not in targets and (target := _local_target(reference, file_path, self._docs_dir)):
+                targets[reference] = target
+        if not targets:
+            return rendered
+
+        futures = {path: self._media(path) for path, _ in targets.values()}
+        urls = {path: future.result().url for path, future in futures.items()}
+
+        def _replace(match: re.Match[str]) -> str:
+            target = targets.get(match.group(2))
+            if target is None:
+                return match.group(0)
+            path, fragment = target
+            return f'{match.group(1)}{html.escape(urls[path] + fragment)}"'
+
+        return _REFERENCE_RE.sub(_replace, rendered)
+
+    def flush(self) -> None:
+        self._cache.flush()
+
+    def close(self) -> None:
+        """Wait for uploads in flight, then write the cache"""
+        self._pool.shutdown(wait=True)
+        self._cache.close()
+        if self.uploaded or self.reused:
+            logger.info("[media] uploaded %d file(s); %d reference(s) reused earlier uploads", self.uploaded, self.reused)
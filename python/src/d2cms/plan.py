@@ -0,0 +1,61 @@
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Literal, get_args
+
+Action = Literal["create", "update", "delete", "skip", "blocked"]
+ACTIONS: tuple[Action, ...] = get_args(Action)
+
+
+@dataclass(frozen=True)
+class PlannedDocument:
+    path: str # relative to D2CMS_DOCS_DIR
+    content_type: str | None
+    action: Action
+    reason: str = ""
+
+
+@dataclass
+class RequestEstimate:
+    """HTTP requests a sync would send, counted without sending any"""
+    post: int = 0 # creates and updates
+    delete: int = 0
+    batch: int = 0 # batch/v1 calls carrying the posts and deletes, with --batch-size
+    parent_lookup: int = 0 # parents the local index cannot resolve
+    tag_listing: int = 0 # at least one page of tags, loaded once per run
+    tag_create: int = 0 # at most: tags not seen on any document already in sync
+
+    @property
+    def total(self) -> int:
+        writes = self.batch if self.batch else self.post + self.delete
+        return writes + self.parent_lookup + self.tag_listing + self.tag_create
+
+
+@dataclass
+class SyncPlan:
+    """What `sync` would do to each document, from local files and sync state alone"""
+    documents: list[PlannedDocument] = field(default_factory=list)
+    requests: RequestEstimate = field(default_factory=RequestEstimate)
+
+    def add(self, path: str, content_type: str | None, action: Action, reason: str = "") -> None:
+        self.documents.append(PlannedDocument(path, content_type, action, reason))
+
+    def counts(self) -> Counter[Action]:
+        return Counter(document.action for document in self.documents)
+
+    def counts_by_content_type(self) -> dict[str, Counter[Action]]:
+        counts: dict[str, Counter[Action]] = {}
+        for document in self.documents:
+            counts.setdefault(document.content_type or "unknown", Counter())[document.action] += 1
+        return dict(sorted(counts.items()))
+
+    def to_dict(self) -> dict[str, object]:
+        """A JSON-ready form, e.g. for CI to fail a change that would delete posts"""
+        return {
+            "totals": {action: self.counts()[action] for action in ACTIONS},
+            "content_types": {
+                content_type: {action: counts[action] for action in ACTIONS}
+                for content_type, counts in self.counts_by_content_type().items()
+            },
+            "requests": {**asdict(self.requests), "total": self.requests.total},
+            "documents": [asdict(document) for document in self.documents],
+        }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import frontmatter
+from frontmatter import Post
+
+from .cache import RenderCache
+from .config import HashAlgorithm
+from .docs import doc_hash_matches, field_hashes, generate_doc_hash, render_key, to_html
+
+logger = logging.getLogger(__name__)
+
+# Enough chunks per worker to balance uneven documents without paying IPC per file
+_CHUNKS_PER_JOB = 8
+
+
+class PrepareError(RuntimeError):
+    """Raised in place of a worker's exception, which may not survive pickling"""
+
+
+@dataclass(frozen=True)
+class PreparedDocument:
+    """A document read, hashed and (if it will be sent) rendered ahead of syncing"""
+    file_path: Path
+    document: Post
+    document_hash: str
+    unchanged: bool = False # the stored document_hash still matches
+    html: str | None = None # None when the document will not be sent to WordPress
+    render_key: str | None = None # set when html was rendered rather than read from the cache
+
+
+# Per-process render cache, opened read-only by each worker; new renders go back to the parent
+_worker_renders: RenderCache | None = None
+
+
+def _init_worker(docs_dir: Path, render_cache_bytes: int) -> None:
+    global _worker_renders
+    _worker_renders = RenderCache(docs_dir, max_bytes=render_cache_bytes) if render_cache_bytes else None
+
+
+def _content_unchanged(document: Post, relative_path: Path, sent_content: tuple[str, str] | None) -> bool:
+    # The stored field hashes only describe the document at the hash they were sent with
+    if sent_content is None or document.metadata.get("document_hash") != sent_content[0]:
+        return False
+    return field_hashes(document, relative_path)["content"] == sent_content[1]
+
+
+def prepare_document(
+    file_path: Path,
+    docs_dir: Path,
+    force: bool,
+    hash_algorithm: HashAlgorithm = "sha256",
+    sent_content: tuple[str, str] | None = None,
+) -> PreparedDocument:
+    """Parse and hash a document, rendering it only if sync would send its content.
+
+    `sent_content` is the document_hash and content field hash the document was last
+    synced with; a document whose other fields changed but whose body did not is
+    not rendered, since only those fields will be sent.
+    """
+    document = frontmatter.load(file_path)
+    relative_path = file_path.relative_to(docs_dir)
+    document_hash = generate_doc_hash(document, relative_path, hash_algorithm)
+    unchanged = doc_hash_matches(document, relative_path, document_hash)
+
+    if document.metadata.get("deprecated") or (unchanged and not force):
+        return PreparedDocument(file_path, document, document_hash, unchanged)
+    if not force and _content_unchanged(document, relative_path, sent_content):
+        return PreparedDocument(file_path, document, document_hash, unchanged)
+
+    key = render_key(document, file_path, docs_dir)
+    html = _worker_renders.get(key) if _worker_renders is not None else None
+    if html is not None:
+        return PreparedDocument(file_path, document, document_hash, unchanged, html=html)
+    return PreparedDocument(
+        file_path,
+        document,
+        document_hash,
+        unchanged,
+        html=to_html(document, file_path, docs_dir),
+        render_key=key,
+    )
+
+
+def _prepare_task(
+    task: tuple[Path, Path, bool, HashAlgorithm, tuple[str, str] | None],
+) -> PreparedDocument | PrepareError:
+    try:
+        return prepare_document(*task)
+    except Exception as e:
+        return PrepareError(str(e))
+
+
+def prepare_documents(
+    files: list[Path],
+    docs_dir: Path,
+    force: bool,
+    jobs: int,
+    render_cache_bytes: int = 0,
+    hash_algorithm: HashAlgorithm = "sha256",
+    sent_content: dict[Path, tuple[str, str]] | None = None,
+) -> Iterator[tuple[Path, PreparedDocument | PrepareError]]:
+    """Prepare files across `jobs` processes, yielding results in the order of `files`.
+
+    `sent_content` maps files to what prepare_document() takes as their sent content.
+    """
+    chunksize = max(1, len(files) // (jobs * _CHUNKS_PER_JOB))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(docs_dir, render_cache_bytes),
+    ) as pool:
+        sent_content = sent_content or {}
+        tasks = [(f, docs_dir, force, hash_algorithm, sent_content.get(f)) for f in files]
+        results = pool.map(_prepare_task, tasks, chunksize=chunksize)
+        yield from zip(files, results, strict=True)
@@ -0,0 +1,111 @@
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+import httpx
+from httpx import Client
+
+from .docs import ContentType
+
+logger = logging.getLogger(__name__)
+
+POSTS_PER_PAGE = 100
+_FIELDS = "id,meta.document_key,meta.document_hash"
+
+
+class ReconcileError(RuntimeError):
+    """Raised when the posts on WordPress cannot be listed"""
+
+
+@dataclass(frozen=True)
+class RemotePost:
+    wordpress_id: int
+    document_hash: str | None
+
+
+class RemoteCatalog:
+    """Every synced post on the site, keyed by content type and document_key.
+
+    Loaded in one sweep of `_fields`-trimmed list requests, so a run can adopt posts
+    whose `wordpress_id` was lost locally and skip documents WordPress already has,
+    without a lookup per document.
+    """
+
+    def __init__(self, client: Client) -> None:
+        self._client = client
+        self._posts: dict[tuple[ContentType, str], list[RemotePost]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(posts) for posts in self._posts.values())
+
+    def _fetch_page(self, content_type: ContentType, page: int) -> tuple[list[dict[str, Any]], int]:
+        try:
+            response = self._client.get(f"wp/v2/{content_type}", params={
+                "per_page": POSTS_PER_PAGE,
+                "page": page,
+                "status": "any",
+                "_fields": _FIELDS,
+            }, follow_redirects=True)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise ReconcileError(f"could not list wp/v2/{content_type}: {e}") from e
+        return response.json(), int(response.headers.get("X-WP-TotalPages", 0))
+
+    def _remember(self, content_type: ContentType, posts: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for post in posts:
+                meta = post.get("meta") or {}
+                if not meta.get("document_key"):
+                    continue
+                self._posts.setdefault((content_type, str(meta["document_key"])), []).append(
+                    RemotePost(int(post["id"]), meta.get("document_hash") or None)
+                )
+
+    def load(self, content_types: Iterable[ContentType], workers: int = 1) -> None:
+        """Fetch every post of the given types; pages after the first are fetched concurrently."""
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-reconcile") as pool:
+            for content_type in content_types:
+                posts, total_pages = self._fetch_page(content_type, 1)
+                self._remember(content_type, posts)
+                if total_pages:
+                    pages = range(2, total_pages + 1)
+                    for posts, _ in pool.map(partial(self._fetch_page, content_type), pages):
+                        self._remember(content_type, posts)
+                else:
+                    # Without the header, read pages in turn until a short one
+                    page = 1
+                    while len(posts) == POSTS_PER_PAGE:
+                        page += 1
+                        posts, _ = self._fetch_page(content_type, page)
+                        self._remember(content_type, posts)
+
+        logger.info("[reconcile] found %d post(s) with a document_key", len(self))
+        for (content_type, document_key), copies in self._posts.items():
+            if len(copies) > 1:
+                logger.warning(
+                    "[reconcile] %d %s share document_key %s (ids %s)",
+                    len(copies), content_type, document_key, ", ".join(str(p.wordpress_id) for p in copies),
+                )
+
+    def entries(self) -> Iterator[tuple[ContentType, str, list[RemotePost]]]:
+        """Yield each content type and document_key with every post that carries it."""
+        for (content_type, document_key), posts in self._posts.items():
+            yield content_type, document_key, posts
+
+    def get(
+        self, content_type: ContentType, document_key: object, wordpress_id: int | None = None
+    ) -> RemotePost | None:
+        """Return the post holding document_key, preferring wordpress_id among duplicates."""
+        posts = self._posts.get((content_type, str(document_key)))
+        if not posts:
+            return None
+        for post in posts:
+            if post.wordpress_id == wordpress_id:
+                return post
+        # The oldest copy is the one other content is most likely to link to
+        return min(posts, key=lambda post: post.wordpress_id)
@@ -1,6 +1,36 @@
+from __future__ import annotations
+
 import csv
-from dataclasses import dataclass
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from types import TracebackType
+from typing import IO, Literal
+
+from .throttle import ThrottleSummary
+
+Outcome = Literal["created", "updated", "skipped", "deleted"]
+# Where a run's time goes; summed across workers, so phases can add up to more than
+# the wall time. "prepare" is parse, hash and render in worker processes (--jobs).
+Phase = Literal[
+    "scan", "parse", "prepare", "hash", "render", "media", "parent_lookup", "tag_lookup", "post", "delete",
+    "write_back",
+]
+# Upper bounds of the request latency histogram, in seconds (Prometheus' defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+ReportFormat = Literal["csv", "jsonl"]
+REPORT_FORMATS: tuple[ReportFormat, ...] = ("csv", "jsonl")
+_CSV_FIELDS = ["doc_path", "content_type", "wordpress_id", "error_summary"]
 
 
 @dataclass
@@ -11,9 +41,116 @@ class SyncFailure:
     error_summary: str
 
 
+@dataclass
+class PhaseTiming:
+    seconds: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class EndpointMetrics:
+    """Responses from one endpoint (method and route, with post IDs as `:id`)"""
+    count: int = 0
+    seconds: float = 0.0 # until response headers, retries included
+    statuses: Counter[int] = field(default_factory=Counter)
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)) # last is +Inf
+
+
+def _endpoint(method: str, path: str) -> str:
+    return f"{method} {_ID_SEGMENT.sub('/:id', path)}"
+
+
+class ReportStream:
+    """Writes report rows to a CSV or JSONL file as they are recorded, not after the run.
+
+    The file is created with the first row, so a clean run leaves none behind, and is
+    flushed every `flush_every` rows or `flush_interval` seconds, so a run that is
+    killed keeps nearly all of its rows. With include_outcomes, documents that synced
+    or were skipped get a row too, and rows gain an `outcome` column. Not thread-safe;
+    SyncReport serialises its writes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        format: ReportFormat = "csv",
+        include_outcomes: bool = False,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.format = format
+        self.include_outcomes = include_outcomes
+        self.rows = 0
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._file: IO[str] | None = None
+        self._csv: csv.DictWriter[str] | None = None
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self) -> ReportStream:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _open(self) -> IO[str]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", newline="")
+        if self.format == "csv":
+            fields = [*_CSV_FIELDS, "outcome"] if self.include_outcomes else _CSV_FIELDS
+            self._csv = csv.DictWriter(self._file, fieldnames=fields, extrasaction="ignore")
+            self._csv.writeheader()
+        return self._file
+
+    def write(self, row: dict[str, object]) -> None:
+        f = self._file or self._open()
+        if self._csv is not None:
+            self._csv.writerow({key: "" if value is None else value for key, value in row.items()})
+        else:
+            f.write(json.dumps(row) + "\n")
+        self.rows += 1
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every or time.monotonic() - self._flushed_at >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._csv = None
+
+
 class SyncReport:
-    def __init__(self) -> None:
-        self._failures: list[SyncFailure] = []
+    """Counters and timings for one run, plus its failures.
+
+    Given a stream, failures (and, if it asks, every other document's outcome) are
+    written out as they happen instead of kept, so memory does not grow with the run.
+    """
+
+    def __init__(self, stream: ReportStream | None = None) -> None:
+        self._stream = stream
+        self._failures: list[SyncFailure] = [] # only kept without a stream
+        self._failure_count = 0
+        self._lock = threading.Lock() # concurrent syncs record into one report
+        self._retries: Counter[str] = Counter()
+        self._reconciled: Counter[str] = Counter()
+        self._outcomes: Counter[Outcome] = Counter()
+        self._phases: dict[Phase, PhaseTiming] = {}
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self.throttle: ThrottleSummary | None = None
 
     def record_failure(
         self,
@@ -22,29 +159,107 @@ class SyncReport:
         wordpress_id: int | None,
         error: Exception,
     ) -> None:
-        self._failures.append(
-            SyncFailure(
-                doc_path=doc_path,
-                content_type=content_type,
-                wordpress_id=wordpress_id,
-                error_summary=str(error),
-            )
+        failure = SyncFailure(
+            doc_path=doc_path,
+            content_type=content_type,
+            wordpress_id=wordpress_id,
+            error_summary=str(error),
         )
+        with self._lock:
+            self._failure_count += 1
+            if self._stream is None:
+                self._failures.append(failure)
+            else:
+                self._stream.write({**asdict(failure), "outcome": "failed"})
+
+    def record_retry(self, method: str, path: str, reason: str) -> None:
+        with self._lock:
+            self._retries[reason] += 1
+
+    @property
+    def retry_count(self) -> int:
+        return sum(self._retries.values())
+
+    @property
+    def retries_by_reason(self) -> dict[str, int]:
+        """Retried requests keyed by what failed: a status code or an exception name"""
+        return dict(self._retries)
+
+    def record_reconciled(self, outcome: str) -> None:
+        with self._lock:
+            self._reconciled[outcome] += 1
+
+    @property
+    def reconciled(self) -> dict[str, int]:
+        """Documents settled by --reconcile: "adopted" an existing post's ID, or were "current" remotely"""
+        return dict(self._reconciled)
+
+    def record_outcome(self, outcome: Outcome, count: int = 1) -> None:
+        with self._lock:
+            self._outcomes[outcome] += count
+
+    def record_document(
+        self, outcome: Outcome, doc_path: str, content_type: str | None, wordpress_id: int | None
+    ) -> None:
+        """Count a document's outcome, streaming a row for it if the stream includes outcomes"""
+        with self._lock:
+            self._outcomes[outcome] += 1
+            if self._stream is not None and self._stream.include_outcomes:
+                self._stream.write({
+                    "doc_path": doc_path,
+                    "content_type": content_type,
+                    "wordpress_id": wordpress_id,
+                    "error_summary": None,
+                    "outcome": outcome,
+                })
+
+    @property
+    def outcomes(self) -> dict[Outcome, int]:
+        return dict(self._outcomes)
+
+    def record_phase(self, phase: Phase, seconds: float) -> None:
+        with self._lock:
+            timing = self._phases.setdefault(phase, PhaseTiming())
+            timing.seconds += seconds
+            timing.count += 1
+
+    @contextmanager
+    def timed(self, phase: Phase) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, time.perf_counter() - started)
+
+    @property
+    def phases(self) -> dict[Phase, PhaseTiming]:
+        with self._lock:
+            return {phase: PhaseTiming(t.seconds, t.count) for phase, t in self._phases.items()}
+
+    def record_request(self, method: str, path: str, status: int, seconds: float) -> None:
+        with self._lock:
+            metrics = self._endpoints.setdefault(_endpoint(method, path), EndpointMetrics())
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.statuses[status] += 1
+            metrics.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @property
+    def endpoints(self) -> dict[str, EndpointMetrics]:
+        return dict(sorted(self._endpoints.items()))
 
     @property
     def has_failures(self) -> bool:
-        return bool(self._failures)
+        return self._failure_count > 0
 
     @property
     def failure_count(self) -> int:
-        return len(self._failures)
+        return self._failure_count
 
     def write_csv(self, output_path: Path) -> None:
+        """Write the failures kept in memory; a streamed report has already written them"""
         with output_path.open("w", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["doc_path", "content_type", "wordpress_id", "error_summary"],
-            )
+            writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
             writer.writeheader()
             for failure in self._failures:
                 writer.writerow({
@@ -53,3 +268,74 @@ class SyncReport:
                     "wordpress_id": failure.wordpress_id if failure.wordpress_id is not None else "",
                     "error_summary": failure.error_summary,
                 })
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "documents": {outcome: self._outcomes[outcome] for outcome in ("created", "updated", "skipped", "deleted")},
+            "failure_count": self._failure_count,
+            "failures": [asdict(failure) for failure in self._failures], # empty when streamed
+            "retries": self.retries_by_reason,
+            "reconciled": self.reconciled,
+            "phases": {phase: asdict(timing) for phase, timing in self.phases.items()},
+            "endpoints": {
+                endpoint: {
+                    "count": metrics.count,
+                    "seconds": metrics.seconds,
+                    "statuses": {str(status): n for status, n in sorted(metrics.statuses.items())},
+                    "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], metrics.buckets, strict=True)),
+                }
+                for endpoint, metrics in self.endpoints.items()
+            },
+            "throttle": asdict(self.throttle) if self.throttle is not None else None,
+        }
+
+    def write_json(self, output_path: Path) -> None:
+        output_path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def write_prometheus(self, output_path: Path) -> None:
+        """Write the run's metrics for node_exporter's textfile collector.
+
+        The file is replaced atomically, so the collector never reads half of it.
+        """
+        lines = [
+            "# HELP d2cms_sync_documents Documents handled by the last sync, by outcome",
+            "# TYPE d2cms_sync_documents gauge",
+            *(f'd2cms_sync_documents{{outcome="{o}"}} {self._outcomes[o]}' for o in ("created", "updated", "skipped", "deleted")),
+            "# HELP d2cms_sync_failures Documents that failed in the last sync",
+            "# TYPE d2cms_sync_failures gauge",
+            f"d2cms_sync_failures {self.failure_count}",
+            "# HELP d2cms_sync_retries Requests retried in the last sync, by reason",
+            "# TYPE d2cms_sync_retries gauge",
+            *(f'd2cms_sync_retries{{reason="{r}"}} {n}' for r, n in sorted(self._retries.items())),
+            "# HELP d2cms_sync_phase_seconds Time spent in each phase of the last sync, summed across workers",
+            "# TYPE d2cms_sync_phase_seconds gauge",
+            *(f'd2cms_sync_phase_seconds{{phase="{p}"}} {t.seconds:.6f}' for p, t in self.phases.items()),
+            "# HELP d2cms_sync_request_duration_seconds Time to response headers per endpoint in the last sync",
+            "# TYPE d2cms_sync_request_duration_seconds histogram",
+        ]
+        for endpoint, metrics in self.endpoints.items():
+            method, route = endpoint.split(" ", 1)
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip([*map(str, LATENCY_BUCKETS), "+Inf"], metrics.buckets, strict=True):
+                cumulative += count
+                lines.append(f'd2cms_sync_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"d2cms_sync_request_duration_seconds_sum{{{labels}}} {metrics.seconds:.6f}")
+            lines.append(f"d2cms_sync_request_duration_seconds_count{{{labels}}} {metrics.count}")
+        lines += [
+            "# HELP d2cms_sync_responses Responses per endpoint and status in the last sync",
+            "# TYPE d2cms_sync_responses gauge",
+        ]
+        for endpoint, metrics in self.endpoints.items():
+            method, route = endpoint.split(" ", 1)
+            for status, n in sorted(metrics.statuses.items()):
+                lines.append(f'd2cms_sync_responses{{method="{method}",route="{route}",status="{status}"}} {n}')
+        lines += [
+            "# HELP d2cms_sync_last_run_timestamp_seconds When the last sync finished",
+            "# TYPE d2cms_sync_last_run_timestamp_seconds gauge",
+            f"d2cms_sync_last_run_timestamp_seconds {time.time():.0f}",
+        ]
+
+        partial = output_path.with_name(f".{output_path.name}.tmp")
+        partial.write_text("\n".join(lines) + "\n")
+        os.replace(partial, output_path)
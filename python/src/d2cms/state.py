@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = ".d2cms"
+STATE_FILE = "state.sqlite3"
+# Directories under the docs root that d2cms writes itself and never reads documents from
+IGNORED_DIRS = frozenset({"d2cms-sync-results", STATE_DIR})
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    document_key TEXT,
+    wordpress_id INTEGER,
+    document_hash TEXT NOT NULL,
+    recorded_ns INTEGER NOT NULL,
+    field_hashes TEXT
+)
+"""
+
+# A file modified this close to when it was recorded may change again within the same
+# mtime tick without its fingerprint changing, so it is not trusted (cf. git's "racy" index)
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class FileState:
+    mtime_ns: int
+    size: int
+    inode: int
+    document_key: str | None
+    wordpress_id: int | None
+    document_hash: str
+    recorded_ns: int
+    field_hashes: dict[str, str] | None = None # per field group, as sent with document_hash
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return (
+            self.mtime_ns == stat_result.st_mtime_ns
+            and self.size == stat_result.st_size
+            and self.inode == stat_result.st_ino
+            and self.recorded_ns - self.mtime_ns > _RACY_WINDOW_NS
+        )
+
+
+def _fingerprint(stat_result: os.stat_result) -> tuple[int, int, int]:
+    return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+
+class SyncState:
+    """Local record of which files were in sync with WordPress, keyed by stat fingerprint.
+
+    Lives in `.d2cms/state.sqlite3` under the docs directory. It is purely a cache:
+    deleting it (or passing `rescan=True`) only means the next run reads and hashes
+    every file again. Rows are loaded once and written back in one transaction on close.
+    """
+
+    def __init__(self, docs_dir: Path, rescan: bool = False) -> None:
+        self._docs_dir = docs_dir
+        self._path = docs_dir / STATE_DIR / STATE_FILE
+        self._rescan = rescan
+        self._rows: dict[str, FileState] = {} if rescan else self._load()
+        self._by_key = self._index_keys()
+        self._changed: dict[str, FileState] = {}
+        self._forgotten: set[str] = set()
+        self._seen: dict[str, os.stat_result] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> SyncState:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _key(self, file_path: Path) -> str:
+        return file_path.relative_to(self._docs_dir).as_posix()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 1:
+            conn.execute("ALTER TABLE files ADD COLUMN field_hashes TEXT")
+        elif version != _SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS files")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _load(self) -> dict[str, FileState]:
+        if not self._path.exists():
+            return {}
+
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT path, mtime_ns, size, inode, document_key, wordpress_id, "
+                    "document_hash, recorded_ns, field_hashes FROM files"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError as e:
+            logger.warning("[state] ignoring unreadable sync state %s — %s", self._path, e)
+            self._path.unlink(missing_ok=True)
+            return {}
+
+        return {
+            path: FileState(
+                mtime_ns, size, inode, document_key, wordpress_id, document_hash, recorded_ns,
+                json.loads(hashes) if hashes else None,
+            )
+            for path, mtime_ns, size, inode, document_key, wordpress_id, document_hash, recorded_ns, hashes in rows
+        }
+
+    def _index_keys(self) -> dict[str, str]:
+        # Newest row per document_key, so a moved file's old row does not shadow it
+        by_key: dict[str, str] = {}
+        for key, state in sorted(self._rows.items(), key=lambda item: item[1].recorded_ns):
+            if state.document_key:
+                by_key[state.document_key] = key
+        return by_key
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def path_for_key(self, document_key: object) -> Path | None:
+        """Return the last known path of a document, or None if it is not recorded."""
+        key = self._by_key.get(str(document_key))
+        return self._docs_dir / key if key is not None else None
+
+    def field_hashes(self, document_key: object, document_hash: object) -> dict[str, str] | None:
+        """The field group hashes recorded when a document was synced at document_hash.
+
+        Found by key, so they survive the file being moved. None if the document was not
+        recorded at that hash, or was recorded before field hashes were kept.
+        """
+        if not document_key or not document_hash:
+            return None
+        key = self._by_key.get(str(document_key))
+        known = self._rows.get(key) if key is not None else None
+        if known is None or known.document_hash != document_hash:
+            return None
+        return known.field_hashes
+
+    def sent_content(self, file_path: Path) -> tuple[str, str] | None:
+        """The document_hash and content field hash a file was last synced with, if recorded.
+
+        Unlike lookup(), this does not care whether the file changed since, so the prepare
+        stage can tell whether its body still matches what WordPress has.
+        """
+        known = self._rows.get(self._key(file_path))
+        if known is None or not known.field_hashes or "content" not in known.field_hashes:
+            return None
+        return known.document_hash, known.field_hashes["content"]
+
+    def lookup(self, file_path: Path, stat_result: os.stat_result) -> FileState | None:
+        """Return the recorded state if the file is unchanged since it was last in sync."""
+        key = self._key(file_path)
+        known = self._rows.get(key)
+        if known is not None and known.matches(stat_result):
+            return known
+
+        with self._lock:
+            self._seen[key] = stat_result
+        return None
+
+    def recorded(self, file_path: Path, stat_result: os.stat_result) -> bool:
+        """Whether the file is exactly as last recorded, e.g. just written back by this run.
+
+        Unlike lookup(), this does not distrust recent writes, so it only suits telling a
+        process's own writes apart from someone else's.
+        """
+        known = self._rows.get(self._key(file_path))
+        return known is not None and (known.mtime_ns, known.size, known.inode) == _fingerprint(stat_result)
+
+    def record(
+        self,
+        file_path: Path,
+        document_key: object,
+        wordpress_id: int | None,
+        document_hash: str,
+        rewritten: bool = False,
+        field_hashes: dict[str, str] | None = None,
+    ) -> None:
+        """Mark a file as in sync. Pass rewritten=True after writing the file back."""
+        key = self._key(file_path)
+        stat_result = file_path.stat()
+
+        with self._lock:
+            seen = self._seen.pop(key, None)
+            if not rewritten and seen is not None and _fingerprint(seen) != _fingerprint(stat_result):
+                logger.debug("[state] %s changed while syncing — not recording", file_path)
+                return
+
+            state = FileState(
+                mtime_ns=stat_result.st_mtime_ns,
+                size=stat_result.st_size,
+                inode=stat_result.st_ino,
+                document_key=str(document_key) if document_key else None,
+                wordpress_id=wordpress_id,
+                document_hash=document_hash,
+                recorded_ns=time.time_ns(),
+                field_hashes=field_hashes,
+            )
+            self._rows[key] = state
+            self._changed[key] = state
+            if state.document_key:
+                self._by_key[state.document_key] = key
+            self._forgotten.discard(key)
+
+    def forget(self, file_path: Path) -> None:
+        key = self._key(file_path)
+        with self._lock:
+            state = self._rows.pop(key, None)
+            if state is not None and state.document_key and self._by_key.get(state.document_key) == key:
+                del self._by_key[state.document_key]
+            self._changed.pop(key, None)
+            self._forgotten.add(key)
+
+    def close(self) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """Write this run's changes to disk."""
+        with self._lock:
+            if not (self._changed or self._forgotten or self._rescan):
+                return
+
+            self._path.parent.mkdir(exist_ok=True)
+            conn = self._connect()
+            try:
+                with conn:
+                    if self._rescan:
+                        conn.execute("DELETE FROM files")
+                    conn.executemany(
+                        "DELETE FROM files WHERE path = ?", [(key,) for key in self._forgotten]
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (key, s.mtime_ns, s.size, s.inode, s.document_key, s.wordpress_id,
+                             s.document_hash, s.recorded_ns,
+                             json.dumps(s.field_hashes) if s.field_hashes is not None else None)
+                            for key, s in self._changed.items()
+                        ],
+                    )
+            finally:
+                conn.close()
+
+            self._changed.clear()
+            self._forgotten.clear()
+            self._rescan = False
@@ -0,0 +1,126 @@
+import html
+import logging
+import re
+import threading
+import unicodedata
+from urllib.parse import quote
+
+from httpx import Client
+
+from .http import IDEMPOTENT
+
+logger = logging.getLogger(__name__)
+
+TAGS_PER_PAGE = 100
+
+
+def wp_slug(name: str) -> str:
+    """Approximate WordPress' sanitize_title() for a term name."""
+    text = re.sub(r"<[^>]*>", "", html.unescape(name)).strip()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    text = text.lower().replace(".", "-")
+    text = "".join(c if c.isascii() else quote(c).lower() for c in text)
+    text = re.sub(r"[^%a-z0-9 _-]", "", text)
+    text = re.sub(r"\s+", "-", text)
+    return re.sub(r"-+", "-", text).strip("-")
+
+
+def _normalize_name(name: str) -> str:
+    # WordPress returns names HTML-escaped and compares them case-insensitively
+    return " ".join(html.unescape(name).split()).casefold()
+
+
+class TagCatalog:
+    """Run-scoped view of the site's tags, loaded once and resolved in memory.
+
+    Lookups mirror WordPress' term_exists(): a name matches an existing tag by its
+    sanitized slug first, then by case-insensitive name. Creates are serialised so
+    concurrent syncs never create the same tag twice.
+    """
+
+    def __init__(self, client: Client) -> None:
+        self._client = client
+        self._by_slug: dict[str, int] = {}
+        self._by_name: dict[str, int] = {}
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._create_lock = threading.Lock()
+
+    def _remember(self, tag_id: int, name: str, slug: str | None = None) -> None:
+        self._by_slug[slug or wp_slug(name)] = tag_id
+        self._by_name.setdefault(_normalize_name(name), tag_id)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+
+        with self._load_lock:
+            if self._loaded:
+                return
+
+            page = 1
+            while True:
+                response = self._client.get("wp/v2/tags", params={
+                    "per_page": TAGS_PER_PAGE,
+                    "page": page,
+                    "_fields": "id,name,slug",
+                }, follow_redirects=True)
+                response.raise_for_status()
+
+                batch = response.json()
+                for tag in batch:
+                    self._remember(tag["id"], tag["name"], tag.get("slug"))
+
+                # Fall back to a short page as the end marker if the header is missing
+                total_pages = int(response.headers.get("X-WP-TotalPages", 0))
+                if (page >= total_pages) if total_pages else (len(batch) < TAGS_PER_PAGE):
+                    break
+                page += 1
+
+            logger.debug("[tags] loaded %d tag(s) in %d page(s)", len(self._by_slug), page)
+            self._loaded = True
+
+    def _lookup(self, name: str) -> int | None:
+        tag_id = self._by_slug.get(wp_slug(name))
+        if tag_id is None:
+            tag_id = self._by_name.get(_normalize_name(name))
+        return tag_id
+
+    def _create(self, name: str) -> int:
+        logger.debug("Creating tag: %s", name)
+        # Resending is safe: a tag created by a lost attempt comes back as term_exists
+        response = self._client.post("wp/v2/tags", json={"name": name}, extensions={IDEMPOTENT: True})
+
+        # Created remotely since the catalog was loaded (e.g. by another run)
+        if response.status_code == 400:
+            error = response.json()
+            if error.get("code") == "term_exists" and error.get("data", {}).get("term_id"):
+                tag_id = int(error["data"]["term_id"])
+                self._remember(tag_id, name)
+                return tag_id
+
+        response.raise_for_status()
+        tag = response.json()
+        self._remember(tag["id"], tag.get("name", name), tag.get("slug"))
+        return int(tag["id"])
+
+    def resolve(self, names: list[str]) -> list[int]:
+        """Get or create WordPress tag IDs for the given list of tag names
+
+        Names come straight from YAML, so numbers such as `2024` are taken as their text.
+        """
+        if not names:
+            return []
+
+        self._ensure_loaded()
+        tag_ids = []
+        for name in map(str, names):
+            tag_id = self._lookup(name)
+            if tag_id is None:
+                with self._create_lock:
+                    tag_id = self._lookup(name)
+                    if tag_id is None:
+                        tag_id = self._create(name)
+            tag_ids.append(tag_id)
+
+        return tag_ids
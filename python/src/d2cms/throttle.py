@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from .config import D2CMSConfig
+
+logger = logging.getLogger(__name__)
+
+# Latency above this multiple of the running baseline counts as the server slowing down
+_SLOW_FACTOR = 2.0
+# Weight of each healthy response in the latency baseline
+_BASELINE_WEIGHT = 0.1
+_THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """Spaces requests to at most `rate` per second, allowing bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Tokens may go negative: each caller reserves its slot, then sleeps unlocked
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveLimit:
+    """Caps in-flight requests with additive-increase/multiplicative-decrease (AIMD).
+
+    The limit halves when a response is throttled (429/503), fails, or takes more than
+    twice the running latency baseline, at most once per baseline latency so a burst of
+    throttled responses counts as one signal. Each healthy response adds 1/limit, so the
+    limit grows by one per round of requests until it reaches `maximum` again.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1) -> None:
+        self._maximum = maximum
+        self._minimum = minimum
+        self._limit = float(maximum)
+        self._in_flight = 0
+        self._baseline: float | None = None
+        self._last_decrease = -math.inf
+        self._cond = threading.Condition()
+        self.lowest = maximum
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, congested: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            baseline = self._baseline
+            if not congested and baseline is not None and latency > baseline * _SLOW_FACTOR:
+                congested = True
+
+            now = time.monotonic()
+            if congested:
+                if now - self._last_decrease >= (baseline or 0.0):
+                    self._limit = max(self._minimum, self._limit / 2)
+                    self._last_decrease = now
+                    self.decreases += 1
+                    self.lowest = min(self.lowest, int(self._limit))
+                    logger.info("[throttle] lowering concurrency to %d", int(self._limit))
+            else:
+                self._limit = min(self._maximum, self._limit + 1 / self._limit)
+                self._baseline = latency if baseline is None else (
+                    baseline + _BASELINE_WEIGHT * (latency - baseline)
+                )
+            self._cond.notify_all()
+
+
+@dataclass(frozen=True)
+class ThrottleSummary:
+    max_rps: float | None
+    limit: int | None # current concurrency limit; None when adaptive concurrency is off
+    lowest_limit: int | None
+    decreases: int
+    throttled: int # 429/503 responses seen
+    rate_waits: int # requests delayed by the max_rps token bucket
+    rate_wait_seconds: float
+
+
+class Throttle:
+    """Client-side traffic shaping shared by every request of one client"""
+
+    def __init__(self, max_rps: float | None, max_concurrency: int, adaptive: bool = True) -> None:
+        self.max_rps = max_rps
+        self.bucket = TokenBucket(max_rps) if max_rps else None
+        self.concurrency = AdaptiveLimit(max_concurrency) if adaptive else None
+        self._lock = threading.Lock()
+        self._throttled = 0
+        self._rate_waits = 0
+        self._rate_wait_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, cfg: D2CMSConfig) -> Throttle:
+        return cls(cfg.max_rps, cfg.http_pool_size, cfg.adaptive_concurrency)
+
+    def record(self, throttled: bool, waited: float) -> None:
+        with self._lock:
+            self._throttled += throttled
+            if waited:
+                self._rate_waits += 1
+                self._rate_wait_seconds += waited
+
+    def summary(self) -> ThrottleSummary:
+        with self._lock:
+            return ThrottleSummary(
+                max_rps=self.max_rps,
+                limit=self.concurrency.limit if self.concurrency else None,
+                lowest_limit=self.concurrency.lowest if self.concurrency else None,
+                decreases=self.concurrency.decreases if self.concurrency else 0,
+                throttled=self._throttled,
+                rate_waits=self._rate_waits,
+                rate_wait_seconds=self._rate_wait_seconds,
+            )
+
+
+class ThrottleTransport(httpx.BaseTransport):
+    """Applies a Throttle to every attempt sent through the wrapped transport"""
+
+    def __init__(self, transport: httpx.BaseTransport, throttle: Throttle) -> None:
+        self._transport = transport
+        self._throttle = throttle
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        concurrency = self._throttle.concurrency
+        if concurrency is not None:
+            concurrency.acquire()
+
+        throttled = False
+        congested = True # until a response arrives; errors count as congestion
+        started = time.monotonic()
+        waited = 0.0
+        try:
+            # A concurrency slot is taken first so queued requests do not hold rate tokens
+            if self._throttle.bucket is not None:
+                waited = self._throttle.bucket.acquire()
+                started = time.monotonic()
+            response = self._transport.handle_request(request)
+            throttled = congested = response.status_code in _THROTTLE_STATUSES
+            return response
+        finally:
+            if concurrency is not None:
+                concurrency.release(time.monotonic() - started, congested)
+            self._throttle.record(throttled, waited)
+
+    def close(self) -> None:
+        self._transport.close()
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import D2CMSConfig
+from .state import IGNORED_DIRS
+
+IGNORE_FILE = ".d2cmsignore"
+
+
+class MarkdownFile(NamedTuple):
+    path: Path
+    stat: os.stat_result
+
+
+@dataclass(frozen=True)
+class _Rule:
+    pattern: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _translate(glob: str) -> str:
+    """Regex for a gitignore-style glob: `*` and `?` stop at `/`, `**` crosses it"""
+    out = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out)
+
+
+def _parse_rule(line: str) -> _Rule | None:
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate or line.startswith(("\\#", "\\!")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # Like .gitignore: a pattern with a slash is relative to the docs root, one without
+    # matches a file or directory of that name at any depth
+    glob = line.lstrip("/") if "/" in line else f"**/{line}"
+    return _Rule(re.compile(_translate(glob)), negate, dir_only)
+
+
+def _rules(lines: Iterable[str]) -> tuple[_Rule, ...]:
+    return tuple(rule for rule in map(_parse_rule, lines) if rule is not None)
+
+
+class TreeFilter:
+    """Decides which markdown files under the docs root are documents.
+
+    Directories d2cms writes itself are always skipped. Exclude rules come from
+    `.d2cmsignore` in the docs root (gitignore syntax: `#` comments, `!` re-includes,
+    a trailing `/` matches directories only, and the last matching rule wins),
+    followed by any `exclude` globs. When `include` globs are given, only files that
+    match one, or sit in a directory that does, are kept.
+    """
+
+    def __init__(self, root: Path, exclude: Iterable[str] = (), include: Iterable[str] = ()) -> None:
+        self.root = root
+        self._exclude = _rules(exclude)
+        self._include = _rules(include)
+
+    @classmethod
+    def from_config(cls, cfg: D2CMSConfig) -> TreeFilter:
+        ignore_file = cfg.docs_dir / IGNORE_FILE
+        try:
+            lines = ignore_file.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            lines = []
+        return cls(cfg.docs_dir, [*lines, *cfg.exclude], cfg.include)
+
+    def _relative(self, path: Path) -> str | None:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _excluded(self, relative: str, is_dir: bool) -> bool:
+        excluded = False
+        for rule in self._exclude:
+            if (is_dir or not rule.dir_only) and rule.pattern.fullmatch(relative):
+                excluded = not rule.negate
+        return excluded
+
+    def _included(self, relative: str) -> bool:
+        if not self._include:
+            return True
+        parts = relative.split("/")
+        candidates = ["/".join(parts[:n]) for n in range(1, len(parts) + 1)]
+        return any(
+            rule.pattern.fullmatch(candidate)
+            for rule in self._include
+            for n, candidate in enumerate(candidates, 1)
+            if n < len(parts) or not rule.dir_only
+        )
+
+    def walks_into(self, directory: Path) -> bool:
+        """Whether the walk descends into a directory it found"""
+        relative = self._relative(directory)
+        if relative is None or directory.name in IGNORED_DIRS:
+            return False
+        return not self._excluded(relative, is_dir=True)
+
+    def keeps_file(self, file_path: Path) -> bool:
+        """Whether a markdown file the walk found, in a directory it walked into, is a document"""
+        relative = self._relative(file_path)
+        return (
+            relative is not None
+            and file_path.suffix == ".md"
+            and not self._excluded(relative, is_dir=False)
+            and self._included(relative)
+        )
+
+    def reaches(self, directory: Path) -> bool:
+        """Whether a walk from the docs root gets as far as directory"""
+        if not directory.is_relative_to(self.root):
+            return False
+        return all(
+            self.walks_into(parent)
+            for parent in [directory, *directory.parents]
+            if parent != self.root and parent.is_relative_to(self.root)
+        )
+
+    def allows(self, file_path: Path) -> bool:
+        """Whether a path found some other way, such as by git or a watcher, is a document"""
+        return self.keeps_file(file_path) and self.reaches(file_path.parent)
+
+
+def _stat(entry: os.DirEntry[str]) -> os.stat_result:
+    # On Windows the cached stat has no inode, which the sync state fingerprints
+    return os.stat(entry.path) if sys.platform == "win32" else entry.stat()
+
+
+def _list(directory: Path, tree_filter: TreeFilter) -> tuple[list[MarkdownFile], list[Path]]:
+    """One directory's documents, stat'ed, and the subdirectories to walk next, by name"""
+    files: list[MarkdownFile] = []
+    directories: list[Path] = []
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return files, directories # removed while walking
+    for entry in entries:
+        path = Path(entry.path)
+        try:
+            # Symlinked directories are not followed, so a link cycle cannot trap the walk
+            if entry.is_dir(follow_symlinks=False):
+                if tree_filter.walks_into(path):
+                    directories.append(path)
+            elif entry.name.endswith(".md") and entry.is_file() and tree_filter.keeps_file(path):
+                files.append(MarkdownFile(path, _stat(entry)))
+        except FileNotFoundError:
+            continue
+    return files, directories
+
+
+def walk_markdown(directory: Path, tree_filter: TreeFilter, threads: int = 1) -> Iterator[MarkdownFile]:
+    """Yield the documents under directory depth-first, each directory's files before its subdirectories.
+
+    The walk is iterative, so tree depth is not bounded by the recursion limit. With
+    more than one thread, the next few directories in walk order are listed and stat'ed
+    ahead of time, which hides the round trips of a network filesystem.
+    """
+    if threads <= 1:
+        stack = [directory]
+        while stack:
+            files, directories = _list(stack.pop(), tree_filter)
+            yield from files
+            stack.extend(reversed(directories))
+        return
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="d2cms-walk") as pool:
+        stack = [directory]
+        ahead: dict[Path, Future[tuple[list[MarkdownFile], list[Path]]]] = {}
+        while stack:
+            # The top of the stack is walked next; keep the pool busy with what follows
+            for upcoming in stack[-threads * 2:]:
+                if upcoming not in ahead:
+                    ahead[upcoming] = pool.submit(_list, upcoming, tree_filter)
+            files, directories = ahead.pop(stack.pop()).result()
+            yield from files
+            stack.extend(reversed(directories))
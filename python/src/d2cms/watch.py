@@ -0,0 +1,102 @@
+import importlib.util
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+from .walk import TreeFilter, walk_markdown
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = tuple[int, int, int] # (mtime_ns, size, inode)
+
+
+def native_watching_available() -> bool:
+    return importlib.util.find_spec("watchfiles") is not None
+
+
+def snapshot(root: Path, tree_filter: TreeFilter | None = None) -> dict[Path, Fingerprint]:
+    """Stat every document under root; without a filter, every markdown file d2cms does not write itself"""
+    return {
+        path: (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        for path, stat in walk_markdown(root, tree_filter or TreeFilter(root))
+    }
+
+
+def _diff(before: dict[Path, Fingerprint], after: dict[Path, Fingerprint]) -> set[Path]:
+    changed = {path for path, fingerprint in after.items() if before.get(path) != fingerprint}
+    return changed | (before.keys() - after.keys())
+
+
+def poll_changes(
+    root: Path,
+    interval: float,
+    debounce: float,
+    stop: threading.Event,
+    baseline: dict[Path, Fingerprint] | None = None,
+    tree_filter: TreeFilter | None = None,
+) -> Iterator[set[Path]]:
+    """Yield the markdown paths that changed under root, by comparing stat snapshots.
+
+    Once a change is seen the tree is rescanned every `debounce` seconds until a scan
+    finds nothing new, so an editor's burst of writes arrives as one set. Changes
+    since `baseline`, if given, are reported on the first scan.
+    """
+    previous = baseline if baseline is not None else snapshot(root, tree_filter)
+    while not stop.wait(interval):
+        current = snapshot(root, tree_filter)
+        changed = _diff(previous, current)
+        while changed and not stop.wait(debounce):
+            latest = snapshot(root, tree_filter)
+            more = _diff(current, latest)
+            current = latest
+            if not more:
+                break
+            changed |= more
+        previous = current
+        if changed:
+            yield changed
+
+
+def native_changes(
+    root: Path,
+    debounce: float,
+    stop: threading.Event,
+    baseline: dict[Path, Fingerprint] | None = None,
+    tree_filter: TreeFilter | None = None,
+) -> Iterator[set[Path]]:
+    """Yield changed paths from OS notifications (inotify, FSEvents, ...) via watchfiles.
+
+    A set is yielded once no event has arrived for `debounce` seconds. Deleted paths
+    that are not markdown files are directories, whose documents went with them.
+    Changes since `baseline`, if given, are added to the first set once the watcher
+    is running, so nothing written before it started is missed.
+    """
+    import watchfiles
+
+    tree_filter = tree_filter or TreeFilter(root)
+
+    def _filter(change: watchfiles.Change, path: str) -> bool:
+        changed = Path(path)
+        if path.endswith(".md"):
+            return tree_filter.allows(changed)
+        if change == watchfiles.Change.deleted or os.path.isdir(path):
+            return tree_filter.reaches(changed)
+        return False
+
+    for changes in watchfiles.watch(
+        root,
+        watch_filter=_filter,
+        step=max(1, int(debounce * 1000)),
+        stop_event=stop,
+        raise_interrupt=False,
+        rust_timeout=1000,
+        yield_on_timeout=True, # an empty set once a second while nothing changes
+    ):
+        paths = {Path(path) for _, path in changes}
+        if baseline is not None:
+            paths |= _diff(baseline, snapshot(root, tree_filter))
+            baseline = None
+        if paths:
+            yield paths
@@ -1,22 +1,48 @@
 import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import get_args
 
 import frontmatter
+import httpx
 from frontmatter import Post
 from httpx import Client
 
-from . import docs
+from .batch import BatchRequest, send_batch
+from .cache import RenderCache
 from .config import D2CMSConfig
 from .docs import (
     ContentType,
     D2CMSFrontmatter,
+    DocumentChangedError,
     content_type_from_path,
+    doc_hash_matches,
+    field_hashes,
     generate_doc_hash,
+    rehash_document,
     to_html,
-    update_frontmatter,
+    write_frontmatter_fields,
 )
-from .http import make_client
-from .report import SyncReport
+from .gitdiff import FileChange, changed_markdown_files, read_file_at
+from .graph import SyncNode, build_sync_graph
+from .http import BEFORE_RETRY, IDEMPOTENT, make_client
+from .index import DocumentIndex
+from .media import MediaCache, MediaLibrary
+from .plan import Action, SyncPlan
+from .prepare import PreparedDocument, PrepareError, prepare_documents
+from .remote import RemoteCatalog, RemotePost
+from .report import Outcome, SyncReport
+from .state import SyncState
+from .tags import TagCatalog, wp_slug
+from .throttle import Throttle
+from .walk import MarkdownFile, TreeFilter, walk_markdown
+from .watch import native_changes, native_watching_available, poll_changes, snapshot
+from .writeback import FrontmatterWriter
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +51,86 @@ class ParentNotFoundError(FileNotFoundError):
     """Raised when a parent_key does not match an existing content object in the remote DB"""
 
 
-def _find_parent_id(metadata: D2CMSFrontmatter, content_type: ContentType, client: Client) -> int | None:
-    """Find the WordPress ID of the parent document, if any"""
+class ParentSyncFailedError(RuntimeError):
+    """Raised in place of syncing a document whose parent failed earlier in the same run"""
+
+
+@dataclass
+class RehashSummary:
+    rewritten: int = 0
+    current: int = 0
+    changed: list[Path] = field(default_factory=list) # out of sync; left for the next sync
+    failed: list[Path] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Orphan:
+    """A post whose document_key no longer belongs to any local document"""
+    content_type: ContentType
+    document_key: str
+    wordpress_id: int
+    duplicate: bool = False # the key is in use, but by another post with the same key
+
+
+@dataclass
+class GcSummary:
+    orphans: list[Orphan] = field(default_factory=list)
+    unreadable: list[Path] = field(default_factory=list) # documents whose key could not be read
+    trashed: list[Orphan] = field(default_factory=list)
+    failed: list[tuple[Orphan, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _Write:
+    """The request that brings one document in line with WordPress, built ahead of sending"""
+    file_path: Path
+    document: Post
+    content_type: ContentType
+    method: str # POST creates or updates; DELETE removes a deprecated document's post
+    route: str
+    document_hash: str = "" # the hash stored on success; unused by deletes
+    body: dict[str, object] | None = None
+    field_hashes: dict[str, str] | None = None # recorded on success, for the next delta
+
+
+@dataclass
+class SyncContext:
+    """Run-scoped state shared by every document synced in one run"""
+    cfg: D2CMSConfig
+    report: SyncReport
+    client: Client
+    tags: TagCatalog
+    index: DocumentIndex
+    state: SyncState
+    force: bool = False
+    renders: RenderCache | None = None
+    jobs: int = 1 # processes used to parse, hash and render before syncing
+    writer: FrontmatterWriter | None = None # None writes frontmatter back synchronously
+    prepared: dict[Path, PreparedDocument] = field(default_factory=dict)
+    batch_size: int = 0 # requests per batch/v1 call; 0 sends each document's request alone
+    remote: RemoteCatalog | None = None # posts found by a --reconcile sweep
+    media: MediaLibrary | None = None # None leaves references to local files as they are
+    # Deprecated documents met so far, deleted together once every write has been sent
+    deletes: list[_Write] = field(default_factory=list)
+
+
+def _find_parent_id(
+    metadata: D2CMSFrontmatter,
+    content_type: ContentType,
+    client: Client,
+    index: DocumentIndex | None = None,
+) -> int | None:
+    """Find the WordPress ID of the parent document, if any
+
+    The local index answers without a request when it knows the parent's wordpress_id;
+    the remote meta query is only a fallback for keys it cannot answer.
+    """
     if metadata.parent_key:
+        parent = index.get(metadata.parent_key) if index is not None else None
+        if parent is not None and parent.wordpress_id and parent.content_type == content_type:
+            return parent.wordpress_id
+
+        logger.debug("[sync] parent %s not in local index, querying WordPress", metadata.parent_key)
         response = client.get(f"wp/v2/{content_type}", params={
             "meta_key": "document_key",
             "meta_value": metadata.parent_key
@@ -42,123 +145,1315 @@ def _find_parent_id(metadata: D2CMSFrontmatter, content_type: ContentType, clien
         return None
 
 
-def _get_or_create_tag_ids(tags: list[str], client: Client) -> list[int]:
-    """Get or create WordPress tag IDs for the given list of tag names"""
-    tag_ids = []
+def _find_created_post(
+    content_type: ContentType, document_key: object, client: Client
+) -> httpx.Response | None:
+    """Look up a post created by an earlier attempt whose response was lost"""
+    response = client.get(f"wp/v2/{content_type}", params={
+        "meta_key": "document_key",
+        "meta_value": str(document_key),
+    }, follow_redirects=True)
+    response.raise_for_status()
 
-    for name in tags:
-        response = client.get("wp/v2/tags", params={"name": name}, follow_redirects=True)
-        existing = response.json()
+    posts = response.json()
+    if not posts:
+        return None
+    logger.info("[sync] found post created by a failed attempt: %s (id=%s)", document_key, posts[0]["id"])
+    return httpx.Response(200, json=posts[0], request=response.request)
 
-        if existing:
-            tag_ids.append(existing[0]['id'])
-        else:
-            logger.debug("Creating tag: %s", name)
-            response = client.post("wp/v2/tags", json={"name": name})
-            response.raise_for_status()
-            tag_ids.append(response.json()['id'])
 
-    return tag_ids
+def _retry_extensions(
+    content_type: ContentType, document_key: object, wordpress_id: object, client: Client
+) -> dict[str, object]:
+    # Updates are idempotent; a create is only resent once no post carries its document_key
+    if wordpress_id:
+        return {IDEMPOTENT: True}
+    if not document_key:
+        return {}
+    return {BEFORE_RETRY: lambda: _find_created_post(content_type, document_key, client)}
 
 
-def _handle_delete(document: Post, file_path: Path, cfg: D2CMSConfig) -> None:
-    """Delete post from WordPress and remove local file."""
-    wordpress_id = document.metadata.get("wordpress_id")
-    post_title = document.metadata.get("title")
+def _delete_post(
+    content_type: ContentType, wordpress_id: int, client: Client, missing_ok: bool = False, force: bool = False
+) -> None:
+    logger.debug("[delete] DELETE wp/v2/%s/%s%s", content_type, wordpress_id, "?force=true" if force else "")
+    response = client.delete(f"wp/v2/{content_type}/{wordpress_id}", params={"force": "true"} if force else None)
+    if missing_ok and response.status_code in (404, 410):
+        logger.info("[delete] wp/v2/%s/%s was already removed", content_type, wordpress_id)
+        return
+    response.raise_for_status()
+
+
+def _defer_delete(file_path: Path, document: Post, content_type: ContentType, ctx: SyncContext) -> None:
+    """Queue a deprecated document for the delete phase that follows every write"""
+    logger.debug("[delete] queued: %s", file_path)
+    wordpress_id = _wordpress_id(document)
+    route = f"wp/v2/{content_type}/{wordpress_id}" if wordpress_id else "" # no route: never reached WordPress
+    ctx.deletes.append(_Write(file_path, document, content_type, "DELETE", route))
 
-    logger.info("[delete] %s", file_path)
 
-    if not wordpress_id:
-        logger.info("[delete] %s was never synced — removing local file only", post_title)
-        file_path.unlink()
+def _delete_deprecated(ctx: SyncContext, workers: int) -> None:
+    """Delete the posts of the deprecated documents queued this run, then their files
+
+    Runs after every create and update has been sent, so children moved off a
+    deprecated parent already point at their new one. Deletes go out on the worker
+    pool, or in batch/v1 calls with a batch size; the trash is bypassed when
+    `delete_mode` is "force". A file is only unlinked once WordPress confirms its
+    post is gone, and a document that never reached WordPress just loses its file.
+    """
+    deletes, ctx.deletes = ctx.deletes, []
+    remote: list[tuple[_Write, int]] = []
+    for write in deletes:
+        wordpress_id = _wordpress_id(write.document)
+        if wordpress_id:
+            remote.append((write, wordpress_id))
+            continue
+        logger.info("[delete] %s was never synced — removing local file only", write.document.metadata.get("title"))
+        _finish_delete(write, ctx)
+    if not remote:
         return
 
-    with make_client(cfg) as client:
-        content_type = content_type_from_path(file_path, cfg.docs_dir)
+    force = ctx.cfg.delete_mode == "force"
+    logger.info("[delete] deleting %d document(s)%s", len(remote), " permanently" if force else "")
 
-        logger.debug("[delete] DELETE wp/v2/%s/%s", content_type, wordpress_id)
-        response = client.delete(f"wp/v2/{content_type}/{wordpress_id}")
-        response.raise_for_status()
+    def _delete(pending: tuple[_Write, int]) -> Exception | None:
+        write, wordpress_id = pending
+        try:
+            with ctx.report.timed("delete"):
+                _delete_post(write.content_type, wordpress_id, ctx.client, True, force)
+        except Exception as e:
+            return e
+        return None
 
-        logger.info("[delete] %s removed from WordPress (id=%s)", post_title, wordpress_id)
-        file_path.unlink()
+    def _delete_batch(batch: list[tuple[_Write, int]]) -> list[Exception | None]:
+        query = "?force=true" if force else ""
+        try:
+            with ctx.report.timed("delete"):
+                responses = send_batch(ctx.client, [BatchRequest("DELETE", f"{w.route}{query}") for w, _ in batch])
+        except Exception as e:
+            logger.error("[batch] batch of %d delete(s) failed — %s", len(batch), e)
+            return [e] * len(batch)
 
+        errors: list[Exception | None] = []
+        for response in responses:
+            try:
+                if response.status_code not in (404, 410):
+                    response.raise_for_status()
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
 
-def _sync_directory(directory: Path, cfg: D2CMSConfig, report: SyncReport, force: bool = False) -> None:
-    """Sync all documents in a directory to WordPress"""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-delete") as pool:
+        if ctx.batch_size:
+            batches = [remote[i:i + ctx.batch_size] for i in range(0, len(remote), ctx.batch_size)]
+            errors = [error for batch_errors in pool.map(_delete_batch, batches) for error in batch_errors]
+        else:
+            errors = list(pool.map(_delete, remote))
+
+    for (write, _), error in zip(remote, errors, strict=True):
+        if error is None:
+            _finish_delete(write, ctx)
+        else:
+            _record_sync_failure(write.file_path, write.content_type, write.document, error, ctx)
+
+
+def _finish_delete(write: _Write, ctx: SyncContext) -> None:
+    """Remove a deprecated document locally once its post, if it had one, is gone"""
+    wordpress_id = _wordpress_id(write.document)
+    if wordpress_id:
+        logger.info("[delete] %s removed from WordPress (id=%s)", write.document.metadata.get("title"), wordpress_id)
+    try:
+        write.file_path.unlink(missing_ok=True)
+    except OSError as e:
+        _record_sync_failure(write.file_path, write.content_type, write.document, e, ctx)
+        return
+    _forget_deleted(write.file_path, write.document, ctx)
+    _record_outcome("deleted", write.file_path, wordpress_id, ctx)
+
+
+def _collect_files(
+    directory: Path, cfg: D2CMSConfig, tree_filter: TreeFilter | None = None
+) -> Iterator[MarkdownFile]:
+    """Yield the documents under directory with their stat, filtered by .d2cmsignore and the run's globs"""
     logger.debug("[sync] scanning directory: %s", directory)
-    files, directories = docs.read_directory(directory)
+    yield from walk_markdown(directory, tree_filter or TreeFilter.from_config(cfg), cfg.scan_threads)
+
+
+def _scan_documents(directory: Path, ctx: SyncContext) -> dict[Path, Post]:
+    """Parse every document under directory once and add it to the run's document index
+
+    Files whose stat fingerprint matches the sync state are indexed from the state
+    and left out of the result without being opened, unless the run is forced. With
+    more than one job, the remaining files are parsed, hashed and rendered in a process
+    pool and their payloads kept in `ctx.prepared` for the network stage.
+    """
+    pending: list[Path] = []
+    unchanged = 0
+    started = time.perf_counter()
+    for file_path, stat in _collect_files(directory, ctx.cfg):
+        try:
+            if not ctx.force:
+                known = ctx.state.lookup(file_path, stat)
+                if known is not None and ctx.media is not None and "media" in (known.field_hashes or {}):
+                    known = None # the files it references may have changed since
+                if known is not None and _remote_agrees(
+                    file_path, known.document_key, known.wordpress_id, known.document_hash, ctx
+                ):
+                    ctx.index.put(known.document_key, file_path, known.wordpress_id)
+                    _record_outcome("skipped", file_path, known.wordpress_id, ctx)
+                    unchanged += 1
+                    continue
+        except Exception as e:
+            _record_load_failure(file_path, e, ctx)
+            continue
+        pending.append(file_path)
+    ctx.report.record_phase("scan", time.perf_counter() - started)
+
+    if unchanged:
+        logger.info("[sync] skipping %d unchanged document(s) in %s", unchanged, directory)
+
+    documents: dict[Path, Post] = {}
+    if ctx.jobs > 1 and len(pending) > 1:
+        logger.info("[sync] preparing %d document(s) with %d jobs", len(pending), ctx.jobs)
+        render_cache_bytes = ctx.cfg.render_cache_mb * 1024 * 1024 if ctx.renders is not None else 0
+        started = time.perf_counter()
+        sent_content = {
+            file_path: sent for file_path in pending if (sent := ctx.state.sent_content(file_path)) is not None
+        }
+        for file_path, result in prepare_documents(
+            pending, ctx.cfg.docs_dir, ctx.force, ctx.jobs, render_cache_bytes, ctx.cfg.hash_algorithm, sent_content
+        ):
+            if isinstance(result, PrepareError):
+                _record_load_failure(file_path, result, ctx)
+                continue
+            if result.render_key is not None and result.html is not None and ctx.renders is not None:
+                ctx.renders.put(result.render_key, result.html)
+            ctx.prepared[file_path] = result
+            documents[file_path] = result.document
+            ctx.index.add(file_path, result.document)
+        ctx.report.record_phase("prepare", time.perf_counter() - started)
+        return documents
 
-    for file_path in files:
-        _sync_document(file_path, cfg, report, force=force)
+    for file_path in pending:
+        try:
+            with ctx.report.timed("parse"):
+                document = frontmatter.load(file_path)
+        except Exception as e:
+            _record_load_failure(file_path, e, ctx)
+            continue
 
-    for child_dir in directories:
-        if child_dir.exists() and child_dir.name != "d2cms-sync-results":
-            _sync_directory(child_dir, cfg, report, force=force)
+        documents[file_path] = document
+        ctx.index.add(file_path, document)
+    return documents
+
+
+def _remote_agrees(
+    file_path: Path, document_key: str | None, wordpress_id: int | None, document_hash: str, ctx: SyncContext
+) -> bool:
+    """False if a reconcile sweep found the document's post under another ID or hash"""
+    if ctx.remote is None or not document_key:
+        return True
+    remote = ctx.remote.get(content_type_from_path(file_path, ctx.cfg.docs_dir), document_key, wordpress_id)
+    return remote is None or (remote.wordpress_id, remote.document_hash) == (wordpress_id, document_hash)
+
+
+def _record_load_failure(file_path: Path, error: Exception, ctx: SyncContext) -> None:
+    logger.error("[sync] failed: %s — %s", file_path, error)
+    ctx.report.record_failure(
+        doc_path=str(file_path.relative_to(ctx.cfg.docs_dir)),
+        content_type=None,
+        wordpress_id=None,
+        error=error,
+    )
+
+
+def _sync_directory(directory: Path, ctx: SyncContext) -> None:
+    """Sync all documents in a directory to WordPress"""
+    for file_path, document in _scan_documents(directory, ctx).items():
+        _sync_document(file_path, ctx, document=document)
 
 
-def _sync_document(file_path: Path, cfg: D2CMSConfig, report: SyncReport, force: bool = False) -> None:
-    """Sync a single document to WordPress"""
+def _sync_document(file_path: Path, ctx: SyncContext, document: Post | None = None) -> bool:
+    """Sync a single document to WordPress, returning False if it was recorded as a failure"""
     logger.debug("[sync] processing: %s", file_path)
+    cfg, client = ctx.cfg, ctx.client
 
-    document = frontmatter.load(file_path)
+    prepared = ctx.prepared.pop(file_path, None)
+    if document is None and prepared is not None:
+        document = prepared.document
+    elif document is None:
+        with ctx.report.timed("parse"):
+            document = frontmatter.load(file_path)
     metadata = document.metadata
 
     content_type: ContentType | None = None
     try:
         content_type = content_type_from_path(file_path, cfg.docs_dir)
-        current_hash = generate_doc_hash(document, file_path.relative_to(cfg.docs_dir))
-
         if metadata.get("deprecated"):
-            _handle_delete(document, file_path, cfg)
-            return
+            _defer_delete(file_path, document, content_type, ctx)
+            return True
+
+        write = _plan_write(file_path, document, content_type, prepared, ctx)
+        if write is None:
+            return True
+
+        logger.debug("[sync] POST %s", client.build_request("POST", write.route).url)
+        with ctx.report.timed("post"):
+            response = client.post(write.route, extensions=_retry_extensions(
+                content_type, metadata.get("document_key"), metadata.get("wordpress_id"), client
+            ), json=write.body)
+        _finish_write(write, response, ctx)
+        return True
 
-        if not force and metadata.get("document_hash") == current_hash:
-            logger.info("[sync] skipping (no changes): %s", file_path)
+    except Exception as e:
+        _record_sync_failure(file_path, content_type, document, e, ctx)
+        return False
+
+
+def _plan_write(
+    file_path: Path,
+    document: Post,
+    content_type: ContentType,
+    prepared: PreparedDocument | None,
+    ctx: SyncContext,
+) -> _Write | None:
+    """Build the create or update for a document, or return None if it is unchanged"""
+    cfg = ctx.cfg
+    metadata = document.metadata
+    relative_path = file_path.relative_to(cfg.docs_dir)
+    if prepared is not None:
+        current_hash = prepared.document_hash
+    else:
+        with ctx.report.timed("hash"):
+            current_hash = generate_doc_hash(document, relative_path, cfg.hash_algorithm)
+
+    locally_unchanged = prepared.unchanged if prepared is not None else (
+        doc_hash_matches(document, relative_path, current_hash)
+    )
+    remote, adopted = _reconcile(file_path, document, content_type, ctx)
+    unchanged = locally_unchanged
+    if remote is not None and remote.document_hash:
+        # WordPress' copy, not the frontmatter, decides whether anything needs sending
+        unchanged = doc_hash_matches(document, relative_path, current_hash, remote.document_hash)
+
+    with ctx.report.timed("hash"):
+        media = ctx.media.references_digest(document.content, file_path) if ctx.media is not None else None
+        current_fields = field_hashes(document, relative_path, media)
+    if unchanged and _media_changed(document, current_fields, ctx):
+        logger.info("[sync] referenced files changed: %s", file_path)
+        unchanged = False
+    if not ctx.force and unchanged:
+        logger.info("[sync] skipping (no changes): %s", file_path)
+        _record_outcome("skipped", file_path, remote.wordpress_id if remote else metadata.get("wordpress_id"), ctx)
+        if remote is not None and (adopted or not locally_unchanged):
+            # The frontmatter is behind WordPress; store the ID and hash it already has
+            ctx.report.record_reconciled("current")
+            _write_back(
+                file_path, ctx, metadata.get("document_key"), remote.wordpress_id, current_hash, current_fields
+            )
+            return None
+        ctx.state.record(
+            file_path, metadata.get("document_key"), _wordpress_id(document) or None, current_hash,
+            field_hashes=current_fields,
+        )
+        return None
+
+    wordpress_id = metadata.get("wordpress_id")
+    changed = None if ctx.force else _changed_fields(document, remote, current_fields, ctx)
+    if wordpress_id:
+        api_route = f"wp/v2/{content_type}/{wordpress_id}"
+        if changed is None:
+            logger.info("[sync] updating: %s (id=%s)", file_path, wordpress_id)
+        else:
+            what = ", ".join(sorted(changed)) or "hash"
+            logger.info("[sync] updating %s of: %s (id=%s)", what, file_path, wordpress_id)
+    else:
+        logger.info("[sync] creating: %s", file_path)
+        api_route = f"wp/v2/{content_type}"
+        changed = None
+
+    body: dict[str, object] = {
+        "meta": {
+            "document_key": str(metadata.get("document_key")),
+            "document_hash": current_hash,
+        },
+    }
+    if changed is None:
+        body["status"] = "publish"
+    if changed is None or "title" in changed:
+        body["slug"] = metadata.get("slug")
+        body["title"] = metadata.get("title")
+    if changed is None or "order" in changed:
+        body["menu_order"] = metadata.get("order") or 0
+    if changed is None or "content" in changed:
+        html = prepared.html if prepared is not None else None
+        if html is None:
+            with ctx.report.timed("render"):
+                html = to_html(document, file_path, cfg.docs_dir, ctx.renders)
+        if ctx.media is not None:
+            with ctx.report.timed("media"):
+                html = ctx.media.rewrite(html, file_path)
+        body["content"] = html
+    if changed is None or "parent" in changed:
+        fm_kwargs = {k: v for k, v in metadata.items() if k != "content_type"}
+        with ctx.report.timed("parent_lookup"):
+            body["parent"] = _find_parent_id(D2CMSFrontmatter(**fm_kwargs), content_type, ctx.client, ctx.index)
+    if changed is None or "tags" in changed:
+        with ctx.report.timed("tag_lookup"):
+            body["tags"] = ctx.tags.resolve(metadata.get("tags") or [])
+    return _Write(file_path, document, content_type, "POST", api_route, current_hash, body, current_fields)
+
+
+def _changed_fields(
+    document: Post, remote: RemotePost | None, current_fields: dict[str, str], ctx: SyncContext
+) -> set[str] | None:
+    """The field groups that differ from what WordPress was last sent, or None to send them all
+
+    Everything is sent when the fields last sent are unknown (never recorded, or
+    recorded at another hash than the frontmatter's), when WordPress holds another
+    hash than the frontmatter, or when a field outside the groups changed.
+    """
+    metadata = document.metadata
+    stored_hash = metadata.get("document_hash")
+    if remote is not None and remote.document_hash != stored_hash:
+        return None
+    previous = ctx.state.field_hashes(metadata.get("document_key"), stored_hash)
+    if previous is None:
+        return None
+    changed = {group for group, digest in current_fields.items() if previous.get(group) != digest}
+    return None if "other" in changed else changed
+
+
+def _media_changed(document: Post, current_fields: dict[str, str], ctx: SyncContext) -> bool:
+    """Whether the local files a document references differ from those it was last sent with"""
+    if "media" not in current_fields:
+        return False
+    metadata = document.metadata
+    previous = ctx.state.field_hashes(metadata.get("document_key"), metadata.get("document_hash"))
+    return previous is None or previous.get("media") != current_fields["media"]
+
+
+def _reconcile(
+    file_path: Path, document: Post, content_type: ContentType, ctx: SyncContext
+) -> tuple[RemotePost | None, bool]:
+    """Find a document's post in the reconcile sweep, adopting its ID if the frontmatter lost it
+
+    Returns the post (if any) and whether its ID was adopted.
+    """
+    metadata = document.metadata
+    document_key = metadata.get("document_key")
+    if ctx.remote is None or not document_key:
+        return None, False
+
+    local_id = _wordpress_id(document) or None
+    remote = ctx.remote.get(content_type, document_key, local_id)
+    if remote is None or remote.wordpress_id == local_id:
+        return remote, False
+
+    logger.info(
+        "[reconcile] %s: adopting existing post id=%s (frontmatter had %s)",
+        file_path, remote.wordpress_id, local_id or "none",
+    )
+    metadata["wordpress_id"] = remote.wordpress_id
+    ctx.index.set_wordpress_id(document_key, remote.wordpress_id)
+    ctx.report.record_reconciled("adopted")
+    return remote, True
+
+
+def _finish_write(write: _Write, response: httpx.Response, ctx: SyncContext) -> None:
+    """Apply WordPress' response to a write locally, raising if the request failed"""
+    response.raise_for_status()
+    metadata = write.document.metadata
+    wp_data = response.json()
+    logger.info("[sync] done: %s (wp_id=%s)", write.file_path, wp_data['id'])
+    created = write.route == f"wp/v2/{write.content_type}"
+    _record_outcome("created" if created else "updated", write.file_path, wp_data['id'], ctx)
+    # Children later in this run resolve their parent from the index, not WordPress
+    ctx.index.set_wordpress_id(metadata.get("document_key"), wp_data['id'])
+    _write_back(
+        write.file_path, ctx, metadata.get("document_key"), wp_data['id'], write.document_hash, write.field_hashes
+    )
+
+
+def _forget_deleted(file_path: Path, document: Post, ctx: SyncContext) -> None:
+    ctx.index.remove(document.metadata.get("document_key"))
+    ctx.state.forget(file_path)
+
+
+def _record_outcome(outcome: Outcome, file_path: Path, wordpress_id: object, ctx: SyncContext) -> None:
+    try:
+        content_type: ContentType | None = content_type_from_path(file_path, ctx.cfg.docs_dir)
+    except ValueError:
+        content_type = None
+    ctx.report.record_document(
+        outcome,
+        _doc_path(file_path, ctx.cfg),
+        content_type,
+        wordpress_id if isinstance(wordpress_id, int) else None,
+    )
+
+
+def _wordpress_id(document: Post) -> int | None:
+    """The post ID in a document's frontmatter, or None if it has not been synced"""
+    wordpress_id = document.metadata.get("wordpress_id")
+    return wordpress_id if isinstance(wordpress_id, int) else None
+
+
+def _record_sync_failure(
+    file_path: Path, content_type: ContentType | None, document: Post, error: Exception, ctx: SyncContext
+) -> None:
+    logger.error("[sync] failed: %s — %s", file_path, error)
+    ctx.report.record_failure(
+        doc_path=str(file_path.relative_to(ctx.cfg.docs_dir)),
+        content_type=content_type,
+        wordpress_id=_wordpress_id(document),
+        error=error,
+    )
+
+
+def _write_back(
+    file_path: Path,
+    ctx: SyncContext,
+    document_key: object,
+    wordpress_id: int,
+    document_hash: str,
+    field_hashes: dict[str, str] | None = None,
+) -> None:
+    """Store a synced document's wordpress_id and hash in its frontmatter, then record it
+
+    With a writer the update is queued and a failed write is reported once it happens;
+    without one it is written here and a failure is raised to the caller.
+    """
+    fields: dict[str, object] = {"wordpress_id": wordpress_id, "document_hash": document_hash}
+    if ctx.writer is None:
+        with ctx.report.timed("write_back"):
+            write_frontmatter_fields(file_path, fields)
+        ctx.state.record(
+            file_path, document_key, wordpress_id, document_hash, rewritten=True, field_hashes=field_hashes
+        )
+        return
+
+    def _written(error: Exception | None) -> None:
+        if error is None:
+            ctx.state.record(
+                file_path, document_key, wordpress_id, document_hash, rewritten=True, field_hashes=field_hashes
+            )
             return
+        ctx.report.record_failure(
+            doc_path=str(file_path.relative_to(ctx.cfg.docs_dir)),
+            content_type=None,
+            wordpress_id=wordpress_id,
+            error=RuntimeError(f"synced as id={wordpress_id} but write-back failed: {error}"),
+        )
 
-        with make_client(cfg) as client:
-            wordpress_id = metadata.get("wordpress_id")
-            if wordpress_id:
-                logger.info("[sync] updating: %s (id=%s)", file_path, wordpress_id)
-                api_route = f"wp/v2/{content_type}/{wordpress_id}"
-            else:
-                logger.info("[sync] creating: %s", file_path)
-                api_route = f"wp/v2/{content_type}"
-
-            logger.debug("[sync] POST %s", client.build_request("POST", api_route).url)
-            fm_kwargs = {k: v for k, v in metadata.items() if k != "content_type"}
-            response = client.post(api_route, json={
-                "slug": metadata.get("slug"),
-                "title": metadata.get("title"),
-                "status": "publish",
-                "menu_order": metadata.get("order") or 0,
-                "content": to_html(document, file_path, cfg.docs_dir),
-                "meta": {
-                    "document_key": str(metadata.get("document_key")),
-                    "document_hash": current_hash,
-                },
-                "parent": _find_parent_id(D2CMSFrontmatter(**fm_kwargs), content_type, client),
-                "tags": _get_or_create_tag_ids(metadata.get("tags") or [], client)
-            })
-            response.raise_for_status()
-
-            wp_data = response.json()
-
-        logger.info("[sync] done: %s (wp_id=%s)", file_path, wp_data['id'])
-        update_frontmatter(file_path, wordpress_id=wp_data['id'], document_hash=current_hash)
+    ctx.writer.submit(file_path, fields, _written)
+
+
+def _record_skipped(node: SyncNode, failed_path: Path, ctx: SyncContext) -> None:
+    cfg = ctx.cfg
+    try:
+        content_type: ContentType | None = content_type_from_path(node.file_path, cfg.docs_dir)
+    except ValueError:
+        content_type = None
+
+    logger.warning("[sync] skipping %s — parent %s failed", node.file_path, failed_path)
+    ctx.report.record_failure(
+        doc_path=str(node.file_path.relative_to(cfg.docs_dir)),
+        content_type=content_type,
+        wordpress_id=_wordpress_id(node.document),
+        error=ParentSyncFailedError(
+            f"Skipped: parent document failed to sync: {failed_path.relative_to(cfg.docs_dir)}"
+        ),
+    )
+
+
+def _sync_concurrent(directory: Path, ctx: SyncContext, workers: int) -> None:
+    """Sync a directory on a bounded worker pool, starting each document once its parents succeed"""
+    _sync_graph(_scan_documents(directory, ctx), ctx, workers)
+
+
+def _sync_graph(documents: dict[Path, Post], ctx: SyncContext, workers: int) -> None:
+    """Sync already-parsed documents, each starting once the parents among them have succeeded"""
+    graph = build_sync_graph(documents)
+    if ctx.batch_size:
+        _sync_batched(graph, ctx, workers)
+        return
+
+    waiting_on = {path: len(node.dependencies) for path, node in graph.items()}
+    settled: set[Path] = set()
+
+    logger.debug("[sync] %d document(s) across %d worker(s)", len(graph), workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-sync") as pool:
+        running: dict[Future[bool], Path] = {}
+
+        def _submit(path: Path) -> None:
+            future = pool.submit(_sync_document, path, ctx, document=graph[path].document)
+            running[future] = path
+
+        for path, count in waiting_on.items():
+            if count == 0:
+                _submit(path)
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                settled.add(path)
+                if not future.result():
+                    _skip_descendants(graph, path, settled, ctx)
+                    continue
+
+                for dependent in graph[path].dependents:
+                    if dependent in settled:
+                        continue
+                    waiting_on[dependent] -= 1
+                    if waiting_on[dependent] == 0:
+                        _submit(dependent)
+
+    _record_unsettled(graph, settled, ctx)
 
+
+def _skip_descendants(graph: dict[Path, SyncNode], failed_path: Path, settled: set[Path], ctx: SyncContext) -> None:
+    stack = list(graph[failed_path].dependents)
+    while stack:
+        path = stack.pop()
+        if path in settled:
+            continue
+        settled.add(path)
+        _record_skipped(graph[path], failed_path, ctx)
+        stack.extend(graph[path].dependents)
+
+
+def _record_unsettled(graph: dict[Path, SyncNode], settled: set[Path], ctx: SyncContext) -> None:
+    """Report documents never started because their parents form a cycle"""
+    for path, node in graph.items():
+        if path not in settled:
+            ctx.report.record_failure(
+                doc_path=str(path.relative_to(ctx.cfg.docs_dir)),
+                content_type=None,
+                wordpress_id=_wordpress_id(node.document),
+                error=ParentSyncFailedError("Skipped: parent_key forms a cycle"),
+            )
+
+
+def _plan_batched(file_path: Path, document: Post, ctx: SyncContext) -> _Write | bool:
+    """Plan a document's write for a batch; True if it needed none, False if it failed"""
+    prepared = ctx.prepared.pop(file_path, None)
+    content_type: ContentType | None = None
+    try:
+        content_type = content_type_from_path(file_path, ctx.cfg.docs_dir)
+        if document.metadata.get("deprecated"):
+            _defer_delete(file_path, document, content_type, ctx)
+            return True
+
+        write = _plan_write(file_path, document, content_type, prepared, ctx)
+        return True if write is None else write
+    except Exception as e:
+        _record_sync_failure(file_path, content_type, document, e, ctx)
+        return False
+
+
+def _send_batch(writes: list[_Write], ctx: SyncContext) -> list[Path]:
+    """Send writes in one batch call and apply each sub-response, returning the paths that synced"""
+    try:
+        with ctx.report.timed("post"):
+            responses = send_batch(ctx.client, [BatchRequest(w.method, w.route, w.body) for w in writes])
+    except Exception as e:
+        logger.error("[batch] batch of %d request(s) failed — %s", len(writes), e)
+        return [write.file_path for write in writes if _recover_write(write, e, ctx)]
+
+    synced: list[Path] = []
+    for write, response in zip(writes, responses, strict=True):
+        try:
+            _finish_write(write, response, ctx)
+            synced.append(write.file_path)
+        except Exception as e:
+            _record_sync_failure(write.file_path, write.content_type, write.document, e, ctx)
+    return synced
+
+
+def _recover_write(write: _Write, error: Exception, ctx: SyncContext) -> bool:
+    """Settle a write whose batch failed without saying which of its requests took effect
+
+    A create is looked up by document_key and adopted if it reached WordPress, so the next
+    run does not create it again; anything else is recorded as failed with the batch error.
+    """
+    metadata = write.document.metadata
+    try:
+        created = None
+        if write.method == "POST" and not metadata.get("wordpress_id") and metadata.get("document_key"):
+            created = _find_created_post(write.content_type, metadata.get("document_key"), ctx.client)
+        if created is None:
+            raise error
+        _finish_write(write, created, ctx)
+        return True
+    except Exception as e:
+        _record_sync_failure(write.file_path, write.content_type, write.document, e, ctx)
+        return False
+
+
+def _sync_batched(graph: dict[Path, SyncNode], ctx: SyncContext, workers: int) -> None:
+    """Sync a dependency graph one level at a time, sending each level's writes in batches
+
+    A level is every document whose parents have all synced. Its documents are planned
+    (hashed, rendered, parents and tags resolved) on the worker pool, then its creates,
+    updates and deletes go out in `batch/v1` calls of up to `ctx.batch_size` requests,
+    several calls at once when there are several workers.
+    """
+    waiting_on = {path: len(node.dependencies) for path, node in graph.items()}
+    settled: set[Path] = set()
+    level = [path for path, count in waiting_on.items() if count == 0]
+
+    logger.debug("[sync] %d document(s) in batches of %d", len(graph), ctx.batch_size)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-sync") as pool:
+        while level:
+            planned = list(pool.map(lambda path: _plan_batched(path, graph[path].document, ctx), level))
+            synced = [path for path, result in zip(level, planned, strict=True) if result is True]
+            writes = [result for result in planned if isinstance(result, _Write)]
+            batches = [writes[i:i + ctx.batch_size] for i in range(0, len(writes), ctx.batch_size)]
+            if batches:
+                logger.info("[batch] sending %d request(s) in %d batch(es)", len(writes), len(batches))
+            for batch_synced in pool.map(lambda batch: _send_batch(batch, ctx), batches):
+                synced.extend(batch_synced)
+
+            settled.update(level)
+            succeeded = set(synced)
+            next_level: list[Path] = []
+            for path in level:
+                if path not in succeeded:
+                    _skip_descendants(graph, path, settled, ctx)
+                    continue
+                for dependent in graph[path].dependents:
+                    if dependent in settled:
+                        continue
+                    waiting_on[dependent] -= 1
+                    if waiting_on[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+
+    _record_unsettled(graph, settled, ctx)
+
+
+def _doc_path(file_path: Path, cfg: D2CMSConfig) -> str:
+    try:
+        return str(file_path.relative_to(cfg.docs_dir))
+    except ValueError:
+        return str(file_path)
+
+
+def _pull_in_ancestors(documents: dict[Path, Post], ctx: SyncContext) -> None:
+    """Add parents that have never been synced, so their children can resolve a parent ID"""
+    examined: set[Path] = set(documents)
+    pending = list(documents)
+    while pending:
+        file_path = pending.pop()
+        candidates = [Path(f"{file_path.parent}.md")]
+        parent_key = documents[file_path].metadata.get("parent_key")
+        if parent_key and ctx.index.get(parent_key) is None:
+            keyed_path = ctx.state.path_for_key(parent_key)
+            if keyed_path is not None:
+                candidates.append(keyed_path)
+
+        for candidate in candidates:
+            if candidate in examined or not candidate.is_file():
+                continue
+            if not candidate.is_relative_to(ctx.cfg.docs_dir):
+                continue
+            examined.add(candidate)
+
+            try:
+                parent = frontmatter.load(candidate)
+            except Exception as e:
+                _record_load_failure(candidate, e, ctx)
+                continue
+            ctx.index.add(candidate, parent)
+            if not parent.metadata.get("wordpress_id"):
+                logger.info("[sync] including unsynced ancestor: %s", candidate)
+                documents[candidate] = parent
+                pending.append(candidate)
+
+
+def _delete_removed(change: FileChange, root: Path, since: str, ctx: SyncContext) -> None:
+    """Queue the remote post of a markdown file deleted from the tree since `since` for the delete phase"""
+    content_type: ContentType | None = None
+    try:
+        content_type = content_type_from_path(change.path, ctx.cfg.docs_dir)
+        previous = frontmatter.loads(read_file_at(root, since, change.path))
+    except Exception as e:
+        logger.error("[delete] failed: %s — %s", change.path, e)
+        ctx.report.record_failure(
+            doc_path=_doc_path(change.path, ctx.cfg),
+            content_type=content_type,
+            wordpress_id=None,
+            error=e,
+        )
+        return
+
+    if previous.metadata.get("deprecated") or _wordpress_id(previous) is None:
+        logger.debug("[delete] %s has no live post to remove", change.path)
+        ctx.state.forget(change.path)
+        return
+
+    logger.info("[delete] %s was removed locally (id=%s)", change.path, _wordpress_id(previous))
+    _defer_delete(change.path, previous, content_type, ctx)
+
+
+def _move_renamed(old_path: Path, new_path: Path, document: Post, ctx: SyncContext) -> None:
+    """Prepare a renamed document so it updates its existing post rather than creating one"""
+    ctx.state.forget(old_path)
+
+    wordpress_id = _wordpress_id(document)
+    old_type = content_type_from_path(old_path, ctx.cfg.docs_dir)
+    new_type = content_type_from_path(new_path, ctx.cfg.docs_dir)
+    if wordpress_id is None or old_type == new_type:
+        return
+
+    # A post cannot change type through the REST API, so it is recreated under the new one
+    logger.info("[sync] %s moved from %s to %s — recreating post", new_path, old_type, new_type)
+    _delete_post(old_type, wordpress_id, ctx.client, missing_ok=True)
+    document.metadata["wordpress_id"] = None
+
+
+def _sync_changes(root: Path, since: str, ctx: SyncContext, workers: int) -> None:
+    """Sync only the markdown files git reports as changed under root since the given ref"""
+    tree_filter = TreeFilter.from_config(ctx.cfg)
+    changes = [change for change in changed_markdown_files(root, since) if tree_filter.allows(change.path)]
+    logger.info("[sync] %d changed document(s) since %s", len(changes), since)
+
+    documents: dict[Path, Post] = {}
+    for change in changes:
+        if change.status == "deleted":
+            continue
+        try:
+            document = frontmatter.load(change.path)
+            if change.old_path is not None:
+                _move_renamed(change.old_path, change.path, document, ctx)
+        except Exception as e:
+            logger.error("[sync] failed: %s — %s", change.path, e)
+            ctx.report.record_failure(
+                doc_path=_doc_path(change.path, ctx.cfg),
+                content_type=None,
+                wordpress_id=None,
+                error=e,
+            )
+            continue
+
+        documents[change.path] = document
+        ctx.index.add(change.path, document)
+
+    _pull_in_ancestors(documents, ctx)
+    _sync_graph(documents, ctx, workers)
+
+    for change in changes:
+        if change.status == "deleted":
+            _delete_removed(change, root, since, ctx)
+
+
+def _render_cache(cfg: D2CMSConfig) -> AbstractContextManager[RenderCache | None]:
+    if not cfg.render_cache_mb:
+        return nullcontext()
+    return RenderCache(cfg.docs_dir, max_bytes=cfg.render_cache_mb * 1024 * 1024)
+
+
+def _media_library(cfg: D2CMSConfig, client: Client) -> AbstractContextManager[MediaLibrary | None]:
+    if not cfg.upload_media:
+        return nullcontext()
+    return MediaLibrary(client, cfg.docs_dir, MediaCache(cfg.docs_dir), cfg.media_upload_workers)
+
+
+def _local_content_types(cfg: D2CMSConfig) -> list[ContentType]:
+    """Content types with a directory under docs_dir; others are never synced or swept"""
+    return [content_type for content_type in get_args(ContentType) if (cfg.docs_dir / content_type).is_dir()]
+
+
+@contextmanager
+def _sync_session(
+    cfg: D2CMSConfig,
+    report: SyncReport,
+    throttle: Throttle,
+    force: bool = False,
+    rescan: bool = False,
+    workers: int = 1,
+    jobs: int = 1,
+    batch_size: int = 0,
+    reconcile: bool = False,
+) -> Iterator[SyncContext]:
+    """Open the client, sync state and caches for a run and build its context
+
+    Retries, responses and write-backs are recorded in whichever report the context
+    holds at the time, so a long-lived session can swap in a fresh report per pass.
+    """
+    ctx: SyncContext
+    with (
+        make_client(
+            cfg,
+            on_retry=lambda *retry: ctx.report.record_retry(*retry),
+            throttle=throttle,
+            on_response=lambda *response: ctx.report.record_request(*response),
+        ) as client,
+        SyncState(cfg.docs_dir, rescan=rescan) as state,
+        _render_cache(cfg) as renders,
+        FrontmatterWriter(on_write=lambda seconds: ctx.report.record_phase("write_back", seconds)) as writer,
+        _media_library(cfg, client) as media,
+    ):
+        ctx = SyncContext(
+            cfg=cfg,
+            report=report,
+            client=client,
+            tags=TagCatalog(client),
+            index=DocumentIndex(cfg.docs_dir),
+            state=state,
+            force=force,
+            renders=renders,
+            jobs=jobs,
+            writer=writer,
+            batch_size=batch_size,
+            remote=RemoteCatalog(client) if reconcile else None,
+            media=media,
+        )
+        if ctx.remote is not None:
+            ctx.remote.load(_local_content_types(cfg), workers)
+        yield ctx
+
+
+def sync(
+    cfg: D2CMSConfig,
+    force: bool = False,
+    path: Path | None = None,
+    workers: int = 1,
+    rescan: bool = False,
+    since: str | None = None,
+    jobs: int = 1,
+    batch_size: int = 0,
+    reconcile: bool = False,
+    report: SyncReport | None = None,
+) -> SyncReport:
+    """Sync documents to WordPress, recording into report (e.g. one that streams) or a new one"""
+    report = report if report is not None else SyncReport()
+    throttle = Throttle.from_config(cfg)
+    root = path if path is not None else cfg.docs_dir
+    with _sync_session(
+        cfg, report, throttle, force=force, rescan=rescan, workers=workers,
+        jobs=jobs, batch_size=batch_size, reconcile=reconcile,
+    ) as ctx:
+        if since is not None:
+            _sync_changes(root, since, ctx, workers)
+        elif workers > 1 or batch_size:
+            _sync_concurrent(root, ctx, workers)
+        else:
+            _sync_directory(root, ctx)
+        _delete_deprecated(ctx, workers)
+    report.throttle = throttle.summary()
+    return report
+
+
+def _sync_paths(paths: set[Path], ctx: SyncContext, workers: int) -> None:
+    """Sync the documents at paths a watcher reported as created, modified or removed
+
+    A removed path takes with it every indexed document at or under it. A removed
+    document whose key turns up again in a changed file was moved there; the rest
+    have their posts deleted. Files this session wrote back itself are left alone.
+    """
+    tree_filter = TreeFilter.from_config(ctx.cfg)
+    removed: dict[str, Path] = {}
+    changed: list[Path] = []
+    for path in sorted(paths):
+        if path.is_dir():
+            if tree_filter.reaches(path):
+                changed.extend(file_path for file_path, _ in _collect_files(path, ctx.cfg, tree_filter))
+        elif path.is_file():
+            if tree_filter.allows(path):
+                changed.append(path)
+        else:
+            for document_key, entry in ctx.index.under(path):
+                removed[document_key] = entry.path
+
+    documents: dict[Path, Post] = {}
+    for file_path in changed:
+        try:
+            if ctx.state.recorded(file_path, file_path.stat()):
+                continue
+            document = frontmatter.load(file_path)
+            old_path = removed.pop(str(document.metadata.get("document_key")), None)
+            if old_path is not None:
+                logger.info("[watch] %s moved to %s", old_path, file_path)
+                _move_renamed(old_path, file_path, document, ctx)
+        except Exception as e:
+            _record_load_failure(file_path, e, ctx)
+            continue
+
+        documents[file_path] = document
+        ctx.index.add(file_path, document)
+
+    if documents:
+        _pull_in_ancestors(documents, ctx)
+        _sync_graph(documents, ctx, workers)
+        _delete_deprecated(ctx, workers)
+
+    for document_key, file_path in removed.items():
+        _delete_unwatched(document_key, file_path, ctx)
+
+
+def _delete_unwatched(document_key: str, file_path: Path, ctx: SyncContext) -> None:
+    """Remove the post of an indexed document whose file is gone"""
+    entry = ctx.index.get(document_key)
+    wordpress_id = entry.wordpress_id if entry is not None else None
+    content_type = entry.content_type if entry is not None else None
+    try:
+        if wordpress_id and content_type:
+            logger.info("[delete] %s was removed locally (id=%s)", file_path, wordpress_id)
+            with ctx.report.timed("delete"):
+                _delete_post(content_type, wordpress_id, ctx.client, missing_ok=True)
+            _record_outcome("deleted", file_path, wordpress_id, ctx)
+        ctx.index.remove(document_key)
+        ctx.state.forget(file_path)
     except Exception as e:
-        logger.error("[sync] failed: %s — %s", file_path, e)
-        report.record_failure(
-            doc_path=str(file_path.relative_to(cfg.docs_dir)),
+        logger.error("[delete] failed: %s — %s", file_path, e)
+        ctx.report.record_failure(
+            doc_path=_doc_path(file_path, ctx.cfg),
             content_type=content_type,
-            wordpress_id=metadata.get("wordpress_id") or None,
+            wordpress_id=wordpress_id,
             error=e,
         )
 
 
-def sync(cfg: D2CMSConfig, force: bool = False, path: Path | None = None) -> SyncReport:
+def _flush(ctx: SyncContext) -> None:
+    """Finish queued write-backs and persist state, so the session survives being killed"""
+    if ctx.writer is not None:
+        ctx.writer.flush()
+    ctx.state.flush()
+    if ctx.renders is not None:
+        ctx.renders.flush()
+    if ctx.media is not None:
+        ctx.media.flush()
+
+
+def watch(
+    cfg: D2CMSConfig,
+    path: Path | None = None,
+    workers: int = 1,
+    debounce: float = 0.3,
+    polling: bool = False,
+    poll_interval: float = 1.0,
+    stop: threading.Event | None = None,
+    on_sync: Callable[[SyncReport, set[Path] | None], None] | None = None,
+) -> None:
+    """Sync path, then sync each burst of changes under it until stop is set.
+
+    The client, tag catalog and document index stay warm between bursts. Changes
+    come from OS notifications when watchfiles is installed, otherwise from polling.
+    on_sync receives each pass's report with the changed paths (None for the
+    initial sync).
+    """
+    root = path if path is not None else cfg.docs_dir
+    stop = stop or threading.Event()
     report = SyncReport()
-    _sync_directory(path if path is not None else cfg.docs_dir, cfg, report, force=force)
-    return report
\ No newline at end of file
+    throttle = Throttle.from_config(cfg)
+    with _sync_session(cfg, report, throttle, workers=workers) as ctx:
+        tree_filter = TreeFilter.from_config(cfg)
+        # Taken first, so edits made during the initial sync are picked up after it
+        baseline = snapshot(root, tree_filter)
+        if workers > 1:
+            _sync_concurrent(root, ctx, workers)
+        else:
+            _sync_directory(root, ctx)
+        _flush(ctx)
+        if on_sync is not None:
+            on_sync(report, None)
+
+        if polling or not native_watching_available():
+            if not polling:
+                logger.info(
+                    '[watch] polling every %.1fs; install "docs-2-cms[watch]" for OS notifications',
+                    poll_interval,
+                )
+            changes = poll_changes(root, poll_interval, debounce, stop, baseline, tree_filter)
+        else:
+            changes = native_changes(root, debounce, stop, baseline, tree_filter)
+
+        logger.info("[watch] watching %s", root)
+        for paths in changes:
+            ctx.report = SyncReport()
+            logger.info("[watch] %d path(s) changed", len(paths))
+            _sync_paths(paths, ctx, workers)
+            _flush(ctx)
+            if on_sync is not None:
+                on_sync(ctx.report, paths)
+
+
+def rehash(cfg: D2CMSConfig, path: Path | None = None) -> RehashSummary:
+    """Migrate stored document hashes to the current format without contacting WordPress.
+
+    Only documents that are still in sync are rewritten. Sync state entries for rewritten
+    files are refreshed, so the next sync does not re-read them.
+    """
+    summary = RehashSummary()
+    root = path if path is not None else cfg.docs_dir
+    with SyncState(cfg.docs_dir) as state:
+        for file_path, stat in _collect_files(root, cfg):
+            try:
+                known = state.lookup(file_path, stat)
+                new_hash = rehash_document(file_path, cfg.docs_dir, cfg.hash_algorithm)
+            except DocumentChangedError:
+                summary.changed.append(file_path)
+                continue
+            except Exception as e:
+                logger.error("[rehash] failed: %s — %s", file_path, e)
+                summary.failed.append(file_path)
+                continue
+
+            if new_hash is None:
+                summary.current += 1
+                continue
+
+            logger.debug("[rehash] %s", file_path)
+            summary.rewritten += 1
+            if known is not None:
+                state.record(
+                    file_path, known.document_key, known.wordpress_id, new_hash, rewritten=True,
+                    field_hashes=known.field_hashes,
+                )
+    return summary
+
+
+def _local_documents(
+    cfg: D2CMSConfig, state: SyncState, summary: GcSummary
+) -> dict[tuple[ContentType, str], object]:
+    """Map every local document's content type and key to its wordpress_id, in one scan
+
+    Files the sync state vouches for are answered from it without being opened.
+    """
+    documents: dict[tuple[ContentType, str], object] = {}
+    # Ignore rules and globs are not applied: an ignored document's post is not an orphan
+    for file_path, stat in _collect_files(cfg.docs_dir, cfg, TreeFilter(cfg.docs_dir)):
+        try:
+            content_type = content_type_from_path(file_path, cfg.docs_dir)
+        except ValueError:
+            continue
+
+        document_key: object
+        wordpress_id: object
+        try:
+            known = state.lookup(file_path, stat)
+            if known is not None:
+                document_key, wordpress_id = known.document_key, known.wordpress_id
+            else:
+                metadata = frontmatter.load(file_path).metadata
+                document_key, wordpress_id = metadata.get("document_key"), metadata.get("wordpress_id") or None
+        except Exception as e:
+            logger.error("[gc] could not read %s — %s", file_path, e)
+            summary.unreadable.append(file_path)
+            continue
+
+        if document_key:
+            documents[(content_type, str(document_key))] = wordpress_id
+    return documents
+
+
+def _trash_orphans(
+    orphans: list[Orphan], client: Client, workers: int, batch_size: int
+) -> list[str | None]:
+    """Move orphans to the trash, returning an error (or None) for each in order"""
+
+    def _trash(orphan: Orphan) -> str | None:
+        try:
+            _delete_post(orphan.content_type, orphan.wordpress_id, client, missing_ok=True)
+        except Exception as e:
+            return str(e)
+        return None
+
+    def _trash_batch(batch: list[Orphan]) -> list[str | None]:
+        try:
+            responses = send_batch(client, [
+                BatchRequest("DELETE", f"wp/v2/{orphan.content_type}/{orphan.wordpress_id}") for orphan in batch
+            ])
+        except Exception as e:
+            return [str(e)] * len(batch)
+        return [
+            None if response.is_success or response.status_code in (404, 410) else
+            f"HTTP {response.status_code}: {response.text}"
+            for response in responses
+        ]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="d2cms-gc") as pool:
+        if not batch_size:
+            return list(pool.map(_trash, orphans))
+        batches = [orphans[i:i + batch_size] for i in range(0, len(orphans), batch_size)]
+        return [error for errors in pool.map(_trash_batch, batches) for error in errors]
+
+
+def gc(cfg: D2CMSConfig, apply: bool = False, workers: int = 1, batch_size: int = 0) -> GcSummary:
+    """Find posts whose document no longer exists locally and, with apply, trash them.
+
+    One listing of the remote document_keys is compared with one scan of the docs
+    directory. Posts that share a key with a local document but are not the one its
+    frontmatter names are reported as duplicates. Nothing is trashed if any local
+    document could not be read, since its post would look orphaned.
+    """
+    summary = GcSummary()
+    with make_client(cfg) as client, SyncState(cfg.docs_dir) as state:
+        local = _local_documents(cfg, state, summary)
+        remote = RemoteCatalog(client)
+        remote.load(_local_content_types(cfg), workers)
+
+        for content_type, document_key, posts in remote.entries():
+            if (content_type, document_key) not in local:
+                summary.orphans.extend(Orphan(content_type, document_key, post.wordpress_id) for post in posts)
+                continue
+            local_id = local[(content_type, document_key)]
+            if len(posts) > 1 and any(post.wordpress_id == local_id for post in posts):
+                summary.orphans.extend(
+                    Orphan(content_type, document_key, post.wordpress_id, duplicate=True)
+                    for post in posts if post.wordpress_id != local_id
+                )
+
+        summary.orphans.sort(key=lambda orphan: (orphan.content_type, orphan.wordpress_id))
+        logger.info("[gc] %d orphaned post(s) among %d", len(summary.orphans), len(remote))
+        if not apply or not summary.orphans or summary.unreadable:
+            return summary
+
+        for orphan, error in zip(
+            summary.orphans,
+            _trash_orphans(summary.orphans, client, workers, batch_size),
+            strict=True,
+        ):
+            if error is None:
+                logger.info("[gc] trashed %s id=%s (%s)", orphan.content_type, orphan.wordpress_id, orphan.document_key)
+                summary.trashed.append(orphan)
+            else:
+                logger.error("[gc] failed: %s id=%s — %s", orphan.content_type, orphan.wordpress_id, error)
+                summary.failed.append((orphan, error))
+    return summary
+
+
+def _tag_slugs(document: Post) -> set[str]:
+    tags = document.metadata.get("tags")
+    return {wp_slug(str(tag)) for tag in tags} if isinstance(tags, list) else set()
+
+
+def _plan_parent_lookup(
+    document: Post, content_type: ContentType, index: DocumentIndex, writes: set[Path]
+) -> bool:
+    """Whether _find_parent_id would have to ask WordPress for this document's parent"""
+    parent_key = document.metadata.get("parent_key")
+    if not parent_key:
+        return False
+    parent = index.get(parent_key)
+    if parent is None or parent.content_type != content_type:
+        return True
+    # A parent created or updated earlier in the run is in the index by the time it is needed
+    return not (parent.wordpress_id or parent.path in writes)
+
+
+def plan_sync(
+    cfg: D2CMSConfig, force: bool = False, path: Path | None = None, batch_size: int = 0
+) -> SyncPlan:
+    """Classify every document as sync would, and count the requests it would send.
+
+    Uses the same sync state, hash comparison, local parent index and dependency order
+    as `sync`, but never opens a connection. Tag creates are an upper bound: any tag not
+    seen on a document that is already in sync is counted as new.
+    """
+    sync_plan = SyncPlan()
+    estimate = sync_plan.requests
+    root = path if path is not None else cfg.docs_dir
+    index = DocumentIndex(cfg.docs_dir)
+    documents: dict[Path, Post] = {}
+    content_types: dict[Path, ContentType] = {}
+
+    def _relative(file_path: Path) -> str:
+        return str(file_path.relative_to(cfg.docs_dir))
+
+    with SyncState(cfg.docs_dir) as state:
+        for file_path, stat in _collect_files(root, cfg):
+            try:
+                content_type = content_type_from_path(file_path, cfg.docs_dir)
+                known = None if force else state.lookup(file_path, stat)
+                if known is not None:
+                    index.put(known.document_key, file_path, known.wordpress_id)
+                    sync_plan.add(_relative(file_path), content_type, "skip", "unchanged since last sync")
+                    continue
+                document = frontmatter.load(file_path)
+            except Exception as e:
+                sync_plan.add(_relative(file_path), None, "blocked", str(e))
+                continue
+            documents[file_path] = document
+            content_types[file_path] = content_type
+            index.add(file_path, document)
+
+    # Decide every document before counting requests, so parent lookups see planned writes
+    graph = build_sync_graph(documents)
+    actions: dict[Path, tuple[Action, str]] = {}
+    levels: list[list[Path]] = []
+    waiting_on = {file_path: len(node.dependencies) for file_path, node in graph.items()}
+    level = [file_path for file_path, count in waiting_on.items() if count == 0]
+    while level:
+        levels.append(level)
+        next_level: list[Path] = []
+        for file_path in level:
+            document = documents[file_path]
+            metadata = document.metadata
+            try:
+                if metadata.get("deprecated"):
+                    actions[file_path] = ("delete", "" if metadata.get("wordpress_id") else "never synced; local file only")
+                else:
+                    relative_path = file_path.relative_to(cfg.docs_dir)
+                    current_hash = generate_doc_hash(document, relative_path, cfg.hash_algorithm)
+                    if not force and doc_hash_matches(document, relative_path, current_hash):
+                        actions[file_path] = ("skip", "content hash unchanged")
+                    else:
+                        actions[file_path] = ("update" if metadata.get("wordpress_id") else "create", "")
+            except Exception as e:
+                actions[file_path] = ("blocked", str(e))
+
+            for dependent in graph[file_path].dependents:
+                if actions[file_path][0] == "blocked":
+                    continue
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    next_level.append(dependent)
+        level = next_level
+
+    def _block_descendants(file_path: Path) -> None:
+        for dependent in graph[file_path].dependents:
+            if dependent not in actions:
+                actions[dependent] = ("blocked", f"parent document is blocked: {_relative(file_path)}")
+                _block_descendants(dependent)
+
+    for file_path, (action, _) in list(actions.items()):
+        if action == "blocked":
+            _block_descendants(file_path)
+    for file_path in graph:
+        actions.setdefault(file_path, ("blocked", "parent_key forms a cycle"))
+
+    writes = {file_path for file_path, (action, _) in actions.items() if action in ("create", "update")}
+    synced_tags: set[str] = set()
+    for file_path, document in documents.items():
+        if actions[file_path][0] == "skip" and document.metadata.get("wordpress_id"):
+            synced_tags.update(_tag_slugs(document))
+
+    new_tags: set[str] = set()
+    for file_path, (action, reason) in actions.items():
+        document, content_type = documents[file_path], content_types[file_path]
+        sync_plan.add(_relative(file_path), content_type, action, reason)
+        if action == "delete" and document.metadata.get("wordpress_id"):
+            estimate.delete += 1
+        elif action in ("create", "update"):
+            estimate.post += 1
+            estimate.parent_lookup += _plan_parent_lookup(document, content_type, index, writes)
+            tags = _tag_slugs(document)
+            if tags:
+                estimate.tag_listing = 1
+            new_tags.update(tags - synced_tags)
+    estimate.tag_create = len(new_tags)
+
+    if batch_size:
+        for level in levels:
+            sent = sum(1 for file_path in level if actions[file_path][0] in ("create", "update"))
+            estimate.batch += -(-sent // batch_size)
+        # Deletes go out together once every level has been written
+        estimate.batch += -(-estimate.delete // batch_size)
+
+    sync_plan.documents.sort(key=lambda document: document.path)
+    return sync_plan
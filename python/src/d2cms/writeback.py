@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+
+from .docs import write_frontmatter_fields
+
+logger = logging.getLogger(__name__)
+
+WriteCallback = Callable[[Exception | None], None]
+_Update = tuple[Path, dict[str, object], WriteCallback | None]
+
+
+class FrontmatterWriter:
+    """Writes frontmatter updates on a background thread so sync workers never wait on disk.
+
+    Updates are drained in batches; several updates queued for one file are merged into a
+    single write. Each update's callback runs on the writer thread once its file has been
+    written, with the exception if the write failed. on_write, if given, receives the
+    seconds each file write took.
+    """
+
+    def __init__(self, on_write: Callable[[float], None] | None = None) -> None:
+        self._on_write = on_write
+        self._queue: queue.Queue[_Update | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="d2cms-writeback", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> FrontmatterWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def submit(
+        self,
+        file_path: Path,
+        fields: dict[str, object],
+        callback: WriteCallback | None = None,
+    ) -> None:
+        self._queue.put((file_path, fields, callback))
+
+    def flush(self) -> None:
+        """Block until every update submitted so far has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write all pending updates and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            merged: dict[Path, tuple[dict[str, object], list[WriteCallback]]] = {}
+            for update in batch:
+                if update is None:
+                    continue
+                file_path, fields, callback = update
+                pending_fields, callbacks = merged.setdefault(file_path, ({}, []))
+                pending_fields.update(fields)
+                if callback is not None:
+                    callbacks.append(callback)
+
+            for file_path, (fields, callbacks) in merged.items():
+                self._write(file_path, fields, callbacks)
+
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, file_path: Path, fields: dict[str, object], callbacks: list[WriteCallback]) -> None:
+        error: Exception | None = None
+        started = time.perf_counter()
+        try:
+            write_frontmatter_fields(file_path, fields)
+        except Exception as e:
+            logger.error("[writeback] failed: %s — %s", file_path, e)
+            error = e
+        if self._on_write is not None:
+            self._on_write(time.perf_counter() - started)
+
+        for callback in callbacks:
+            try:
+                callback(error)
+            except Exception:
+                logger.exception("[writeback] callback failed for %s", file_path)
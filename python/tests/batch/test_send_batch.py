@@ -0,0 +1,80 @@
+import json
+
+import httpx
+import pytest
+import respx
+
+from d2cms.batch import MAX_BATCH_SIZE, BatchError, BatchRequest, send_batch
+from d2cms.http import IDEMPOTENT
+
+WP_BASE = "http://test-wp.test/wp-json/"
+
+
+@pytest.fixture
+def client():
+    with httpx.Client(base_url=WP_BASE) as client:
+        yield client
+
+
+class TestSendBatch:
+    def test_sends_sub_requests_with_paths_from_the_api_root(self, client):
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}batch/v1").mock(return_value=httpx.Response(207, json={
+                "responses": [{"status": 201, "body": {"id": 1}}, {"status": 200, "body": {"id": 2}}]
+            }))
+            send_batch(client, [
+                BatchRequest("POST", "wp/v2/docs", {"title": "A"}),
+                BatchRequest("DELETE", "wp/v2/docs/2"),
+            ])
+        assert json.loads(route.calls.last.request.content) == {
+            "validation": "normal",
+            "requests": [
+                {"method": "POST", "path": "/wp/v2/docs", "body": {"title": "A"}},
+                {"method": "DELETE", "path": "/wp/v2/docs/2"},
+            ],
+        }
+
+    def test_returns_sub_responses_in_request_order(self, client):
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(return_value=httpx.Response(207, json={
+                "responses": [
+                    {"status": 200, "body": {"id": 5}},
+                    {"status": 404, "body": {"code": "rest_post_invalid_id"}},
+                ]
+            }))
+            responses = send_batch(client, [
+                BatchRequest("POST", "wp/v2/docs/5", {}),
+                BatchRequest("POST", "wp/v2/docs/6", {}),
+            ])
+        assert responses[0].json() == {"id": 5}
+        assert responses[1].status_code == 404
+        with pytest.raises(httpx.HTTPStatusError, match="wp/v2/docs/6"):
+            responses[1].raise_for_status()
+
+    def test_raises_when_responses_do_not_match_requests(self, client):
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(
+                return_value=httpx.Response(207, json={"responses": [{"status": 200, "body": {}}]})
+            )
+            with pytest.raises(BatchError, match="1 response"):
+                send_batch(client, [BatchRequest("DELETE", "wp/v2/docs/1"), BatchRequest("DELETE", "wp/v2/docs/2")])
+
+    def test_raises_when_batch_call_fails(self, client):
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(return_value=httpx.Response(404, json={"code": "rest_no_route"}))
+            with pytest.raises(httpx.HTTPStatusError):
+                send_batch(client, [BatchRequest("DELETE", "wp/v2/docs/1")])
+
+    def test_rejects_more_than_wordpress_allows(self, client):
+        with pytest.raises(ValueError):
+            send_batch(client, [BatchRequest("DELETE", f"wp/v2/docs/{i}") for i in range(MAX_BATCH_SIZE + 1)])
+
+    def test_only_batches_without_creates_are_idempotent(self, client):
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}batch/v1").mock(
+                return_value=httpx.Response(207, json={"responses": [{"status": 200, "body": {}}]})
+            )
+            send_batch(client, [BatchRequest("POST", "wp/v2/docs/3", {})])
+            send_batch(client, [BatchRequest("POST", "wp/v2/docs", {})])
+        assert route.calls[0].request.extensions.get(IDEMPOTENT) is True
+        assert IDEMPOTENT not in route.calls[1].request.extensions
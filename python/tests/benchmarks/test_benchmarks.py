@@ -0,0 +1,69 @@
+import frontmatter
+import httpx
+
+from benchmarks.fake_wordpress import FakeWordPress
+from benchmarks.run import PHASES, Settings, compare, run_case
+from benchmarks.trees import edit_tree, generate_tree
+
+
+def _results(docs_per_s: float, requests_per_doc: float) -> dict:
+    return {"cases": {"flat-100": {"cold": {"docs_per_s": docs_per_s, "requests_per_doc": requests_per_doc}}}}
+
+
+class TestTrees:
+    def test_nested_children_live_under_their_parent(self, tmp_path):
+        paths = generate_tree(tmp_path, "nested", 20)
+        child = frontmatter.load(paths[8])
+        parent = frontmatter.load(paths[0])
+        assert paths[8].parent == paths[0].with_suffix("")
+        assert str(child.metadata["parent_key"]) == str(parent.metadata["document_key"])
+
+    def test_same_seed_writes_the_same_tree(self, tmp_path):
+        first = generate_tree(tmp_path / "a", "tagged", 5, seed=3)
+        second = generate_tree(tmp_path / "b", "tagged", 5, seed=3)
+        assert [p.read_text() for p in first] == [p.read_text() for p in second]
+
+    def test_edit_tree_changes_the_requested_fraction(self, tmp_path):
+        paths = generate_tree(tmp_path, "flat", 20)
+        before = {p: p.read_text() for p in paths}
+        edited = edit_tree(paths, 0.25)
+        assert len(edited) == 5
+        assert all(p.read_text() != before[p] for p in edited)
+
+
+class TestFakeWordPress:
+    def test_creates_updates_and_counts_requests(self):
+        with FakeWordPress() as wordpress, httpx.Client(base_url=wordpress.url) as client:
+            created = client.post("wp/v2/docs", json={"meta": {"document_key": "k"}})
+            client.post(f"wp/v2/docs/{created.json()['id']}", json={"meta": {"document_key": "k"}})
+            found = client.get("wp/v2/docs", params={"meta_key": "document_key", "meta_value": "k"})
+
+        assert created.status_code == 201
+        assert found.json() == [{"id": created.json()["id"]}]
+        assert wordpress.requests == {"POST wp/v2/docs": 1, "POST wp/v2/docs/:id": 1, "GET wp/v2/docs": 1}
+
+
+class TestRunCase:
+    def test_measures_each_phase(self):
+        results = run_case("flat", 10, Settings(latency_ms=0, workers=2))
+        assert list(results) == list(PHASES)
+        assert results["cold"].requests_by_endpoint == {"POST wp/v2/docs": 10}
+        assert results["noop"].requests == 0
+        assert results["edit"].requests == 1
+        assert all(result.failures == 0 for result in results.values())
+
+
+class TestCompare:
+    def test_within_tolerance_is_not_a_regression(self):
+        assert compare(_results(90, 1.0), _results(100, 1.0), tolerance=0.15) == []
+
+    def test_slowdown_beyond_tolerance_is_reported(self):
+        assert compare(_results(80, 1.0), _results(100, 1.0), tolerance=0.15) == [
+            "flat-100 cold: 80 docs/s, baseline 100 (-20%)"
+        ]
+
+    def test_any_extra_request_is_reported(self):
+        assert len(compare(_results(100, 1.1), _results(100, 1.0), tolerance=0.15)) == 1
+
+    def test_cases_missing_from_the_baseline_are_skipped(self):
+        assert compare(_results(1, 9.0), {"cases": {}}, tolerance=0.15) == []
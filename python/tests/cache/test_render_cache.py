@@ -0,0 +1,50 @@
+from d2cms.cache import RENDER_CACHE_FILE, RenderCache
+from d2cms.state import STATE_DIR
+
+
+class TestRenderCache:
+    def test_miss_on_empty_cache(self, tmp_path):
+        renders = RenderCache(tmp_path)
+        assert renders.get("key") is None
+        assert renders.misses == 1
+
+    def test_put_is_visible_before_close(self, tmp_path):
+        renders = RenderCache(tmp_path)
+        renders.put("key", "<p>hi</p>")
+        assert renders.get("key") == "<p>hi</p>"
+
+    def test_persists_across_instances(self, tmp_path):
+        with RenderCache(tmp_path) as renders:
+            renders.put("key", "<p>hi</p>")
+
+        renders = RenderCache(tmp_path)
+        assert renders.get("key") == "<p>hi</p>"
+        assert renders.hits == 1
+
+    def test_close_without_renders_creates_nothing(self, tmp_path):
+        RenderCache(tmp_path).close()
+        assert not (tmp_path / STATE_DIR).exists()
+
+    def test_evicts_least_recently_used_past_cap(self, tmp_path):
+        with RenderCache(tmp_path, max_bytes=20) as renders:
+            renders.put("old", "x" * 10)
+        with RenderCache(tmp_path, max_bytes=20) as renders:
+            renders.put("mid", "y" * 10)
+        with RenderCache(tmp_path, max_bytes=20) as renders:
+            assert renders.get("old") == "x" * 10  # refreshes "old"
+            renders.put("new", "z" * 10)
+
+        renders = RenderCache(tmp_path, max_bytes=20)
+        assert renders.get("mid") is None
+        assert renders.get("old") == "x" * 10
+        assert renders.get("new") == "z" * 10
+
+    def test_unreadable_cache_is_discarded(self, tmp_path):
+        (tmp_path / STATE_DIR).mkdir()
+        (tmp_path / STATE_DIR / RENDER_CACHE_FILE).write_text("not a database")
+
+        with RenderCache(tmp_path) as renders:
+            assert renders.get("key") is None
+            renders.put("key", "<p>hi</p>")
+
+        assert RenderCache(tmp_path).get("key") == "<p>hi</p>"
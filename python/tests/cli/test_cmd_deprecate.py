@@ -6,67 +6,107 @@ import frontmatter
 import pytest
 
 from d2cms.config import ConfigError
+from d2cms.deprecate import JOURNAL_FILE
+from d2cms.state import STATE_DIR
 
 DOC_KEY = "00000001-0000-7000-8000-000000000000"
 
 
 def _make_args(**kwargs: object) -> argparse.Namespace:
-    return argparse.Namespace(**kwargs)
+    defaults: dict[str, object] = {"paths": [], "from_file": None, "resume": False, "rollback": False}
+    return argparse.Namespace(**{**defaults, **kwargs})
 
 
 def _write_doc(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content)
     return path
 
 
+def _section(path: Path, document_key: str = DOC_KEY) -> Path:
+    return _write_doc(
+        path,
+        f"---\ndocument_key: {document_key}\ntitle: Section\nslug: section\n"
+        "content_type: docs\nparent_key: \nwordpress_id: \n"
+        "document_hash: \ndeprecated: false\n---\n\nContent here\n",
+    )
+
+
 class TestCmdDeprecate:
     @pytest.fixture
     def doc_file(self, tmp_path: Path, cfg) -> Path:
-        return _write_doc(
-            tmp_path / "section.md",
-            f"---\ndocument_key: {DOC_KEY}\ntitle: Section\nslug: section\n"
-            "content_type: docs\nparent_key: \nwordpress_id: \n"
-            "document_hash: \ndeprecated: false\n---\n\nContent here\n",
-        )
+        return _section(tmp_path / "section.md")
 
     def test_sets_deprecated_true_in_frontmatter(self, tmp_path, cfg, doc_file):
         from d2cms.cli import _cmd_deprecate
 
-        with (
-            patch("d2cms.cli.load_config_from_env", return_value=cfg),
-            patch("d2cms.cli.reparent_and_relocate_children"),
-        ):
-            _cmd_deprecate(_make_args(path="section.md"))
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
         assert frontmatter.load(doc_file).metadata["deprecated"] is True
+        assert not (tmp_path / STATE_DIR / JOURNAL_FILE).exists()
+
+    def test_relocates_children_and_inherits_parent_key(self, tmp_path, cfg, doc_file):
+        from d2cms.cli import _cmd_deprecate
+
+        _write_doc(tmp_path / "section" / "child.md", f"---\ntitle: Child\nparent_key: {DOC_KEY}\n---\n\nC\n")
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
-    def test_calls_reparent_and_relocate_children_with_file_path(self, tmp_path, cfg, doc_file):
+        assert frontmatter.load(tmp_path / "child.md").metadata["parent_key"] == ""
+        assert not (tmp_path / "section").exists()
+
+    def test_deprecates_many_paths_globs_and_a_list_file(self, tmp_path, cfg):
+        from d2cms.cli import _cmd_deprecate
+
+        docs = [_section(tmp_path / "old" / f"page-{n}.md", f"00000000-0000-7000-8000-{n:012d}") for n in range(4)]
+        listed = tmp_path / "retire.txt"
+        listed.write_text("# retired this week\nold/page-3.md\n\n")
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(paths=["old/page-0.md", "old/page-[12].md"], from_file=listed))
+
+        assert all(frontmatter.load(doc).metadata["deprecated"] is True for doc in docs)
+
+    def test_directory_deprecates_every_document_in_it(self, tmp_path, cfg):
         from d2cms.cli import _cmd_deprecate
 
+        docs = [_section(tmp_path / "old" / name, f"00000000-0000-7000-8000-{n:012d}")
+                for n, name in enumerate(["a.md", "nested/b.md"])]
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(paths=["old"]))
+
+        assert all(frontmatter.load(doc).metadata["deprecated"] is True for doc in docs)
+
+    def test_collision_changes_nothing(self, tmp_path, cfg, doc_file, capsys):
+        from d2cms.cli import _cmd_deprecate
+
+        _write_doc(tmp_path / "section" / "intro.md", f"---\ntitle: Intro\nparent_key: {DOC_KEY}\n---\n\nC\n")
+        _write_doc(tmp_path / "intro.md", "---\ntitle: Other intro\n---\n\nD\n")
         with (
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
-            patch("d2cms.cli.reparent_and_relocate_children") as mock_reparent,
+            pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_deprecate(_make_args(path="section.md"))
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
-        mock_reparent.assert_called_once_with(doc_file)
+        assert exc_info.value.code == 1
+        assert "intro.md <- section/intro.md" in capsys.readouterr().err
+        assert frontmatter.load(doc_file).metadata["deprecated"] is False
 
-    def test_reparent_called_after_frontmatter_written(self, tmp_path, cfg, doc_file):
-        """reparent_and_relocate_children reads the deprecated doc, so it must run after write."""
+    def test_refuses_to_start_over_an_interrupted_run(self, tmp_path, cfg, doc_file, capsys):
         from d2cms.cli import _cmd_deprecate
 
-        seen_deprecated: list[bool] = []
-
-        def capture_state(path: Path) -> None:
-            seen_deprecated.append(frontmatter.load(path).metadata.get("deprecated", False))
-
+        _write_doc(tmp_path / STATE_DIR / JOURNAL_FILE, '{"steps": []}\n')
         with (
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
-            patch("d2cms.cli.reparent_and_relocate_children", side_effect=capture_state),
+            pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_deprecate(_make_args(path="section.md"))
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
-        assert seen_deprecated == [True]
+        assert exc_info.value.code == 1
+        assert "--resume" in capsys.readouterr().err
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(rollback=True))
+        assert not (tmp_path / STATE_DIR / JOURNAL_FILE).exists()
 
     def test_exits_with_error_when_config_invalid(self, tmp_path):
         from d2cms.cli import _cmd_deprecate
@@ -75,7 +115,7 @@ class TestCmdDeprecate:
             patch("d2cms.cli.load_config_from_env", side_effect=ConfigError("bad config")),
             pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_deprecate(_make_args(path="section.md"))
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
         assert exc_info.value.code == 1
 
@@ -86,18 +126,26 @@ class TestCmdDeprecate:
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
             pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_deprecate(_make_args(path="nonexistent.md"))
+            _cmd_deprecate(_make_args(paths=["nonexistent.md"]))
 
         assert exc_info.value.code == 1
 
-    def test_prints_success_message(self, tmp_path, cfg, doc_file, capsys):
+    def test_exits_with_error_when_nothing_given(self, tmp_path, cfg):
         from d2cms.cli import _cmd_deprecate
 
         with (
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
-            patch("d2cms.cli.reparent_and_relocate_children"),
+            pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_deprecate(_make_args(path="section.md"))
+            _cmd_deprecate(_make_args())
+
+        assert exc_info.value.code == 1
+
+    def test_prints_success_message(self, tmp_path, cfg, doc_file, capsys):
+        from d2cms.cli import _cmd_deprecate
+
+        with patch("d2cms.cli.load_config_from_env", return_value=cfg):
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
         assert "section.md" in capsys.readouterr().out
 
@@ -108,7 +156,7 @@ class TestCmdDeprecate:
             patch("d2cms.cli.load_config_from_env", side_effect=ConfigError("missing env")),
             pytest.raises(SystemExit),
         ):
-            _cmd_deprecate(_make_args(path="section.md"))
+            _cmd_deprecate(_make_args(paths=["section.md"]))
 
         assert "missing env" in capsys.readouterr().err
 
@@ -119,6 +167,6 @@ class TestCmdDeprecate:
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
             pytest.raises(SystemExit),
         ):
-            _cmd_deprecate(_make_args(path="missing.md"))
+            _cmd_deprecate(_make_args(paths=["missing.md"]))
 
         assert "missing.md" in capsys.readouterr().err
@@ -0,0 +1,67 @@
+import argparse
+from unittest.mock import patch
+
+import pytest
+
+from d2cms.wordpress import GcSummary, Orphan
+
+
+def _make_args(**kwargs: object) -> argparse.Namespace:
+    return argparse.Namespace(**{"debug": False, "apply": False, "workers": 4, "batch_size": 0, **kwargs})
+
+
+class TestCmdGc:
+    def test_lists_orphans_without_trashing(self, cfg, capsys):
+        from d2cms.cli import _cmd_gc
+
+        summary = GcSummary(orphans=[Orphan("docs", "abc", 12), Orphan("pages", "def", 13, duplicate=True)])
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.gc", return_value=summary) as mock_gc,
+        ):
+            _cmd_gc(_make_args())
+
+        mock_gc.assert_called_once_with(cfg, apply=False, workers=4, batch_size=0)
+        out = capsys.readouterr().out
+        assert "docs id=12 document_key=abc" in out
+        assert "pages id=13 document_key=def (duplicate)" in out
+        assert "d2cms gc --apply" in out
+
+    def test_reports_trashed_posts(self, cfg, capsys):
+        from d2cms.cli import _cmd_gc
+
+        orphan = Orphan("docs", "abc", 12)
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.gc", return_value=GcSummary(orphans=[orphan], trashed=[orphan])),
+        ):
+            _cmd_gc(_make_args(apply=True))
+
+        assert "Trashed 1 post(s)." in capsys.readouterr().out
+
+    def test_exits_nonzero_when_documents_are_unreadable(self, cfg, capsys):
+        from d2cms.cli import _cmd_gc
+
+        summary = GcSummary(unreadable=[cfg.docs_dir / "docs" / "broken.md"])
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.gc", return_value=summary),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_gc(_make_args(apply=True))
+
+        assert exc_info.value.code == 1
+        assert "docs/broken.md" in capsys.readouterr().err
+
+    def test_exits_nonzero_when_trashing_fails(self, cfg):
+        from d2cms.cli import _cmd_gc
+
+        orphan = Orphan("docs", "abc", 12)
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.gc", return_value=GcSummary(orphans=[orphan], failed=[(orphan, "HTTP 403")])),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_gc(_make_args(apply=True))
+
+        assert exc_info.value.code == 1
@@ -0,0 +1,50 @@
+import argparse
+from unittest.mock import patch
+
+import pytest
+
+from d2cms.wordpress import RehashSummary
+
+
+def _make_args(**kwargs: object) -> argparse.Namespace:
+    return argparse.Namespace(**kwargs)
+
+
+class TestCmdRehash:
+    def test_calls_rehash_with_path(self, cfg):
+        from d2cms.cli import _cmd_rehash
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.rehash", return_value=RehashSummary()) as mock_rehash,
+        ):
+            _cmd_rehash(_make_args(debug=False, path="docs"))
+
+        mock_rehash.assert_called_once_with(cfg, path=cfg.docs_dir / "docs")
+
+    def test_lists_changed_documents(self, cfg, capsys):
+        from d2cms.cli import _cmd_rehash
+
+        summary = RehashSummary(rewritten=2, current=1, changed=[cfg.docs_dir / "docs" / "a.md"])
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.rehash", return_value=summary),
+        ):
+            _cmd_rehash(_make_args(debug=False, path=None))
+
+        out = capsys.readouterr().out
+        assert "Rehashed 2 document(s); 1 already current." in out
+        assert "docs/a.md" in out
+
+    def test_exits_nonzero_on_failures(self, cfg):
+        from d2cms.cli import _cmd_rehash
+
+        summary = RehashSummary(failed=[cfg.docs_dir / "docs" / "bad.md"])
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.rehash", return_value=summary),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_rehash(_make_args(debug=False, path=None))
+
+        assert exc_info.value.code == 1
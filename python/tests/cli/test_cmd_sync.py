@@ -1,10 +1,13 @@
 import argparse
-from unittest.mock import patch
+import json
+from unittest.mock import ANY, patch
 
 import pytest
 
 from d2cms.config import ConfigError
+from d2cms.plan import SyncPlan
 from d2cms.report import SyncReport
+from d2cms.throttle import ThrottleSummary
 
 
 def _make_args(**kwargs: object) -> argparse.Namespace:
@@ -19,9 +22,9 @@ class TestCmdSync:
             patch("d2cms.cli.load_config_from_env", return_value=cfg),
             patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
         ):
-            _cmd_sync(_make_args(debug=False, force=False, path=None))
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
 
-        mock_sync.assert_called_once_with(cfg, force=False, path=None)
+        mock_sync.assert_called_once_with(cfg, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, report=ANY)
 
     def test_exits_with_error_when_config_invalid(self, capsys):
         from d2cms.cli import _cmd_sync
@@ -30,7 +33,7 @@ class TestCmdSync:
             patch("d2cms.cli.load_config_from_env", side_effect=ConfigError("bad config")),
             pytest.raises(SystemExit) as exc_info,
         ):
-            _cmd_sync(_make_args(debug=False, force=False, path=None))
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
 
         assert exc_info.value.code == 1
 
@@ -41,6 +44,260 @@ class TestCmdSync:
             patch("d2cms.cli.load_config_from_env", side_effect=ConfigError("missing env")),
             pytest.raises(SystemExit),
         ):
-            _cmd_sync(_make_args(debug=False, force=False, path=None))
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
 
         assert "missing env" in capsys.readouterr().err
+
+    def test_passes_workers_to_sync(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=8, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_called_once_with(cfg, force=False, path=None, workers=8, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, report=ANY)
+
+    def test_passes_rescan_to_sync(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=True, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_called_once_with(cfg, force=False, path=None, workers=1, rescan=True, since=None, jobs=1, batch_size=0, reconcile=False, report=ANY)
+
+    def test_passes_since_to_sync(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since="HEAD~1", jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_called_once_with(
+            cfg, force=False, path=None, workers=1, rescan=False, since="HEAD~1", jobs=1, batch_size=0, reconcile=False, report=ANY
+        )
+
+    def test_passes_jobs_to_sync(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=4, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_called_once_with(cfg, force=False, path=None, workers=1, rescan=False, since=None, jobs=4, batch_size=0, reconcile=False, report=ANY)
+
+    def test_passes_batch_size_to_sync(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=25, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_called_once_with(cfg, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=25, reconcile=False, report=ANY)
+
+    def test_batch_size_is_capped_at_wordpress_limit(self):
+        from d2cms.cli import _batch_size
+
+        assert _batch_size("25") == 25
+        with pytest.raises(argparse.ArgumentTypeError):
+            _batch_size("26")
+        with pytest.raises(argparse.ArgumentTypeError):
+            _batch_size("0")
+
+    def test_prints_reconcile_summary(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        report = SyncReport()
+        report.record_reconciled("adopted")
+        report.record_reconciled("current")
+        report.record_reconciled("current")
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=report) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=True, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert mock_sync.call_args.kwargs["reconcile"] is True
+        assert "adopted 1 existing post(s); 2 document(s) were already up to date" in capsys.readouterr().out
+
+    def test_exits_with_error_when_reconcile_sweep_fails(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+        from d2cms.remote import ReconcileError
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", side_effect=ReconcileError("could not list wp/v2/docs")),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=True, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert exc_info.value.code == 1
+        assert "could not list wp/v2/docs" in capsys.readouterr().err
+
+    def test_plan_prints_summary_without_syncing(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        sync_plan = SyncPlan()
+        sync_plan.add("docs/a.md", "docs", "create")
+        sync_plan.add("docs/b.md", "docs", "blocked", "parent_key forms a cycle")
+        sync_plan.requests.post = 1
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.plan_sync", return_value=sync_plan) as mock_plan,
+            patch("d2cms.cli.sync") as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=True, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        mock_sync.assert_not_called()
+        mock_plan.assert_called_once_with(cfg, force=False, path=None, batch_size=0)
+        out = capsys.readouterr().out
+        assert "Estimated requests: 1 (1 POST, 0 DELETE" in out
+        assert "docs/b.md: parent_key forms a cycle" in out
+
+    def test_plan_prints_json(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        sync_plan = SyncPlan()
+        sync_plan.add("docs/a.md", "docs", "delete")
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.plan_sync", return_value=sync_plan),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=True, json=True, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert json.loads(capsys.readouterr().out)["totals"]["delete"] == 1
+
+    def test_plan_rejects_since(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since="HEAD~1", jobs=1, batch_size=0, reconcile=False, plan=True, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert exc_info.value.code == 1
+
+    def test_prints_retry_summary(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        report = SyncReport()
+        report.record_retry("POST", "/wp/v2/docs", "503")
+        report.record_retry("GET", "/wp/v2/tags", "ReadTimeout")
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=report),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert "Retried 2 request(s) (503: 1, ReadTimeout: 1)." in capsys.readouterr().err
+
+    def test_prints_throttle_summary(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        report = SyncReport()
+        report.throttle = ThrottleSummary(
+            max_rps=None, limit=6, lowest_limit=2, decreases=2, throttled=3, rate_waits=0, rate_wait_seconds=0.0
+        )
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=report),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert "Throttling: 3 throttled response(s); concurrency limit 6 (lowest 2)." in capsys.readouterr().err
+
+    def test_exits_with_error_when_git_diff_fails(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+        from d2cms.gitdiff import GitDiffError
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", side_effect=GitDiffError("unknown revision")),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since="nope", jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert exc_info.value.code == 1
+        assert "unknown revision" in capsys.readouterr().err
+
+    def test_prints_document_outcomes(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        report = SyncReport()
+        report.record_outcome("created", 2)
+        report.record_outcome("skipped", 5)
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=report),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert "Created 2, updated 0, skipped 5, deleted 0 document(s)." in capsys.readouterr().out
+
+    def test_metrics_are_written_next_to_the_csv(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=True, report_format="csv", report_all=False, include=None, exclude=None))
+
+        results = cfg.docs_dir / "d2cms-sync-results"
+        assert (results / "d2cms_sync.prom").exists()
+        assert len(list(results.glob("*.json"))) == 1
+
+    def test_streams_failures_to_the_report_and_exits_with_error(self, cfg, capsys):
+        from d2cms.cli import _cmd_sync
+
+        def fake_sync(*args: object, report: SyncReport, **kwargs: object) -> SyncReport:
+            report.record_failure("docs/a.md", "docs", 7, RuntimeError("boom"))
+            return report
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", side_effect=fake_sync),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="jsonl", report_all=False, include=None, exclude=None))
+
+        assert exc_info.value.code == 1
+        [path] = (cfg.docs_dir / "d2cms-sync-results").glob("*.jsonl")
+        assert json.loads(path.read_text()) == {
+            "doc_path": "docs/a.md", "content_type": "docs", "wordpress_id": 7, "error_summary": "boom", "outcome": "failed",
+        }
+        assert f"Sync report written to {path}" in capsys.readouterr().out
+
+    def test_clean_run_leaves_no_report(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()),
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=None, exclude=None))
+
+        assert not (cfg.docs_dir / "d2cms-sync-results").exists()
+
+    def test_passes_include_and_exclude_globs_in_config(self, cfg):
+        from d2cms.cli import _cmd_sync
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.sync", return_value=SyncReport()) as mock_sync,
+        ):
+            _cmd_sync(_make_args(debug=False, force=False, path=None, workers=1, rescan=False, since=None, jobs=1, batch_size=0, reconcile=False, plan=False, json=False, metrics=False, report_format="csv", report_all=False, include=["docs/**"], exclude=["drafts/"]))
+
+        synced_cfg = mock_sync.call_args.args[0]
+        assert (synced_cfg.include, synced_cfg.exclude) == (("docs/**",), ("drafts/",))
@@ -0,0 +1,46 @@
+import argparse
+from unittest.mock import patch
+
+from d2cms.report import SyncReport
+
+
+def _make_args(**kwargs: object) -> argparse.Namespace:
+    return argparse.Namespace(**{"debug": False, "path": None, "workers": 1, "debounce": 0.3, "poll": False, "include": None, "exclude": None, **kwargs})
+
+
+class TestCmdWatch:
+    def test_passes_options_to_watch(self, cfg):
+        from d2cms.cli import _cmd_watch
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.watch") as mock_watch,
+        ):
+            _cmd_watch(_make_args(path="docs", workers=4, poll=True))
+
+        kwargs = mock_watch.call_args.kwargs
+        assert mock_watch.call_args.args == (cfg,)
+        assert kwargs["path"] == cfg.docs_dir / "docs"
+        assert (kwargs["workers"], kwargs["debounce"], kwargs["polling"]) == (4, 0.3, True)
+
+    def test_prints_each_pass_and_stops_on_interrupt(self, cfg, capsys):
+        from d2cms.cli import _cmd_watch
+
+        failed = SyncReport()
+        failed.record_failure("docs/a.md", "docs", None, RuntimeError("boom"))
+
+        def _watch(config, **kwargs):
+            kwargs["on_sync"](SyncReport(), None)
+            kwargs["on_sync"](failed, {cfg.docs_dir / "docs" / "a.md"})
+            raise KeyboardInterrupt
+
+        with (
+            patch("d2cms.cli.load_config_from_env", return_value=cfg),
+            patch("d2cms.cli.watch", side_effect=_watch),
+        ):
+            _cmd_watch(_make_args())
+
+        captured = capsys.readouterr()
+        assert "Initial sync: done." in captured.out
+        assert "Stopped." in captured.out
+        assert "Synced 1 changed path(s): 1 document(s) failed to sync." in captured.err
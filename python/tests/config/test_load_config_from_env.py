@@ -82,3 +82,114 @@ class TestLoadConfigFromEnv:
         monkeypatch.setenv("D2CMS_DOCS_DIR", str(tmp_path))
         cfg = load_config_from_env()
         assert cfg.docs_dir.is_absolute()
+
+    def test_http_settings_default_when_unset(self, valid_env):
+        cfg = load_config_from_env()
+        assert cfg.http_pool_size == 10
+        assert cfg.http_connect_timeout == 5.0
+        assert cfg.http_read_timeout == 10.0
+        assert cfg.http_pool_timeout == 10.0
+        assert cfg.http2 is False
+
+    def test_reads_http_settings_from_env(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_POOL_SIZE", "25")
+        monkeypatch.setenv("D2CMS_HTTP_CONNECT_TIMEOUT", "2.5")
+        monkeypatch.setenv("D2CMS_HTTP_READ_TIMEOUT", "30")
+        monkeypatch.setenv("D2CMS_HTTP_POOL_TIMEOUT", "4")
+        monkeypatch.setenv("D2CMS_HTTP2", "true")
+        cfg = load_config_from_env()
+        assert cfg.http_pool_size == 25
+        assert cfg.http_connect_timeout == 2.5
+        assert cfg.http_read_timeout == 30.0
+        assert cfg.http_pool_timeout == 4.0
+        assert cfg.http2 is True
+
+    def test_raises_for_non_integer_pool_size(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_POOL_SIZE", "many")
+        with pytest.raises(ConfigError, match="D2CMS_HTTP_POOL_SIZE"):
+            load_config_from_env()
+
+    def test_raises_for_zero_pool_size(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_POOL_SIZE", "0")
+        with pytest.raises(ConfigError, match="at least 1"):
+            load_config_from_env()
+
+    def test_raises_for_non_positive_timeout(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_READ_TIMEOUT", "-1")
+        with pytest.raises(ConfigError, match="D2CMS_HTTP_READ_TIMEOUT"):
+            load_config_from_env()
+
+    def test_raises_for_invalid_http2_flag(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP2", "maybe")
+        with pytest.raises(ConfigError, match="D2CMS_HTTP2"):
+            load_config_from_env()
+
+    def test_hash_algorithm_defaults_to_sha256(self, valid_env):
+        assert load_config_from_env().hash_algorithm == "sha256"
+
+    def test_reads_hash_algorithm(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HASH_ALGORITHM", "BLAKE2B")
+        assert load_config_from_env().hash_algorithm == "blake2b"
+
+    def test_raises_for_unknown_hash_algorithm(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HASH_ALGORITHM", "md5")
+        with pytest.raises(ConfigError, match="D2CMS_HASH_ALGORITHM"):
+            load_config_from_env()
+
+    def test_retry_settings_default_when_unset(self, valid_env):
+        cfg = load_config_from_env()
+        assert cfg.http_retries == 3
+        assert cfg.http_backoff == 0.5
+        assert cfg.http_backoff_max == 30.0
+        assert cfg.http_retry_statuses == frozenset({429, 502, 503, 504})
+
+    def test_reads_retry_settings_from_env(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_RETRIES", "0")
+        monkeypatch.setenv("D2CMS_HTTP_BACKOFF", "0.1")
+        monkeypatch.setenv("D2CMS_HTTP_BACKOFF_MAX", "5")
+        monkeypatch.setenv("D2CMS_HTTP_RETRY_STATUSES", "503, 504")
+        cfg = load_config_from_env()
+        assert cfg.http_retries == 0
+        assert cfg.http_backoff == 0.1
+        assert cfg.http_backoff_max == 5.0
+        assert cfg.http_retry_statuses == frozenset({503, 504})
+
+    def test_raises_for_invalid_retry_statuses(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_HTTP_RETRY_STATUSES", "503,200")
+        with pytest.raises(ConfigError, match="D2CMS_HTTP_RETRY_STATUSES"):
+            load_config_from_env()
+
+    def test_throttle_defaults(self, valid_env):
+        cfg = load_config_from_env()
+        assert cfg.max_rps is None
+        assert cfg.adaptive_concurrency is True
+
+    def test_reads_throttle_settings_from_env(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_MAX_RPS", "2.5")
+        monkeypatch.setenv("D2CMS_ADAPTIVE_CONCURRENCY", "false")
+        cfg = load_config_from_env()
+        assert cfg.max_rps == 2.5
+        assert cfg.adaptive_concurrency is False
+
+    def test_reads_scan_threads(self, valid_env, monkeypatch):
+        assert load_config_from_env().scan_threads == 1
+        monkeypatch.setenv("D2CMS_SCAN_THREADS", "8")
+        assert load_config_from_env().scan_threads == 8
+
+    def test_reads_media_settings(self, valid_env, monkeypatch):
+        cfg = load_config_from_env()
+        assert (cfg.upload_media, cfg.media_upload_workers) == (False, 4)
+        monkeypatch.setenv("D2CMS_UPLOAD_MEDIA", "true")
+        monkeypatch.setenv("D2CMS_MEDIA_UPLOAD_WORKERS", "8")
+        cfg = load_config_from_env()
+        assert (cfg.upload_media, cfg.media_upload_workers) == (True, 8)
+
+    def test_reads_delete_mode(self, valid_env, monkeypatch):
+        assert load_config_from_env().delete_mode == "trash"
+        monkeypatch.setenv("D2CMS_DELETE_MODE", "Force")
+        assert load_config_from_env().delete_mode == "force"
+
+    def test_raises_for_unknown_delete_mode(self, valid_env, monkeypatch):
+        monkeypatch.setenv("D2CMS_DELETE_MODE", "purge")
+        with pytest.raises(ConfigError, match="D2CMS_DELETE_MODE"):
+            load_config_from_env()
@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import frontmatter
+import pytest
+
+from d2cms.deprecate import (
+    JOURNAL_FILE,
+    DeprecateError,
+    apply_deprecation,
+    pending_journal,
+    plan_deprecation,
+    resume_deprecation,
+    rollback_deprecation,
+)
+from d2cms.state import STATE_DIR
+
+SECTION_KEY = "00000001-0000-7000-8000-000000000000"
+
+
+def _tree(tmp_path: Path) -> tuple[Path, Path, Path]:
+    docs = tmp_path / "docs"
+    (docs / "section" / "nested").mkdir(parents=True)
+    section = docs / "section.md"
+    section.write_text(f"---\ntitle: Section\ndocument_key: {SECTION_KEY}\nparent_key: \ndeprecated: false\n---\n\nA\n")
+    child = docs / "section" / "child.md"
+    child.write_text(f"---\ntitle: Child\nparent_key: {SECTION_KEY}\n---\n\nB\n")
+    grandchild = docs / "section" / "nested" / "deep.md"
+    grandchild.write_text(f"---\ntitle: Deep\nparent_key: {SECTION_KEY}\n---\n\nC\n")
+    return section, child, grandchild
+
+
+def _snapshot(root: Path) -> dict[str, bytes | None]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes() if path.is_file() else None
+        for path in sorted(root.rglob("*")) if ".d2cms" not in path.parts
+    }
+
+
+class TestApplyDeprecation:
+    def test_applies_every_step_and_removes_the_journal(self, tmp_path):
+        section, _, _ = _tree(tmp_path)
+        apply_deprecation(plan_deprecation(tmp_path, [section]))
+
+        docs = tmp_path / "docs"
+        assert frontmatter.load(section).metadata["deprecated"] is True
+        assert frontmatter.load(docs / "child.md").metadata["parent_key"] == ""
+        assert (docs / "nested" / "deep.md").exists()
+        assert not (docs / "section").exists()
+        assert pending_journal(tmp_path) is None
+
+    def test_refuses_a_plan_with_collisions(self, tmp_path):
+        section, _, _ = _tree(tmp_path)
+        (tmp_path / "docs" / "child.md").write_text("taken")
+        before = _snapshot(tmp_path)
+        with pytest.raises(DeprecateError):
+            apply_deprecation(plan_deprecation(tmp_path, [section]))
+        assert _snapshot(tmp_path) == before
+
+    def test_interrupted_run_can_be_resumed(self, tmp_path):
+        section, _, _ = _tree(tmp_path)
+        plan = plan_deprecation(tmp_path, [section])
+        real_rename = Path.rename
+        calls = []
+
+        def _fail_second(self, target):
+            calls.append(self)
+            if len(calls) == 2:
+                raise OSError("interrupted")
+            return real_rename(self, target)
+
+        with patch.object(Path, "rename", _fail_second), pytest.raises(OSError):
+            apply_deprecation(plan)
+        journal = pending_journal(tmp_path)
+        assert journal is not None
+        assert len(journal.read_text().splitlines()) == 1 + 3 # the plan, two edits and one move
+
+        with pytest.raises(DeprecateError):
+            apply_deprecation(plan_deprecation(tmp_path, [section]))
+        steps = json.loads(journal.read_text().splitlines()[0])["steps"]
+        assert resume_deprecation(tmp_path) == len(steps) - 3
+        assert (tmp_path / "docs" / "nested" / "deep.md").exists()
+        assert not (tmp_path / "docs" / "section").exists()
+        assert pending_journal(tmp_path) is None
+
+    def test_interrupted_run_can_be_rolled_back(self, tmp_path):
+        section, _, _ = _tree(tmp_path)
+        before = _snapshot(tmp_path)
+        plan = plan_deprecation(tmp_path, [section])
+        real_rmdir = Path.rmdir
+
+        def _fail(self):
+            raise KeyboardInterrupt
+
+        with patch.object(Path, "rmdir", _fail), pytest.raises(KeyboardInterrupt):
+            apply_deprecation(plan)
+        with patch.object(Path, "rmdir", real_rmdir):
+            assert rollback_deprecation(tmp_path) == 4
+        assert _snapshot(tmp_path) == before
+        assert pending_journal(tmp_path) is None
+
+    def test_nothing_to_resume(self, tmp_path):
+        with pytest.raises(DeprecateError):
+            resume_deprecation(tmp_path)
+
+    @pytest.mark.parametrize("header", ['{"steps": [{"op": "ed', '{"done": 0}'])
+    def test_corrupt_journal_header_raises_deprecate_error(self, tmp_path, header):
+        journal = tmp_path / STATE_DIR / JOURNAL_FILE
+        journal.parent.mkdir()
+        journal.write_text(header + "\n")
+        with pytest.raises(DeprecateError, match=JOURNAL_FILE):
+            resume_deprecation(tmp_path)
+        with pytest.raises(DeprecateError, match=JOURNAL_FILE):
+            rollback_deprecation(tmp_path)
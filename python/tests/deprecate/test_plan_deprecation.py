@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from d2cms.deprecate import Move, plan_deprecation
+
+SECTION_KEY = "00000001-0000-7000-8000-000000000000"
+CHAPTER_KEY = "00000002-0000-7000-8000-000000000000"
+ROOT_KEY = "00000003-0000-7000-8000-000000000000"
+
+
+def _doc(path: Path, document_key: str = "", parent_key: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {path.stem}\ndocument_key: {document_key}\nparent_key: {parent_key}\n---\n\nContent\n")
+    return path
+
+
+class TestPlanDeprecation:
+    def test_children_move_up_and_inherit_the_parent_key(self, tmp_path):
+        section = _doc(tmp_path / "docs/section.md", SECTION_KEY, ROOT_KEY)
+        child = _doc(tmp_path / "docs/section/child.md", parent_key=SECTION_KEY)
+        image = tmp_path / "docs/section/img/diagram.png"
+        image.parent.mkdir()
+        image.write_bytes(b"png")
+
+        plan = plan_deprecation(tmp_path, [section])
+
+        assert plan.edits == {section: {"deprecated": True}, child: {"parent_key": ROOT_KEY}}
+        assert plan.moves == [
+            Move(child, tmp_path / "docs/child.md"),
+            Move(image, tmp_path / "docs/img/diagram.png"),
+        ]
+        assert plan.emptied == [tmp_path / "docs/section/img", tmp_path / "docs/section"]
+        assert not plan.collisions
+
+    def test_nested_deprecations_skip_to_the_nearest_live_parent(self, tmp_path):
+        section = _doc(tmp_path / "docs/section.md", SECTION_KEY, ROOT_KEY)
+        chapter = _doc(tmp_path / "docs/section/chapter.md", CHAPTER_KEY, SECTION_KEY)
+        page = _doc(tmp_path / "docs/section/chapter/page.md", parent_key=CHAPTER_KEY)
+
+        plan = plan_deprecation(tmp_path, [chapter, section])
+
+        assert plan.edits[page] == {"parent_key": ROOT_KEY}
+        assert plan.edits[chapter] == {"deprecated": True}
+        # The deprecated chapter stays put for sync to delete; only the live page moves
+        assert plan.moves == [Move(page, tmp_path / "docs/page.md")]
+        assert tmp_path / "docs/section" not in plan.emptied
+        assert tmp_path / "docs/section/chapter" in plan.emptied
+
+    def test_relocation_onto_an_existing_file_is_a_collision(self, tmp_path):
+        section = _doc(tmp_path / "docs/section.md", SECTION_KEY)
+        child = _doc(tmp_path / "docs/section/intro.md", parent_key=SECTION_KEY)
+        _doc(tmp_path / "docs/intro.md")
+
+        plan = plan_deprecation(tmp_path, [section])
+
+        assert plan.collisions == {tmp_path / "docs/intro.md": [child]}
+        assert plan.moves == []
+
+    def test_two_children_landing_on_one_name_collide(self, tmp_path):
+        first = _doc(tmp_path / "docs/a.md", SECTION_KEY)
+        second = _doc(tmp_path / "docs/b.md", CHAPTER_KEY)
+        from_a = _doc(tmp_path / "docs/a/index.md", parent_key=SECTION_KEY)
+        from_b = _doc(tmp_path / "docs/b/index.md", parent_key=CHAPTER_KEY)
+
+        plan = plan_deprecation(tmp_path, [first, second])
+
+        assert plan.collisions == {tmp_path / "docs/index.md": [from_a, from_b]}
+
+    def test_directories_merge_into_existing_ones(self, tmp_path):
+        section = _doc(tmp_path / "docs/section.md", SECTION_KEY)
+        nested = _doc(tmp_path / "docs/section/guides/new.md")
+        _doc(tmp_path / "docs/guides/old.md")
+
+        plan = plan_deprecation(tmp_path, [section])
+
+        assert plan.moves == [Move(nested, tmp_path / "docs/guides/new.md")]
+        assert not plan.collisions
+
+    def test_document_without_children_is_only_marked(self, tmp_path):
+        section = _doc(tmp_path / "docs/section.md", SECTION_KEY)
+        plan = plan_deprecation(tmp_path, [section])
+        assert plan.edits == {section: {"deprecated": True}}
+        assert (plan.moves, plan.emptied) == ([], [])
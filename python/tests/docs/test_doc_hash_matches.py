@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import frontmatter
+import pytest
+
+from d2cms.docs import DocumentChangedError, doc_hash_matches, generate_doc_hash, rehash_document
+from tests.docs.test_generate_doc_hash import _make_v1_hash
+
+PATH = Path("docs/test.md")
+
+
+def _post(document_hash: str = "", content: str = "Content") -> frontmatter.Post:
+    return frontmatter.loads(f"---\ntitle: T\ndocument_hash: {document_hash}\n---\n{content}")
+
+
+def _stored(post: frontmatter.Post, document_hash: str) -> frontmatter.Post:
+    post.metadata["document_hash"] = document_hash
+    return post
+
+
+class TestDocHashMatches:
+    def test_no_stored_hash_does_not_match(self):
+        assert not doc_hash_matches(_post(), PATH)
+
+    def test_matching_v2_hash(self):
+        post = _post()
+        assert doc_hash_matches(_stored(post, generate_doc_hash(post, PATH)), PATH)
+
+    def test_matching_v1_hash_still_matches(self):
+        post = _post()
+        assert doc_hash_matches(_stored(post, _make_v1_hash(post, PATH)), PATH)
+
+    def test_stale_v1_hash_does_not_match(self):
+        stale = _make_v1_hash(_post(content="Old content"), PATH)
+        assert not doc_hash_matches(_post(stale, content="New content"), PATH)
+
+    def test_hash_from_other_algorithm_still_matches(self):
+        post = _post()
+        post = _stored(post, generate_doc_hash(post, PATH, "blake2b"))
+        assert doc_hash_matches(post, PATH, current_hash=generate_doc_hash(post, PATH, "sha256"))
+
+    def test_unknown_algorithm_does_not_match(self):
+        assert not doc_hash_matches(_post("v2:md5:abc"), PATH)
+
+
+class TestRehashDocument:
+    @pytest.fixture
+    def doc_file(self, tmp_path: Path) -> Path:
+        f = tmp_path / PATH
+        f.parent.mkdir(parents=True)
+        f.write_text("---\ntitle: T\ndocument_hash: \n---\n\nContent\n")
+        return f
+
+    def _store(self, doc_file: Path, document_hash: str) -> None:
+        post = frontmatter.load(doc_file)
+        post.metadata["document_hash"] = document_hash
+        doc_file.write_text(frontmatter.dumps(post))
+
+    def test_migrates_matching_v1_hash(self, tmp_path, doc_file):
+        self._store(doc_file, _make_v1_hash(frontmatter.load(doc_file), PATH))
+        new_hash = rehash_document(doc_file, tmp_path)
+        post = frontmatter.load(doc_file)
+        assert post.metadata["document_hash"] == new_hash == generate_doc_hash(post, PATH)
+
+    def test_current_hash_is_left_alone(self, tmp_path, doc_file):
+        self._store(doc_file, generate_doc_hash(frontmatter.load(doc_file), PATH))
+        assert rehash_document(doc_file, tmp_path) is None
+
+    def test_switches_algorithm(self, tmp_path, doc_file):
+        self._store(doc_file, generate_doc_hash(frontmatter.load(doc_file), PATH))
+        assert rehash_document(doc_file, tmp_path, "blake2b") is not None
+        assert frontmatter.load(doc_file).metadata["document_hash"].startswith("v2:blake2b:")
+
+    def test_changed_document_keeps_its_hash(self, tmp_path, doc_file):
+        self._store(doc_file, "stale")
+        with pytest.raises(DocumentChangedError):
+            rehash_document(doc_file, tmp_path)
+        assert frontmatter.load(doc_file).metadata["document_hash"] == "stale"
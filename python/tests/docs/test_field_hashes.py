@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.docs import field_hashes
+
+_DOC = "---\ntitle: Guide\nslug: guide\norder: 1\nparent_key: aaa\ntags: [a]\nauthor: me\n---\n{body}"
+
+
+def _changed(before: str, after: str, before_path: str = "guide.md", after_path: str = "guide.md") -> set[str]:
+    old = field_hashes(frontmatter.loads(before), Path(before_path))
+    new = field_hashes(frontmatter.loads(after), Path(after_path))
+    return {group for group in old if old[group] != new[group]}
+
+
+class TestFieldHashes:
+    def test_parent_change_only_changes_parent(self):
+        doc = _DOC.format(body="Hello")
+        assert _changed(doc, doc.replace("parent_key: aaa", "parent_key: bbb")) == {"parent"}
+
+    def test_each_group_changes_on_its_own(self):
+        doc = _DOC.format(body="Hello")
+        assert _changed(doc, doc.replace("title: Guide", "title: Manual")) == {"title"}
+        assert _changed(doc, doc.replace("order: 1", "order: 2")) == {"order"}
+        assert _changed(doc, doc.replace("tags: [a]", "tags: [a, b]")) == {"tags"}
+        assert _changed(doc, doc.replace("Hello", "Goodbye")) == {"content"}
+        assert _changed(doc, doc.replace("author: me", "author: you")) == {"other"}
+
+    def test_unhashed_fields_are_ignored(self):
+        doc = _DOC.format(body="Hello")
+        assert _changed(doc, doc.replace("author: me", "author: me\nwordpress_id: 7\ndocument_hash: x")) == set()
+
+    def test_move_without_relative_links_keeps_content(self):
+        doc = _DOC.format(body="See [the site](https://example.com).")
+        assert _changed(doc, doc, "guide.md", "section/guide.md") == set()
+
+    def test_move_with_relative_links_changes_content(self):
+        doc = _DOC.format(body="See ![diagram](diagram.png).")
+        assert _changed(doc, doc, "guide.md", "section/guide.md") == {"content"}
+
+    def test_title_heading_is_part_of_content(self):
+        doc = _DOC.format(body="# Guide\n\nHello")
+        assert _changed(doc, doc.replace("title: Guide", "title: Manual")) == {"title", "content"}
@@ -7,7 +7,7 @@ import yaml
 from d2cms.docs import generate_doc_hash
 
 
-def _make_hash(post: frontmatter.Post, relative_path: Path) -> str:
+def _make_v1_hash(post: frontmatter.Post, relative_path: Path) -> str:
     metadata_for_hash = {k: v for k, v in post.metadata.items() if k != "document_hash"}
     hash_input = "\n".join([
         str(relative_path),
@@ -18,22 +18,35 @@ def _make_hash(post: frontmatter.Post, relative_path: Path) -> str:
 
 
 class TestGenerateDocHash:
-    def test_returns_sha256_hex_string(self):
+    def test_returns_versioned_sha256_hex_string(self):
         post = frontmatter.loads("---\ntitle: Test\n---\nHello world")
-        result = generate_doc_hash(post, Path("test.md"))
-        assert len(result) == 64
-        assert all(c in "0123456789abcdef" for c in result)
+        version, algorithm, digest = generate_doc_hash(post, Path("test.md")).split(":")
+        assert (version, algorithm) == ("v2", "sha256")
+        assert len(digest) == 64
+        assert all(c in "0123456789abcdef" for c in digest)
 
-    def test_matches_expected_sha256_of_combined_input(self):
+    def test_blake2b_digest_has_sha256_length(self):
+        post = frontmatter.loads("---\ntitle: Test\n---\nHello world")
+        version, algorithm, digest = generate_doc_hash(post, Path("test.md"), "blake2b").split(":")
+        assert (version, algorithm) == ("v2", "blake2b")
+        assert len(digest) == 64
+
+    def test_differs_from_v1_hash(self):
         post = frontmatter.loads("---\ntitle: Test\n---\nHello world")
         path = Path("section/test.md")
-        assert generate_doc_hash(post, path) == _make_hash(post, path)
+        assert generate_doc_hash(post, path) != _make_v1_hash(post, path)
 
     def test_consistent_for_same_inputs(self):
         post = frontmatter.loads("---\ntitle: Test\n---\nSame content")
         path = Path("test.md")
         assert generate_doc_hash(post, path) == generate_doc_hash(post, path)
 
+    def test_independent_of_frontmatter_key_order(self):
+        path = Path("test.md")
+        post_a = frontmatter.loads("---\ntitle: T\nslug: t\n---\nContent")
+        post_b = frontmatter.loads("---\nslug: t\ntitle: T\n---\nContent")
+        assert generate_doc_hash(post_a, path) == generate_doc_hash(post_b, path)
+
     def test_changes_when_content_changes(self):
         path = Path("test.md")
         post_a = frontmatter.loads("---\ntitle: Test\n---\nContent A")
@@ -50,8 +63,18 @@ class TestGenerateDocHash:
         post_b = frontmatter.loads("---\ntitle: B\n---\nShared content")
         assert generate_doc_hash(post_a, path) != generate_doc_hash(post_b, path)
 
+    def test_handles_yaml_dates(self):
+        post = frontmatter.loads("---\ntitle: T\npublished: 2024-05-01\n---\nContent")
+        assert generate_doc_hash(post, Path("test.md")).startswith("v2:")
+
     def test_document_hash_field_excluded_from_hash(self):
         path = Path("test.md")
         post_a = frontmatter.loads("---\ntitle: T\ndocument_hash: old\n---\nContent")
         post_b = frontmatter.loads("---\ntitle: T\ndocument_hash: new\n---\nContent")
         assert generate_doc_hash(post_a, path) == generate_doc_hash(post_b, path)
+
+    def test_wordpress_id_excluded_from_hash(self):
+        path = Path("test.md")
+        post_a = frontmatter.loads("---\ntitle: T\nwordpress_id: \n---\nContent")
+        post_b = frontmatter.loads("---\ntitle: T\nwordpress_id: 42\n---\nContent")
+        assert generate_doc_hash(post_a, path) == generate_doc_hash(post_b, path)
@@ -1,6 +1,7 @@
 import frontmatter
 import pytest
 
+from d2cms.cache import RenderCache
 from d2cms.docs import to_html
 
 
@@ -115,3 +116,50 @@ class TestToHtml:
         file_path = docs_dir / "docs" / "parent" / "child.md"
         post = frontmatter.loads("---\ntitle: Child\n---\n[Up](../parent.md)")
         assert 'href="/docs/parent"' in to_html(post, file_path, docs_dir)
+
+
+class TestToHtmlRenderCache:
+    @pytest.fixture
+    def paths(self, tmp_path):
+        (tmp_path / "docs" / "guides").mkdir(parents=True)
+        return tmp_path / "docs" / "guides" / "page.md", tmp_path
+
+    def test_second_render_is_served_from_cache(self, paths):
+        file_path, docs_dir = paths
+        post = frontmatter.loads("---\ntitle: Test\n---\nHello **world**")
+        renders = RenderCache(docs_dir)
+
+        first = to_html(post, file_path, docs_dir, renders)
+        second = to_html(post, file_path, docs_dir, renders)
+
+        assert first == second == to_html(post, file_path, docs_dir)
+        assert (renders.misses, renders.hits) == (1, 1)
+
+    def test_changed_content_misses(self, paths):
+        file_path, docs_dir = paths
+        renders = RenderCache(docs_dir)
+        to_html(frontmatter.loads("---\ntitle: Test\n---\nOne"), file_path, docs_dir, renders)
+        html = to_html(frontmatter.loads("---\ntitle: Test\n---\nTwo"), file_path, docs_dir, renders)
+        assert "Two" in html
+        assert renders.hits == 0
+
+    def test_same_content_in_other_directory_misses(self, paths):
+        """Relative links resolve differently, so the link context is part of the key."""
+        file_path, docs_dir = paths
+        post = frontmatter.loads("---\ntitle: Test\n---\n[Sibling](other.md)")
+        renders = RenderCache(docs_dir)
+
+        nested = to_html(post, file_path, docs_dir, renders)
+        top = to_html(post, docs_dir / "docs" / "page.md", docs_dir, renders)
+
+        assert "/docs/guides/other" in nested
+        assert 'href="/docs/other"' in top
+        assert renders.hits == 0
+
+    def test_title_change_misses(self, paths):
+        file_path, docs_dir = paths
+        renders = RenderCache(docs_dir)
+        body = "# My Doc\n\nContent"
+        to_html(frontmatter.loads(f"---\ntitle: My Doc\n---\n{body}"), file_path, docs_dir, renders)
+        html = to_html(frontmatter.loads(f"---\ntitle: Other\n---\n{body}"), file_path, docs_dir, renders)
+        assert "<h1>" in html
@@ -65,3 +65,47 @@ class TestUpdateFrontmatter:
         # doc_file has no parent_key field — calling without parent_key should not add it
         update_frontmatter(doc_file, wordpress_id=1)
         assert "parent_key" not in frontmatter.load(doc_file).metadata
+
+    def test_edits_only_the_changed_lines(self, tmp_path: Path) -> None:
+        f = tmp_path / "doc.md"
+        f.write_text(
+            "---\ntitle: 'Quoted: title'  # keep me\ntags: [a, b]\nwordpress_id: \n"
+            "document_hash: old\n---\n\n# Body\n"
+        )
+        update_frontmatter(f, wordpress_id=7, document_hash="v2:sha256:abc")
+        assert f.read_text() == (
+            "---\ntitle: 'Quoted: title'  # keep me\ntags: [a, b]\nwordpress_id: 7\n"
+            "document_hash: v2:sha256:abc\n---\n\n# Body\n"
+        )
+
+    def test_appends_missing_field_to_frontmatter(self, tmp_path: Path) -> None:
+        f = tmp_path / "doc.md"
+        f.write_text("---\ntitle: T\n---\n\nBody\n")
+        update_frontmatter(f, wordpress_id=3)
+        assert f.read_text() == "---\ntitle: T\nwordpress_id: 3\n---\n\nBody\n"
+
+    def test_replaces_multiline_value(self, tmp_path: Path) -> None:
+        f = tmp_path / "doc.md"
+        f.write_text("---\ndocument_hash: >-\n  folded\n  value\ntitle: T\n---\nBody\n")
+        update_frontmatter(f, document_hash="new")
+        assert f.read_text() == "---\ndocument_hash: new\ntitle: T\n---\nBody\n"
+
+    def test_keeps_crlf_line_endings(self, tmp_path: Path) -> None:
+        f = tmp_path / "doc.md"
+        f.write_bytes(b"---\r\ntitle: T\r\nwordpress_id: \r\n---\r\nBody\r\n")
+        update_frontmatter(f, wordpress_id=5)
+        assert f.read_bytes() == b"---\r\ntitle: T\r\nwordpress_id: 5\r\n---\r\nBody\r\n"
+
+    def test_adds_frontmatter_to_document_without_one(self, tmp_path: Path) -> None:
+        f = tmp_path / "doc.md"
+        f.write_text("Just a body\n")
+        update_frontmatter(f, wordpress_id=5)
+        post = frontmatter.load(f)
+        assert post.metadata["wordpress_id"] == 5
+        assert post.content == "Just a body"
+
+    def test_replaces_file_atomically_keeping_its_mode(self, doc_file: Path) -> None:
+        doc_file.chmod(0o640)
+        update_frontmatter(doc_file, wordpress_id=1)
+        assert doc_file.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in doc_file.parent.iterdir()] == [doc_file.name]
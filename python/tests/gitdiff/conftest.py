@@ -0,0 +1,28 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git(tmp_path, "init", "-q")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "kept.md").write_text("kept\n")
+    (tmp_path / "docs" / "edited.md").write_text("before\n")
+    (tmp_path / "docs" / "removed.md").write_text("removed\n")
+    (tmp_path / "docs" / "moved.md").write_text("a long enough body to be detected as a rename\n")
+    (tmp_path / "notes.txt").write_text("not markdown\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
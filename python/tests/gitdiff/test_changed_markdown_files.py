@@ -0,0 +1,77 @@
+import pytest
+
+from d2cms.gitdiff import FileChange, GitDiffError, changed_markdown_files, read_file_at
+from tests.gitdiff.conftest import git
+
+
+class TestChangedMarkdownFiles:
+    def test_no_changes_returns_empty_list(self, repo):
+        assert changed_markdown_files(repo, "HEAD") == []
+
+    def test_reports_modified_file(self, repo):
+        (repo / "docs" / "edited.md").write_text("after\n")
+        assert changed_markdown_files(repo, "HEAD") == [
+            FileChange("modified", repo / "docs" / "edited.md")
+        ]
+
+    def test_reports_deleted_file(self, repo):
+        git(repo, "rm", "-q", "docs/removed.md")
+        assert changed_markdown_files(repo, "HEAD") == [
+            FileChange("deleted", repo / "docs" / "removed.md")
+        ]
+
+    def test_reports_committed_addition(self, repo):
+        (repo / "docs" / "new.md").write_text("new\n")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "add")
+        assert changed_markdown_files(repo, "HEAD~1") == [
+            FileChange("added", repo / "docs" / "new.md")
+        ]
+
+    def test_reports_untracked_markdown_as_added(self, repo):
+        (repo / "docs" / "draft.md").write_text("draft\n")
+        assert changed_markdown_files(repo, "HEAD") == [
+            FileChange("added", repo / "docs" / "draft.md")
+        ]
+
+    def test_reports_rename_once_with_old_path(self, repo):
+        (repo / "docs" / "section").mkdir()
+        git(repo, "mv", "docs/moved.md", "docs/section/moved.md")
+        assert changed_markdown_files(repo, "HEAD") == [
+            FileChange("renamed", repo / "docs" / "section" / "moved.md", old_path=repo / "docs" / "moved.md")
+        ]
+
+    def test_rename_away_from_markdown_reports_deletion(self, repo):
+        git(repo, "mv", "docs/moved.md", "docs/moved.txt")
+        assert changed_markdown_files(repo, "HEAD") == [
+            FileChange("deleted", repo / "docs" / "moved.md")
+        ]
+
+    def test_ignores_non_markdown_files(self, repo):
+        (repo / "notes.txt").write_text("changed\n")
+        (repo / "image.png").write_bytes(b"\x89PNG")
+        assert changed_markdown_files(repo, "HEAD") == []
+
+    def test_paths_are_relative_to_given_directory(self, repo):
+        (repo / "docs" / "edited.md").write_text("after\n")
+        (repo / "root.md").write_text("outside docs\n")
+        changes = changed_markdown_files(repo / "docs", "HEAD")
+        assert changes == [FileChange("modified", repo / "docs" / "edited.md")]
+
+    def test_unknown_ref_raises(self, repo):
+        with pytest.raises(GitDiffError):
+            changed_markdown_files(repo, "no-such-ref")
+
+    def test_outside_a_repository_raises(self, tmp_path_factory):
+        with pytest.raises(GitDiffError):
+            changed_markdown_files(tmp_path_factory.mktemp("plain"), "HEAD")
+
+
+class TestReadFileAt:
+    def test_returns_content_at_ref(self, repo):
+        (repo / "docs" / "edited.md").write_text("after\n")
+        assert read_file_at(repo / "docs", "HEAD", repo / "docs" / "edited.md") == "before\n"
+
+    def test_reads_deleted_file(self, repo):
+        git(repo, "rm", "-q", "docs/removed.md")
+        assert read_file_at(repo, "HEAD", repo / "docs" / "removed.md") == "removed\n"
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.graph import build_sync_graph
+
+PARENT_KEY = "ffffffff-ffff-7fff-bfff-ffffffffffff"
+CHILD_KEY = "00000001-0000-7000-8000-000000000000"
+
+
+def _post(document_key: str = "", parent_key: str = "") -> frontmatter.Post:
+    return frontmatter.loads(
+        f"---\ndocument_key: {document_key}\nparent_key: {parent_key}\n---\nContent\n"
+    )
+
+
+class TestBuildSyncGraph:
+    def test_documents_without_parents_have_no_dependencies(self):
+        graph = build_sync_graph({Path("/d/a.md"): _post(), Path("/d/b.md"): _post()})
+        assert all(not node.dependencies for node in graph.values())
+
+    def test_links_child_to_parent_by_parent_key(self):
+        parent, child = Path("/d/parent.md"), Path("/d/other/child.md")
+        graph = build_sync_graph({
+            parent: _post(document_key=PARENT_KEY),
+            child: _post(document_key=CHILD_KEY, parent_key=PARENT_KEY),
+        })
+        assert graph[child].dependencies == {parent}
+        assert graph[parent].dependents == [child]
+
+    def test_links_child_to_parent_by_directory_nesting(self):
+        parent, child = Path("/d/section.md"), Path("/d/section/child.md")
+        graph = build_sync_graph({parent: _post(), child: _post()})
+        assert graph[child].dependencies == {parent}
+
+    def test_key_and_nesting_parent_are_deduplicated(self):
+        parent, child = Path("/d/section.md"), Path("/d/section/child.md")
+        graph = build_sync_graph({
+            parent: _post(document_key=PARENT_KEY),
+            child: _post(parent_key=PARENT_KEY),
+        })
+        assert graph[child].dependencies == {parent}
+        assert graph[parent].dependents == [child]
+
+    def test_parent_outside_scanned_set_adds_no_dependency(self):
+        child = Path("/d/child.md")
+        graph = build_sync_graph({child: _post(parent_key=PARENT_KEY)})
+        assert graph[child].dependencies == set()
+
+    def test_document_is_never_its_own_dependency(self):
+        doc = Path("/d/self.md")
+        graph = build_sync_graph({doc: _post(document_key=CHILD_KEY, parent_key=CHILD_KEY)})
+        assert graph[doc].dependencies == set()
@@ -0,0 +1,61 @@
+from dataclasses import replace
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from d2cms.config import ConfigError
+from d2cms.http import make_client
+
+
+class TestMakeClient:
+    def test_uses_api_root_as_base_url(self, cfg):
+        with make_client(cfg) as client:
+            assert str(client.base_url) == cfg.wp_api_root
+
+    def test_sets_bearer_header_in_token_mode(self, cfg):
+        with make_client(cfg) as client:
+            assert client.headers["Authorization"] == "Bearer test-token"
+
+    def test_uses_basic_auth_in_basic_mode(self, cfg):
+        with make_client(replace(cfg, auth_mode="basic")) as client:
+            assert isinstance(client.auth, httpx.BasicAuth)
+            assert "Authorization" not in client.headers
+
+    def test_applies_configured_timeouts(self, cfg):
+        cfg = replace(cfg, http_connect_timeout=1.5, http_read_timeout=20.0, http_pool_timeout=3.0)
+        with make_client(cfg) as client:
+            assert client.timeout.connect == 1.5
+            assert client.timeout.read == 20.0
+            assert client.timeout.pool == 3.0
+
+    def test_applies_configured_pool_size(self, cfg):
+        with patch("d2cms.http.httpx.HTTPTransport") as mock_transport:
+            make_client(replace(cfg, http_pool_size=4))
+        limits = mock_transport.call_args.kwargs["limits"]
+        assert limits.max_connections == 4
+        assert limits.max_keepalive_connections == 4
+
+    def test_http2_disabled_by_default(self, cfg):
+        with patch("d2cms.http.httpx.HTTPTransport") as mock_transport:
+            make_client(cfg)
+        assert mock_transport.call_args.kwargs["http2"] is False
+
+    def test_http2_without_h2_installed_raises_config_error(self, cfg):
+        with (
+            patch("d2cms.http.importlib.util.find_spec", return_value=None),
+            pytest.raises(ConfigError, match="h2"),
+        ):
+            make_client(replace(cfg, http2=True))
+
+    def test_reports_each_response_with_its_route(self, cfg):
+        import respx
+
+        seen = []
+        with respx.mock, make_client(cfg, on_response=lambda *response: seen.append(response)) as client:
+            respx.post(f"{cfg.wp_api_root}wp/v2/docs/12").mock(return_value=httpx.Response(200, json={}))
+            client.post("wp/v2/docs/12", json={})
+
+        [(method, route, status, seconds)] = seen
+        assert (method, route, status) == ("POST", "wp/v2/docs/12", 200)
+        assert seconds >= 0
@@ -0,0 +1,125 @@
+from collections.abc import Callable
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from d2cms.http import BEFORE_RETRY, IDEMPOTENT, RetryTransport
+
+Outcome = httpx.Response | Exception
+
+
+def _client(
+    outcomes: list[Outcome], retries: int = 3, on_retry: Callable[[str, str, str], None] | None = None
+) -> tuple[httpx.Client, list[httpx.Request]]:
+    sent: list[httpx.Request] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    transport = RetryTransport(
+        httpx.MockTransport(_handler),
+        retries=retries,
+        backoff=0.5,
+        backoff_max=10.0,
+        statuses=frozenset({429, 502, 503, 504}),
+        on_retry=on_retry,
+    )
+    return httpx.Client(base_url="http://wp.test/", transport=transport), sent
+
+
+@pytest.fixture(autouse=True)
+def sleeps():
+    with patch("d2cms.http.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+class TestRetryTransport:
+    def test_retries_get_after_server_error(self):
+        client, sent = _client([httpx.Response(502), httpx.Response(200, json=[])])
+        assert client.get("wp/v2/tags").status_code == 200
+        assert len(sent) == 2
+
+    def test_retries_get_after_read_timeout(self):
+        client, sent = _client([httpx.ReadTimeout("slow"), httpx.Response(200)])
+        assert client.get("wp/v2/tags").status_code == 200
+        assert len(sent) == 2
+
+    def test_gives_up_after_configured_retries(self):
+        client, sent = _client([httpx.Response(503)] * 3, retries=2)
+        assert client.get("wp/v2/tags").status_code == 503
+        assert len(sent) == 3
+
+    def test_raises_last_error_when_retries_run_out(self):
+        client, _ = _client([httpx.ReadTimeout("slow")] * 2, retries=1)
+        with pytest.raises(httpx.ReadTimeout):
+            client.get("wp/v2/tags")
+
+    def test_does_not_retry_other_statuses(self):
+        client, sent = _client([httpx.Response(500)])
+        assert client.get("wp/v2/tags").status_code == 500
+        assert len(sent) == 1
+
+    def test_backoff_doubles_and_is_jittered(self, sleeps):
+        client, _ = _client([httpx.Response(502)] * 3 + [httpx.Response(200)])
+        with patch("d2cms.http.random.uniform", side_effect=lambda low, high: high) as uniform:
+            client.get("wp/v2/tags")
+        assert [c.args for c in uniform.call_args_list] == [(0, 0.5), (0, 1.0), (0, 2.0)]
+        assert [c.args[0] for c in sleeps.call_args_list] == [0.5, 1.0, 2.0]
+
+    def test_honours_retry_after_seconds(self, sleeps):
+        client, _ = _client([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+        client.get("wp/v2/tags")
+        sleeps.assert_called_once_with(7.0)
+
+    def test_gives_up_when_retry_after_exceeds_max_delay(self):
+        client, sent = _client([httpx.Response(503, headers={"Retry-After": "3600"})])
+        assert client.get("wp/v2/tags").status_code == 503
+        assert len(sent) == 1
+
+    def test_does_not_resend_post_that_may_have_been_applied(self):
+        client, sent = _client([httpx.ReadTimeout("slow")])
+        with pytest.raises(httpx.ReadTimeout):
+            client.post("wp/v2/docs", json={})
+        assert len(sent) == 1
+
+    def test_resends_post_that_never_connected(self):
+        client, sent = _client([httpx.ConnectError("refused"), httpx.Response(201)])
+        assert client.post("wp/v2/docs", json={}).status_code == 201
+        assert len(sent) == 2
+
+    def test_resends_post_refused_with_429(self):
+        client, sent = _client([httpx.Response(429), httpx.Response(201)])
+        assert client.post("wp/v2/docs", json={}).status_code == 201
+        assert len(sent) == 2
+
+    def test_resends_post_marked_idempotent(self):
+        client, sent = _client([httpx.Response(504), httpx.Response(200)])
+        assert client.post("wp/v2/docs/5", json={}, extensions={IDEMPOTENT: True}).status_code == 200
+        assert len(sent) == 2
+
+    def test_before_retry_result_ends_retries(self):
+        client, sent = _client([httpx.ReadTimeout("slow")])
+        found = httpx.Response(200, json={"id": 9})
+        response = client.post("wp/v2/docs", json={}, extensions={BEFORE_RETRY: lambda: found})
+        assert response.json() == {"id": 9}
+        assert len(sent) == 1
+
+    def test_resends_when_before_retry_finds_nothing(self):
+        client, sent = _client([httpx.Response(502), httpx.Response(201)])
+        response = client.post("wp/v2/docs", json={}, extensions={BEFORE_RETRY: lambda: None})
+        assert response.status_code == 201
+        assert len(sent) == 2
+
+    def test_reports_each_retry(self):
+        retries: list[tuple[str, str, str]] = []
+        client, _ = _client(
+            [httpx.Response(503), httpx.ReadTimeout("slow"), httpx.Response(200)],
+            on_retry=lambda *args: retries.append(args),
+        )
+        client.get("wp/v2/tags")
+        assert retries == [("GET", "/wp/v2/tags", "503"), ("GET", "/wp/v2/tags", "ReadTimeout")]
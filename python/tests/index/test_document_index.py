@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.index import DocumentIndex
+
+DOC_KEY = "00000001-0000-7000-8000-000000000000"
+
+
+def _post(wordpress_id: str = "", document_key: str = DOC_KEY) -> frontmatter.Post:
+    return frontmatter.loads(
+        f"---\ndocument_key: {document_key}\nwordpress_id: {wordpress_id}\n---\nContent\n"
+    )
+
+
+class TestDocumentIndex:
+    def test_indexes_path_wordpress_id_and_content_type(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        path = tmp_path / "pages" / "about.md"
+        index.add(path, _post(wordpress_id="12"))
+        entry = index.get(DOC_KEY)
+        assert entry is not None
+        assert entry.path == path
+        assert entry.wordpress_id == 12
+        assert entry.content_type == "pages"
+
+    def test_missing_wordpress_id_is_none(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", _post())
+        assert index.get(DOC_KEY).wordpress_id is None
+
+    def test_non_integer_wordpress_id_is_none(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", _post(wordpress_id="pending"))
+        assert index.get(DOC_KEY).wordpress_id is None
+
+    def test_ignores_documents_without_key(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", frontmatter.loads("---\ntitle: T\n---\n"))
+        assert len(index) == 0
+
+    def test_content_type_is_none_outside_content_type_directory(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "misc" / "a.md", _post())
+        assert index.get(DOC_KEY).content_type is None
+
+    def test_lookup_accepts_uuid_or_string(self, tmp_path: Path):
+        from uuid import UUID
+
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", _post(wordpress_id="3"))
+        assert index.get(UUID(DOC_KEY)) == index.get(DOC_KEY)
+
+    def test_set_wordpress_id_updates_entry(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", _post())
+        index.set_wordpress_id(DOC_KEY, 44)
+        assert index.get(DOC_KEY).wordpress_id == 44
+
+    def test_set_wordpress_id_for_unknown_key_is_ignored(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.set_wordpress_id(DOC_KEY, 44)
+        assert index.get(DOC_KEY) is None
+
+    def test_remove_drops_entry(self, tmp_path: Path):
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "a.md", _post())
+        index.remove(DOC_KEY)
+        assert index.get(DOC_KEY) is None
+
+    def test_under_matches_a_file_or_everything_in_a_directory(self, tmp_path: Path):
+        other_key = "00000002-0000-7000-8000-000000000000"
+        index = DocumentIndex(tmp_path)
+        index.add(tmp_path / "docs" / "guide" / "a.md", _post())
+        index.add(tmp_path / "docs" / "guide.md", _post(document_key=other_key))
+
+        assert [key for key, _ in index.under(tmp_path / "docs" / "guide")] == [DOC_KEY]
+        assert [key for key, _ in index.under(tmp_path / "docs" / "guide.md")] == [other_key]
+        assert len(index.under(tmp_path / "docs")) == 2
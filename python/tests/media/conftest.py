@@ -0,0 +1,27 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from d2cms.config import D2CMSConfig
+from d2cms.http import make_client
+
+WP_BASE = "http://test-wp.test/wp-json/"
+
+
+@pytest.fixture
+def cfg(tmp_path: Path) -> D2CMSConfig:
+    return D2CMSConfig(
+        wp_api_root=WP_BASE,
+        wp_api_key="test-token",
+        wp_api_user="admin",
+        docs_dir=tmp_path,
+        auth_mode="token",
+    )
+
+
+@pytest.fixture
+def client(cfg: D2CMSConfig) -> Iterator[httpx.Client]:
+    with make_client(cfg) as client:
+        yield client
@@ -0,0 +1,115 @@
+import hashlib
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from d2cms.media import MediaCache, MediaLibrary
+from tests.media.conftest import WP_BASE
+
+UPLOADS = "https://test-wp.test/wp-content/uploads"
+
+
+def _image(path: Path, content: bytes = b"\x89PNG diagram") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def _uploaded(request: httpx.Request) -> httpx.Response:
+    name = request.headers["Content-Disposition"].split('filename="')[1].rstrip('"')
+    return httpx.Response(201, json={"id": 40, "source_url": f"{UPLOADS}/{name}"})
+
+
+def _library(client: httpx.Client, docs_dir: Path) -> MediaLibrary:
+    return MediaLibrary(client, docs_dir, MediaCache(docs_dir), workers=2)
+
+
+class TestMediaLibrary:
+    def test_uploads_a_referenced_image_and_rewrites_its_src(self, tmp_path, client):
+        image = _image(tmp_path / "docs" / "img" / "diagram.png")
+        digest = hashlib.sha256(image.read_bytes()).hexdigest()
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            upload = respx.post(f"{WP_BASE}wp/v2/media").mock(side_effect=_uploaded)
+            html = media.rewrite('<p><img src="./img/diagram.png" alt="d" /></p>', tmp_path / "docs" / "a.md")
+
+        assert html == f'<p><img src="{UPLOADS}/diagram-{digest[:16]}.png" alt="d" /></p>'
+        request = upload.calls.last.request
+        assert request.headers["Content-Type"] == "image/png"
+        assert request.content == image.read_bytes()
+
+    def test_identical_content_is_uploaded_once(self, tmp_path, client):
+        _image(tmp_path / "docs" / "one.png")
+        _image(tmp_path / "docs" / "sub" / "copy.png")
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            upload = respx.post(f"{WP_BASE}wp/v2/media").mock(side_effect=_uploaded)
+            first = media.rewrite('<img src="one.png">', tmp_path / "docs" / "a.md")
+            second = media.rewrite('<img src="../one.png"><img src="copy.png">', tmp_path / "docs" / "sub" / "b.md")
+        assert upload.call_count == 1
+        assert first.count(UPLOADS) == 1
+        assert second.count(UPLOADS) == 2
+
+    def test_unchanged_media_is_not_uploaded_again_in_a_later_run(self, tmp_path, client):
+        _image(tmp_path / "docs" / "one.png")
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/media").mock(side_effect=_uploaded)
+            first = media.rewrite('<img src="one.png">', tmp_path / "docs" / "a.md")
+
+        with respx.mock, _library(client, tmp_path) as media:
+            second = media.rewrite('<img src="one.png">', tmp_path / "docs" / "a.md")
+        assert second == first
+
+    def test_adopts_an_upload_wordpress_already_has(self, tmp_path, client):
+        image = _image(tmp_path / "docs" / "one.png")
+        tag = hashlib.sha256(image.read_bytes()).hexdigest()[:16]
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media", params={"search": tag}).mock(
+                return_value=httpx.Response(200, json=[{"id": 9, "source_url": f"{UPLOADS}/one-{tag}.png"}])
+            )
+            upload = respx.post(f"{WP_BASE}wp/v2/media")
+            html = media.rewrite('<img src="one.png">', tmp_path / "docs" / "a.md")
+        assert not upload.called
+        assert html == f'<img src="{UPLOADS}/one-{tag}.png">'
+
+    def test_leaves_other_references_alone(self, tmp_path, client):
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "other.md").write_text("doc")
+        html = (
+            '<img src="https://cdn.example.com/x.png"><img src="/abs.png"><img src="missing.png">'
+            '<a href="other.md">doc</a><a href="#section">here</a><img src="../../outside.png">'
+        )
+        _image(tmp_path.parent / "outside.png")
+        with respx.mock, _library(client, tmp_path) as media:
+            assert media.rewrite(html, tmp_path / "docs" / "a.md") == html
+
+    def test_links_to_attachments_keep_their_fragment(self, tmp_path, client):
+        _image(tmp_path / "docs" / "My Guide.pdf", b"%PDF-1.7")
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            upload = respx.post(f"{WP_BASE}wp/v2/media").mock(side_effect=_uploaded)
+            html = media.rewrite('<a href="My%20Guide.pdf#page=2">guide</a>', tmp_path / "docs" / "a.md")
+        assert 'filename="My-Guide-' in upload.calls.last.request.headers["Content-Disposition"]
+        assert html.startswith(f'<a href="{UPLOADS}/My-Guide-') and html.endswith('.pdf#page=2">guide</a>')
+
+    def test_references_digest_follows_referenced_content(self, tmp_path, client):
+        image = _image(tmp_path / "docs" / "img" / "diagram.png")
+        markdown = "![d](img/diagram.png) [site](https://example.com) [other](other.md)\n"
+        with _library(client, tmp_path) as media:
+            before = media.references_digest(markdown, tmp_path / "docs" / "a.md")
+            image.write_bytes(b"\x89PNG replaced")
+            after = media.references_digest(markdown, tmp_path / "docs" / "a.md")
+            assert media.references_digest("[site](https://example.com)\n", tmp_path / "docs" / "a.md") is None
+        assert before is not None and after is not None
+        assert before != after
+
+    def test_failed_upload_raises(self, tmp_path, client):
+        _image(tmp_path / "docs" / "one.png")
+        with respx.mock, _library(client, tmp_path) as media:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(413))
+            with pytest.raises(httpx.HTTPStatusError):
+                media.rewrite('<img src="one.png">', tmp_path / "docs" / "a.md")
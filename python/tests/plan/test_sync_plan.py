@@ -0,0 +1,37 @@
+from d2cms.plan import RequestEstimate, SyncPlan
+
+
+class TestRequestEstimate:
+    def test_total_counts_every_request(self):
+        estimate = RequestEstimate(post=3, delete=1, parent_lookup=2, tag_listing=1, tag_create=2)
+        assert estimate.total == 9
+
+    def test_batch_calls_replace_individual_writes(self):
+        estimate = RequestEstimate(post=30, delete=5, batch=2, parent_lookup=1)
+        assert estimate.total == 3
+
+
+class TestSyncPlan:
+    def test_counts_actions_per_content_type(self):
+        sync_plan = SyncPlan()
+        sync_plan.add("docs/a.md", "docs", "create")
+        sync_plan.add("docs/b.md", "docs", "skip")
+        sync_plan.add("pages/c.md", "pages", "create")
+        sync_plan.add("stray.md", None, "blocked", "not in a content type directory")
+
+        assert sync_plan.counts()["create"] == 2
+        by_type = sync_plan.counts_by_content_type()
+        assert list(by_type) == ["docs", "pages", "unknown"]
+        assert by_type["docs"]["skip"] == 1
+
+    def test_to_dict_lists_every_action(self):
+        sync_plan = SyncPlan()
+        sync_plan.add("docs/a.md", "docs", "delete")
+        sync_plan.requests.delete = 1
+
+        result = sync_plan.to_dict()
+        assert result["totals"] == {"create": 0, "update": 0, "delete": 1, "skip": 0, "blocked": 0}
+        assert result["requests"]["total"] == 1
+        assert result["documents"] == [
+            {"path": "docs/a.md", "content_type": "docs", "action": "delete", "reason": ""}
+        ]
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.cache import RenderCache
+from d2cms.docs import field_hashes, generate_doc_hash, render_key, to_html
+from d2cms.prepare import PreparedDocument, PrepareError, prepare_document, prepare_documents
+
+DOC = "---\ntitle: Doc {i}\nslug: doc-{i}\ndocument_hash: {hash}\n---\n\nHello **{i}**\n"
+
+
+def _write(docs_dir: Path, i: int, document_hash: str = "") -> Path:
+    file_path = docs_dir / "docs" / f"doc-{i}.md"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(DOC.format(i=i, hash=document_hash))
+    return file_path
+
+
+class TestPrepareDocument:
+    def test_hashes_and_renders_changed_document(self, tmp_path):
+        file_path = _write(tmp_path, 1)
+        prepared = prepare_document(file_path, tmp_path, force=False)
+        document = frontmatter.load(file_path)
+        assert prepared.document_hash == generate_doc_hash(document, Path("docs/doc-1.md"))
+        assert prepared.html == to_html(document, file_path, tmp_path)
+        assert prepared.render_key == render_key(document, file_path, tmp_path)
+
+    def test_does_not_render_document_with_matching_hash(self, tmp_path):
+        file_path = _write(tmp_path, 1)
+        current = prepare_document(file_path, tmp_path, force=False).document_hash
+        _write(tmp_path, 1, document_hash=current)
+        assert prepare_document(file_path, tmp_path, force=False).html is None
+
+    def test_force_renders_document_with_matching_hash(self, tmp_path):
+        file_path = _write(tmp_path, 1)
+        current = prepare_document(file_path, tmp_path, force=False).document_hash
+        _write(tmp_path, 1, document_hash=current)
+        assert prepare_document(file_path, tmp_path, force=True).html is not None
+
+    def test_does_not_render_document_whose_content_was_already_sent(self, tmp_path):
+        file_path = _write(tmp_path, 1, document_hash="v2:sha256:sent")
+        content = field_hashes(frontmatter.load(file_path), Path("docs/doc-1.md"))["content"]
+        file_path.write_text(file_path.read_text().replace("title: Doc 1", "title: Renamed"))
+        prepared = prepare_document(file_path, tmp_path, False, sent_content=("v2:sha256:sent", content))
+        assert not prepared.unchanged
+        assert prepared.html is None
+
+    def test_renders_document_whose_content_changed_since_sent(self, tmp_path):
+        file_path = _write(tmp_path, 1, document_hash="v2:sha256:sent")
+        content = field_hashes(frontmatter.load(file_path), Path("docs/doc-1.md"))["content"]
+        file_path.write_text(file_path.read_text().replace("Hello", "Goodbye"))
+        prepared = prepare_document(file_path, tmp_path, False, sent_content=("v2:sha256:sent", content))
+        assert prepared.html is not None
+
+
+class TestPrepareDocuments:
+    def test_yields_results_in_input_order(self, tmp_path):
+        files = [_write(tmp_path, i) for i in range(12)]
+        results = list(prepare_documents(files, tmp_path, force=False, jobs=2))
+        assert [path for path, _ in results] == files
+        assert all(isinstance(result, PreparedDocument) for _, result in results)
+        assert "<strong>11</strong>" in results[-1][1].html  # type: ignore[union-attr,operator]
+
+    def test_unreadable_file_becomes_prepare_error(self, tmp_path):
+        good = _write(tmp_path, 1)
+        bad = tmp_path / "docs" / "bad.md"
+        bad.write_text("---\ntitle: [unclosed\n---\n")
+        results = dict(prepare_documents([good, bad], tmp_path, force=False, jobs=2))
+        assert isinstance(results[good], PreparedDocument)
+        assert isinstance(results[bad], PrepareError)
+
+    def test_reuses_html_from_render_cache(self, tmp_path):
+        file_path = _write(tmp_path, 1)
+        document = frontmatter.load(file_path)
+        with RenderCache(tmp_path) as renders:
+            renders.put(render_key(document, file_path, tmp_path), "<p>cached</p>")
+
+        [(_, result)] = prepare_documents([file_path], tmp_path, False, jobs=2, render_cache_bytes=1 << 20)
+        assert isinstance(result, PreparedDocument)
+        assert result.html == "<p>cached</p>"
+        assert result.render_key is None
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+import respx
+
+from d2cms.remote import POSTS_PER_PAGE, ReconcileError, RemoteCatalog, RemotePost
+
+WP_BASE = "http://test-wp.test/wp-json/"
+
+
+@pytest.fixture
+def client():
+    with httpx.Client(base_url=WP_BASE) as client:
+        yield client
+
+
+def _post(wordpress_id: int, document_key: str | None, document_hash: str = "") -> dict[str, object]:
+    return {"id": wordpress_id, "meta": {"document_key": document_key, "document_hash": document_hash}}
+
+
+class TestRemoteCatalog:
+    def test_requests_only_the_fields_it_needs(self, client):
+        with respx.mock:
+            route = respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[], headers={"X-WP-TotalPages": "1"})
+            )
+            RemoteCatalog(client).load(["docs"])
+        params = route.calls.last.request.url.params
+        assert params["_fields"] == "id,meta.document_key,meta.document_hash"
+        assert params["status"] == "any"
+        assert params["per_page"] == str(POSTS_PER_PAGE)
+
+    def test_reads_every_page(self, client):
+        with respx.mock:
+            route = respx.get(f"{WP_BASE}wp/v2/docs").mock(side_effect=lambda request: httpx.Response(
+                200,
+                json=[_post(int(request.url.params["page"]), f"key-{request.url.params['page']}")],
+                headers={"X-WP-TotalPages": "3"},
+            ))
+            catalog = RemoteCatalog(client)
+            catalog.load(["docs"], workers=2)
+        assert route.call_count == 3
+        assert len(catalog) == 3
+        assert catalog.get("docs", "key-3") == RemotePost(3, None)
+
+    def test_stops_at_a_short_page_without_total_pages_header(self, client):
+        full_page = [_post(i, f"key-{i}") for i in range(POSTS_PER_PAGE)]
+        with respx.mock:
+            route = respx.get(f"{WP_BASE}wp/v2/pages").mock(side_effect=[
+                httpx.Response(200, json=full_page),
+                httpx.Response(200, json=[_post(500, "last")]),
+            ])
+            catalog = RemoteCatalog(client)
+            catalog.load(["pages"])
+        assert route.call_count == 2
+        assert len(catalog) == POSTS_PER_PAGE + 1
+
+    def test_keys_posts_by_content_type(self, client):
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(200, json=[_post(1, "k", "h")]))
+            respx.get(f"{WP_BASE}wp/v2/pages").mock(return_value=httpx.Response(200, json=[]))
+            catalog = RemoteCatalog(client)
+            catalog.load(["docs", "pages"])
+        assert catalog.get("docs", "k") == RemotePost(1, "h")
+        assert catalog.get("pages", "k") is None
+
+    def test_ignores_posts_without_document_key(self, client):
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[_post(1, None), {"id": 2}])
+            )
+            catalog = RemoteCatalog(client)
+            catalog.load(["docs"])
+        assert len(catalog) == 0
+
+    def test_duplicates_prefer_the_local_id_then_the_oldest(self, client):
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[_post(9, "k"), _post(4, "k"), _post(6, "k")])
+            )
+            catalog = RemoteCatalog(client)
+            catalog.load(["docs"])
+        assert catalog.get("docs", "k", wordpress_id=6).wordpress_id == 6
+        assert catalog.get("docs", "k").wordpress_id == 4
+
+    def test_raises_reconcile_error_when_listing_fails(self, client):
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(404, json={"code": "rest_no_route"}))
+            with pytest.raises(ReconcileError, match="wp/v2/docs"):
+                RemoteCatalog(client).load(["docs"])
+
+    def test_raises_reconcile_error_when_the_request_times_out(self, client):
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(side_effect=httpx.ReadTimeout("timed out"))
+            with pytest.raises(ReconcileError, match="wp/v2/docs"):
+                RemoteCatalog(client).load(["docs"])
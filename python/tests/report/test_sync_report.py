@@ -0,0 +1,98 @@
+import csv
+import json
+
+from d2cms.report import LATENCY_BUCKETS, ReportStream, SyncReport
+
+
+def _report() -> SyncReport:
+    report = SyncReport()
+    report.record_outcome("created", 2)
+    report.record_outcome("skipped")
+    report.record_phase("render", 0.25)
+    report.record_phase("render", 0.5)
+    report.record_request("POST", "wp/v2/docs/12", 200, 0.02)
+    report.record_request("POST", "wp/v2/docs/13", 500, 3.0)
+    report.record_request("GET", "wp/v2/tags", 200, 0.001)
+    return report
+
+
+class TestSyncReportMetrics:
+    def test_counts_outcomes(self):
+        assert _report().outcomes == {"created": 2, "skipped": 1}
+
+    def test_sums_phase_timings(self):
+        timing = _report().phases["render"]
+        assert (timing.seconds, timing.count) == (0.75, 2)
+
+    def test_timed_records_a_phase(self):
+        report = SyncReport()
+        with report.timed("hash"):
+            pass
+        assert report.phases["hash"].count == 1
+
+    def test_groups_requests_by_route_with_ids_collapsed(self):
+        endpoints = _report().endpoints
+        assert list(endpoints) == ["GET wp/v2/tags", "POST wp/v2/docs/:id"]
+        posts = endpoints["POST wp/v2/docs/:id"]
+        assert posts.count == 2
+        assert posts.statuses == {200: 1, 500: 1}
+        assert posts.buckets[LATENCY_BUCKETS.index(0.025)] == 1
+        assert posts.buckets[LATENCY_BUCKETS.index(5.0)] == 1
+
+    def test_writes_json(self, tmp_path):
+        path = tmp_path / "run.json"
+        _report().write_json(path)
+        data = json.loads(path.read_text())
+        assert data["documents"] == {"created": 2, "updated": 0, "skipped": 1, "deleted": 0}
+        assert data["endpoints"]["POST wp/v2/docs/:id"]["statuses"] == {"200": 1, "500": 1}
+
+    def test_writes_prometheus_textfile(self, tmp_path):
+        path = tmp_path / "d2cms_sync.prom"
+        _report().write_prometheus(path)
+        text = path.read_text()
+        assert 'd2cms_sync_documents{outcome="created"} 2' in text
+        assert 'd2cms_sync_phase_seconds{phase="render"} 0.750000' in text
+        labels = 'method="POST",route="wp/v2/docs/:id"'
+        assert f'd2cms_sync_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'd2cms_sync_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"d2cms_sync_request_duration_seconds_count{{{labels}}} 2" in text
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestReportStream:
+    def test_file_is_created_with_the_first_row(self, tmp_path):
+        path = tmp_path / "results" / "run.csv"
+        with ReportStream(path) as stream:
+            report = SyncReport(stream)
+            report.record_document("created", "docs/a.md", "docs", 1)
+            assert not path.exists()
+            report.record_failure("docs/b.md", "docs", None, RuntimeError("boom"))
+        with path.open() as f:
+            rows = list(csv.DictReader(f))
+        assert rows == [{"doc_path": "docs/b.md", "content_type": "docs", "wordpress_id": "", "error_summary": "boom"}]
+
+    def test_failures_are_counted_but_not_kept(self, tmp_path):
+        with ReportStream(tmp_path / "run.csv") as stream:
+            report = SyncReport(stream)
+            report.record_failure("docs/a.md", "docs", 1, RuntimeError("boom"))
+        assert report.has_failures
+        assert report.failure_count == 1
+        assert report.to_dict()["failures"] == []
+
+    def test_include_outcomes_streams_every_document_as_jsonl(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with ReportStream(path, "jsonl", include_outcomes=True) as stream:
+            report = SyncReport(stream)
+            report.record_document("skipped", "docs/a.md", "docs", 3)
+            report.record_failure("docs/b.md", "docs", None, RuntimeError("boom"))
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(row["doc_path"], row["outcome"]) for row in rows] == [("docs/a.md", "skipped"), ("docs/b.md", "failed")]
+        assert report.outcomes == {"skipped": 1}
+
+    def test_flushes_every_n_rows(self, tmp_path):
+        path = tmp_path / "run.jsonl"
+        with ReportStream(path, "jsonl", include_outcomes=True, flush_every=2, flush_interval=3600) as stream:
+            report = SyncReport(stream)
+            report.record_document("created", "docs/a.md", "docs", 1)
+            report.record_document("created", "docs/b.md", "docs", 2)
+            assert len(path.read_text().splitlines()) == 2
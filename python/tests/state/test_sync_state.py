@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from d2cms.state import STATE_DIR, STATE_FILE, SyncState
+
+DOC_KEY = "00000001-0000-7000-8000-000000000000"
+
+
+def _aged_file(tmp_path: Path, name: str = "doc.md", content: str = "content") -> Path:
+    """A file last modified well before it is recorded, so its fingerprint is trusted."""
+    f = tmp_path / name
+    f.write_text(content)
+    old = time.time_ns() - 60_000_000_000
+    os.utime(f, ns=(old, old))
+    return f
+
+
+class TestSyncState:
+    def test_unknown_file_is_not_skipped(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        assert SyncState(tmp_path).lookup(doc, doc.stat()) is None
+
+    def test_recorded_file_with_same_fingerprint_is_returned(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash")
+        known = state.lookup(doc, doc.stat())
+        assert known is not None
+        assert known.document_key == DOC_KEY
+        assert known.wordpress_id == 12
+        assert known.document_hash == "hash"
+
+    def test_modified_file_is_not_returned(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash")
+        doc.write_text("changed content")
+        assert state.lookup(doc, doc.stat()) is None
+
+    def test_recently_modified_file_is_not_trusted(self, tmp_path):
+        doc = tmp_path / "fresh.md"
+        doc.write_text("content")
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash")
+        assert state.lookup(doc, doc.stat()) is None
+
+    def test_does_not_record_file_changed_since_it_was_read(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.lookup(doc, doc.stat())
+        doc.write_text("edited during the run")
+        state.record(doc, DOC_KEY, 12, "hash")
+        assert len(state) == 0
+
+    def test_rewritten_file_is_recorded_with_new_fingerprint(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.lookup(doc, doc.stat())
+        doc.write_text("written back by sync")
+        state.record(doc, DOC_KEY, 12, "hash", rewritten=True)
+        assert len(state) == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash")
+        assert (tmp_path / STATE_DIR / STATE_FILE).exists()
+        assert SyncState(tmp_path).lookup(doc, doc.stat()) is not None
+
+    def test_does_not_create_store_when_nothing_changed(self, tmp_path):
+        with SyncState(tmp_path):
+            pass
+        assert not (tmp_path / STATE_DIR).exists()
+
+    def test_forget_removes_persisted_row(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash")
+        with SyncState(tmp_path) as state:
+            state.forget(doc)
+        assert SyncState(tmp_path).lookup(doc, doc.stat()) is None
+
+    def test_rescan_discards_existing_rows(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash")
+        with SyncState(tmp_path, rescan=True) as state:
+            assert state.lookup(doc, doc.stat()) is None
+        assert len(SyncState(tmp_path)) == 0
+
+    def test_deleted_store_starts_empty(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash")
+        (tmp_path / STATE_DIR / STATE_FILE).unlink()
+        assert SyncState(tmp_path).lookup(doc, doc.stat()) is None
+
+    def test_corrupt_store_is_ignored(self, tmp_path):
+        store = tmp_path / STATE_DIR / STATE_FILE
+        store.parent.mkdir()
+        store.write_bytes(b"not a sqlite database at all" * 100)
+        assert len(SyncState(tmp_path)) == 0
+
+    def test_recorded_trusts_a_just_written_file(self, tmp_path):
+        doc = tmp_path / "doc.md"
+        doc.write_text("content")
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash", rewritten=True)
+        assert state.recorded(doc, doc.stat())
+        doc.write_text("edited content")
+        assert not state.recorded(doc, doc.stat())
+
+    def test_flush_persists_and_keeps_state_usable(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash")
+        state.flush()
+        assert len(SyncState(tmp_path)) == 1
+
+        state.forget(doc)
+        state.flush()
+        assert len(SyncState(tmp_path)) == 0
+
+    def test_field_hashes_are_found_by_key_at_the_same_hash(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash", field_hashes={"content": "c", "parent": "p"})
+        state = SyncState(tmp_path)
+        assert state.field_hashes(DOC_KEY, "hash") == {"content": "c", "parent": "p"}
+        assert state.field_hashes(DOC_KEY, "other hash") is None
+        assert state.field_hashes("unknown key", "hash") is None
+
+    def test_field_hashes_follow_a_moved_file(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        state = SyncState(tmp_path)
+        state.record(doc, DOC_KEY, 12, "hash", field_hashes={"content": "c"})
+        moved = _aged_file(tmp_path, "moved.md")
+        state.record(moved, DOC_KEY, 12, "new hash", field_hashes={"content": "d"})
+        assert state.field_hashes(DOC_KEY, "new hash") == {"content": "d"}
+
+    def test_sent_content_survives_the_file_changing(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        with SyncState(tmp_path) as state:
+            state.record(doc, DOC_KEY, 12, "hash", field_hashes={"content": "c"})
+        doc.write_text("edited\n")
+        state = SyncState(tmp_path)
+        assert state.sent_content(doc) == ("hash", "c")
+        assert state.sent_content(tmp_path / "unknown.md") is None
+
+    def test_version_1_store_is_migrated(self, tmp_path):
+        doc = _aged_file(tmp_path)
+        store = tmp_path / STATE_DIR / STATE_FILE
+        store.parent.mkdir()
+        conn = sqlite3.connect(store)
+        conn.execute(
+            "CREATE TABLE files (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, document_key TEXT, wordpress_id INTEGER, document_hash TEXT NOT NULL, "
+            "recorded_ns INTEGER NOT NULL)"
+        )
+        stat = doc.stat()
+        conn.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ("doc.md", stat.st_mtime_ns, stat.st_size, stat.st_ino, DOC_KEY, 12, "hash", time.time_ns()),
+        )
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+
+        state = SyncState(tmp_path)
+        assert state.lookup(doc, doc.stat()) is not None
+        assert state.field_hashes(DOC_KEY, "hash") is None
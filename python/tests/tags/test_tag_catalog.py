@@ -0,0 +1,170 @@
+import json
+import threading
+
+import httpx
+import pytest
+import respx
+
+from d2cms.tags import TagCatalog
+
+WP_BASE = "http://test-wp.test/wp-json/"
+
+
+def _tag(tag_id: int, name: str, slug: str) -> dict[str, object]:
+    return {"id": tag_id, "name": name, "slug": slug}
+
+
+class TestTagCatalog:
+    def test_returns_empty_list_without_requests_for_no_tags(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            assert TagCatalog(client).resolve([]) == []
+
+    def test_resolves_existing_tag(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(7, "python", "python")])
+            )
+            assert TagCatalog(client).resolve(["python"]) == [7]
+
+    def test_requests_compact_paginated_listing(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(7, "python", "python")])
+            )
+            TagCatalog(client).resolve(["python"])
+        params = route.calls[0].request.url.params
+        assert params["per_page"] == "100"
+        assert params["page"] == "1"
+        assert params["_fields"] == "id,name,slug"
+
+    def test_loads_catalog_once_per_run(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(7, "python", "python")])
+            )
+            catalog = TagCatalog(client)
+            for _ in range(5):
+                catalog.resolve(["python"])
+        assert route.call_count == 1
+
+    def test_follows_total_pages_header(self):
+        def _page(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            return httpx.Response(
+                200,
+                json=[_tag(page, f"tag-{page}", f"tag-{page}")],
+                headers={"X-WP-TotalPages": "3"},
+            )
+
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/tags").mock(side_effect=_page)
+            result = TagCatalog(client).resolve(["tag-3", "tag-1"])
+        assert route.call_count == 3
+        assert result == [3, 1]
+
+    def test_stops_on_short_page_without_header(self):
+        full_page = [_tag(i, f"tag-{i}", f"tag-{i}") for i in range(100)]
+
+        def _page(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json=full_page if page == 1 else [_tag(500, "last", "last")])
+
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/tags").mock(side_effect=_page)
+            assert TagCatalog(client).resolve(["last"]) == [500]
+        assert route.call_count == 2
+
+    def test_matches_names_case_insensitively(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(4, "Python", "python")])
+            )
+            assert TagCatalog(client).resolve(["PYTHON", "python"]) == [4, 4]
+
+    def test_matches_by_slug(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(9, "Getting Started", "getting-started")])
+            )
+            assert TagCatalog(client).resolve(["getting-started"]) == [9]
+
+    def test_matches_html_escaped_names(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(2, "Q&amp;A", "qa-2")])
+            )
+            assert TagCatalog(client).resolve(["Q&A"]) == [2]
+
+    def test_creates_tag_when_not_found(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(201, json=_tag(99, "new-tag", "new-tag"))
+            )
+            assert TagCatalog(client).resolve(["new-tag"]) == [99]
+
+    def test_resolves_numeric_tags_by_their_text(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[_tag(7, "2024", "2024")])
+            )
+            create = respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(201, json=_tag(8, "3.11", "3-11"))
+            )
+            assert TagCatalog(client).resolve([2024, 3.11]) == [7, 8]  # type: ignore[list-item]
+        assert json.loads(create.calls.last.request.content) == {"name": "3.11"}
+
+    def test_created_tag_is_reused_without_another_create(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(200, json=[]))
+            create = respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(201, json=_tag(99, "New Tag", "new-tag"))
+            )
+            catalog = TagCatalog(client)
+            assert catalog.resolve(["New Tag"]) == [99]
+            assert catalog.resolve(["new tag", "New Tag"]) == [99, 99]
+        assert create.call_count == 1
+
+    def test_concurrent_resolves_create_each_tag_once(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(200, json=[]))
+            create = respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(201, json=_tag(11, "shared", "shared"))
+            )
+            catalog = TagCatalog(client)
+            results: list[list[int]] = []
+            threads = [
+                threading.Thread(target=lambda: results.append(catalog.resolve(["shared"])))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert create.call_count == 1
+        assert results == [[11]] * 8
+
+    def test_uses_term_id_when_tag_already_exists_remotely(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(
+                    400, json={"code": "term_exists", "data": {"status": 400, "term_id": 31}}
+                )
+            )
+            assert TagCatalog(client).resolve(["raced"]) == [31]
+
+    def test_raises_on_failed_tag_creation(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(403, json={"code": "rest_forbidden"})
+            )
+            with pytest.raises(httpx.HTTPStatusError):
+                TagCatalog(client).resolve(["bad-tag"])
+
+    def test_raises_on_failed_listing(self):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            respx.get(f"{WP_BASE}wp/v2/tags").mock(return_value=httpx.Response(500, json={}))
+            with pytest.raises(httpx.HTTPStatusError):
+                TagCatalog(client).resolve(["python"])
@@ -0,0 +1,24 @@
+from d2cms.tags import wp_slug
+
+
+class TestWpSlug:
+    def test_lowercases_and_hyphenates_spaces(self):
+        assert wp_slug("Getting Started") == "getting-started"
+
+    def test_collapses_repeated_separators(self):
+        assert wp_slug("  a  -- b ") == "a-b"
+
+    def test_strips_accents(self):
+        assert wp_slug("Café") == "cafe"
+
+    def test_converts_periods_to_hyphens(self):
+        assert wp_slug("v1.2") == "v1-2"
+
+    def test_drops_punctuation(self):
+        assert wp_slug("C++ & Rust!") == "c-rust"
+
+    def test_decodes_html_entities(self):
+        assert wp_slug("Q&amp;A") == "qa"
+
+    def test_percent_encodes_non_latin_characters(self):
+        assert wp_slug("日本") == "%e6%97%a5%e6%9c%ac"
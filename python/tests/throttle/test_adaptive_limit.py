@@ -0,0 +1,72 @@
+import threading
+from unittest.mock import patch
+
+from d2cms.throttle import AdaptiveLimit
+
+
+def _round(limit: AdaptiveLimit, latency: float = 0.1, congested: bool = False) -> None:
+    limit.acquire()
+    limit.release(latency, congested)
+
+
+class TestAdaptiveLimit:
+    def test_starts_at_maximum(self):
+        assert AdaptiveLimit(8).limit == 8
+
+    def test_halves_on_congestion(self):
+        limit = AdaptiveLimit(8)
+        _round(limit, congested=True)
+        assert limit.limit == 4
+        assert (limit.lowest, limit.decreases) == (4, 1)
+
+    def test_never_drops_below_minimum(self):
+        limit = AdaptiveLimit(4, minimum=2)
+        clock = [0.0]
+        with patch("d2cms.throttle.time.monotonic", side_effect=lambda: clock[0]):
+            for _ in range(5):
+                clock[0] += 10
+                _round(limit, congested=True)
+        assert limit.limit == 2
+
+    def test_burst_of_throttled_responses_counts_once(self):
+        limit = AdaptiveLimit(8)
+        _round(limit, latency=1.0)  # establishes a 1s baseline
+        with patch("d2cms.throttle.time.monotonic", return_value=50.0):
+            for _ in range(3):
+                _round(limit, latency=1.0, congested=True)
+        assert limit.limit == 4
+        assert limit.decreases == 1
+
+    def test_slow_response_counts_as_congestion(self):
+        limit = AdaptiveLimit(8)
+        _round(limit, latency=0.1)
+        _round(limit, latency=0.5)
+        assert limit.limit == 4
+
+    def test_recovers_additively(self):
+        limit = AdaptiveLimit(8)
+        _round(limit, congested=True)
+        for _ in range(4):
+            _round(limit)
+        assert limit.limit == 4
+        _round(limit)
+        assert limit.limit == 5
+        for _ in range(100):
+            _round(limit)
+        assert limit.limit == 8
+
+    def test_blocks_requests_over_the_limit(self):
+        limit = AdaptiveLimit(1)
+        limit.acquire()
+        acquired = threading.Event()
+
+        def _second() -> None:
+            limit.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=_second)
+        thread.start()
+        assert not acquired.wait(0.05)
+        limit.release(0.1, congested=False)
+        assert acquired.wait(1)
+        thread.join()
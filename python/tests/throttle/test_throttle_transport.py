@@ -0,0 +1,43 @@
+import httpx
+import pytest
+
+from d2cms.throttle import Throttle, ThrottleTransport
+
+
+def _client(throttle: Throttle, handler) -> httpx.Client:
+    return httpx.Client(
+        base_url="http://wp.test/", transport=ThrottleTransport(httpx.MockTransport(handler), throttle)
+    )
+
+
+class TestThrottleTransport:
+    def test_429_lowers_concurrency_and_is_counted(self):
+        throttle = Throttle(max_rps=None, max_concurrency=8)
+        _client(throttle, lambda request: httpx.Response(429)).get("wp/v2/tags")
+        summary = throttle.summary()
+        assert (summary.throttled, summary.limit, summary.decreases) == (1, 4, 1)
+
+    def test_transport_error_lowers_concurrency_without_counting_as_throttled(self):
+        def _fail(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("slow")
+
+        throttle = Throttle(max_rps=None, max_concurrency=8)
+        with pytest.raises(httpx.ReadTimeout):
+            _client(throttle, _fail).get("wp/v2/tags")
+        summary = throttle.summary()
+        assert (summary.throttled, summary.limit) == (0, 4)
+
+    def test_rate_limit_waits_are_recorded(self):
+        throttle = Throttle(max_rps=1000, max_concurrency=8)
+        client = _client(throttle, lambda request: httpx.Response(200))
+        for _ in range(3):
+            client.get("wp/v2/tags")
+        summary = throttle.summary()
+        assert summary.max_rps == 1000
+        assert summary.rate_waits >= 1
+
+    def test_adaptive_concurrency_can_be_disabled(self):
+        throttle = Throttle(max_rps=None, max_concurrency=8, adaptive=False)
+        _client(throttle, lambda request: httpx.Response(429)).get("wp/v2/tags")
+        summary = throttle.summary()
+        assert (summary.limit, summary.throttled) == (None, 1)
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from d2cms.throttle import TokenBucket
+
+
+class TestTokenBucket:
+    def test_first_request_is_not_delayed(self):
+        with patch("d2cms.throttle.time.sleep") as sleep:
+            assert TokenBucket(rate=5).acquire() == 0.0
+        sleep.assert_not_called()
+
+    def test_spaces_back_to_back_requests(self):
+        with (
+            patch("d2cms.throttle.time.monotonic", return_value=100.0),
+            patch("d2cms.throttle.time.sleep") as sleep,
+        ):
+            bucket = TokenBucket(rate=4)
+            waits = [bucket.acquire() for _ in range(3)]
+        assert waits == [0.0, 0.25, 0.5]
+        assert [c.args[0] for c in sleep.call_args_list] == [0.25, 0.5]
+
+    def test_refills_over_time(self):
+        clock = [100.0]
+        with (
+            patch("d2cms.throttle.time.monotonic", side_effect=lambda: clock[0]),
+            patch("d2cms.throttle.time.sleep"),
+        ):
+            bucket = TokenBucket(rate=2)
+            bucket.acquire()
+            clock[0] += 0.5
+            assert bucket.acquire() == 0.0
+
+    def test_burst_allows_immediate_requests(self):
+        with (
+            patch("d2cms.throttle.time.monotonic", return_value=100.0),
+            patch("d2cms.throttle.time.sleep"),
+        ):
+            bucket = TokenBucket(rate=1, burst=3)
+            assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from d2cms.config import D2CMSConfig
+from d2cms.walk import IGNORE_FILE, TreeFilter, walk_markdown
+
+
+def _write(path: Path, content: str = "content") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _walk(root: Path, tree_filter: TreeFilter | None = None, threads: int = 1) -> list[str]:
+    return [
+        path.relative_to(root).as_posix()
+        for path, _ in walk_markdown(root, tree_filter or TreeFilter(root), threads)
+    ]
+
+
+class TestWalkMarkdown:
+    def test_yields_only_markdown_files(self, tmp_path):
+        _write(tmp_path / "docs" / "a.md")
+        _write(tmp_path / "docs" / ".DS_Store")
+        _write(tmp_path / "docs" / "diagram.png")
+        _write(tmp_path / "docs" / ".a.md.swp")
+        assert _walk(tmp_path) == ["docs/a.md"]
+
+    def test_files_come_before_subdirectories_depth_first(self, tmp_path):
+        for name in ("docs/b.md", "docs/a/z.md", "docs/a/y/x.md", "docs/c.md", "docs/d/w.md"):
+            _write(tmp_path / name)
+        assert _walk(tmp_path) == ["docs/b.md", "docs/c.md", "docs/a/z.md", "docs/a/y/x.md", "docs/d/w.md"]
+
+    def test_prefetching_keeps_the_same_order(self, tmp_path):
+        for n in range(30):
+            _write(tmp_path / "docs" / f"dir-{n:02}" / f"sub-{n % 3}" / f"doc-{n}.md")
+        assert _walk(tmp_path, threads=4) == _walk(tmp_path)
+
+    def test_yields_each_files_stat(self, tmp_path):
+        doc = _write(tmp_path / "docs" / "a.md", "twelve bytes")
+        [(path, stat)] = walk_markdown(tmp_path, TreeFilter(tmp_path))
+        assert path == doc
+        assert (stat.st_size, stat.st_ino) == (12, doc.stat().st_ino)
+
+    def test_deep_trees_do_not_recurse(self, tmp_path):
+        deep = tmp_path.joinpath(*["d"] * 200)
+        doc = _write(deep / "a.md")
+        assert [path for path, _ in walk_markdown(tmp_path, TreeFilter(tmp_path))] == [doc]
+
+    def test_skips_directories_d2cms_writes(self, tmp_path):
+        _write(tmp_path / ".d2cms" / "stray.md")
+        _write(tmp_path / "d2cms-sync-results" / "report.md")
+        assert _walk(tmp_path) == []
+
+
+class TestTreeFilter:
+    def test_reads_gitignore_style_rules(self, tmp_path):
+        cfg = D2CMSConfig(
+            wp_api_root="http://test-wp.test/wp-json/",
+            wp_api_key="test-token",
+            wp_api_user="admin",
+            docs_dir=tmp_path,
+            auth_mode="token",
+        )
+        _write(cfg.docs_dir / IGNORE_FILE, "# drafts stay local\ndrafts/\n*.draft.md\n!keep.draft.md\n/docs/private.md\n")
+        for name in (
+            "docs/a.md", "docs/drafts/b.md", "docs/c.draft.md", "docs/keep.draft.md",
+            "docs/private.md", "pages/docs/private.md",
+        ):
+            _write(cfg.docs_dir / name)
+        assert sorted(_walk(cfg.docs_dir, TreeFilter.from_config(cfg))) == [
+            "docs/a.md", "docs/keep.draft.md", "pages/docs/private.md",
+        ]
+
+    def test_exclude_globs_follow_the_ignore_file(self, tmp_path):
+        _write(tmp_path / "docs" / "a.md")
+        _write(tmp_path / "docs" / "old" / "b.md")
+        tree_filter = TreeFilter(tmp_path, exclude=["docs/old"])
+        assert _walk(tmp_path, tree_filter) == ["docs/a.md"]
+
+    def test_include_globs_keep_matching_files_and_directories(self, tmp_path):
+        for name in ("docs/a.md", "docs/guides/b.md", "docs/guides/deep/c.md", "pages/d.md"):
+            _write(tmp_path / name)
+        tree_filter = TreeFilter(tmp_path, include=["docs/guides", "pages/*.md"])
+        assert _walk(tmp_path, tree_filter) == ["docs/guides/b.md", "docs/guides/deep/c.md", "pages/d.md"]
+
+    def test_double_star_matches_any_depth(self, tmp_path):
+        tree_filter = TreeFilter(tmp_path, exclude=["docs/**/internal-*.md"])
+        assert not tree_filter.allows(tmp_path / "docs" / "internal-a.md")
+        assert not tree_filter.allows(tmp_path / "docs" / "x" / "y" / "internal-b.md")
+        assert tree_filter.allows(tmp_path / "docs" / "x" / "public.md")
+
+    def test_allows_checks_every_directory_above_a_path(self, tmp_path):
+        tree_filter = TreeFilter(tmp_path, exclude=["drafts/"])
+        assert not tree_filter.allows(tmp_path / "docs" / "drafts" / "deep" / "a.md")
+        assert not tree_filter.allows(tmp_path / "d2cms-sync-results" / "a.md")
+        assert not tree_filter.allows(tmp_path.parent / "elsewhere.md")
+        assert tree_filter.allows(tmp_path / "docs" / "a.md")
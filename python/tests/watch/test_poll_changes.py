@@ -0,0 +1,63 @@
+import threading
+from pathlib import Path
+
+from d2cms.state import STATE_DIR
+from d2cms.watch import _diff, poll_changes, snapshot
+
+
+def _write(path: Path, content: str = "content") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+class TestSnapshot:
+    def test_finds_markdown_files_outside_ignored_dirs(self, tmp_path):
+        doc = _write(tmp_path / "docs" / "guide" / "a.md")
+        _write(tmp_path / "docs" / "notes.txt")
+        _write(tmp_path / STATE_DIR / "stray.md")
+        _write(tmp_path / "d2cms-sync-results" / "report.md")
+        assert set(snapshot(tmp_path)) == {doc}
+
+    def test_diff_reports_added_modified_and_removed(self, tmp_path):
+        kept = _write(tmp_path / "kept.md")
+        edited = _write(tmp_path / "edited.md")
+        removed = _write(tmp_path / "removed.md")
+        before = snapshot(tmp_path)
+
+        edited.write_text("a longer edit")
+        removed.unlink()
+        added = _write(tmp_path / "added.md")
+
+        changed = _diff(before, snapshot(tmp_path))
+        assert changed == {edited, removed, added}
+        assert kept not in changed
+
+
+class TestPollChanges:
+    def test_yields_changes_since_baseline_on_first_scan(self, tmp_path):
+        doc = _write(tmp_path / "a.md")
+        baseline = snapshot(tmp_path)
+        doc.write_text("edited before watching")
+
+        stop = threading.Event()
+        changes = poll_changes(tmp_path, interval=0.01, debounce=0.01, stop=stop, baseline=baseline)
+        assert next(changes) == {doc}
+
+    def test_coalesces_a_burst_into_one_set(self, tmp_path):
+        first = _write(tmp_path / "a.md")
+        baseline = snapshot(tmp_path)
+        first.write_text("first save")
+        # Lands while the first change is being debounced
+        second_save = threading.Timer(0.05, _write, args=(tmp_path / "b.md",))
+        second_save.start()
+
+        stop = threading.Event()
+        changes = poll_changes(tmp_path, interval=0.01, debounce=0.2, stop=stop, baseline=baseline)
+        assert next(changes) == {first, tmp_path / "b.md"}
+        second_save.join()
+
+    def test_stops_when_event_is_set(self, tmp_path):
+        stop = threading.Event()
+        stop.set()
+        assert list(poll_changes(tmp_path, interval=0.01, debounce=0.01, stop=stop)) == []
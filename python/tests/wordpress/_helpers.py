@@ -16,6 +16,26 @@ def _write_doc(tmp_path: Path, content: str, name: str = "test.md") -> Path:
     return f
 
 
+def _doc(
+    tmp_path: Path,
+    relative: str,
+    document_key: str,
+    parent_key: str = "",
+    wordpress_id: int | str = "",
+    tags: str = "[]",
+    deprecated: bool = False,
+) -> Path:
+    """A doc at relative (e.g. "docs/parent/child.md"), titled and slugged after its file name."""
+    slug = relative.rsplit("/", 1)[-1].removesuffix(".md")
+    return _write_doc(
+        tmp_path,
+        f"---\ndocument_key: {document_key}\ntitle: {slug}\nslug: {slug}\n"
+        f"parent_key: {parent_key}\ntags: {tags}\nwordpress_id: {wordpress_id}\n"
+        f"document_hash: \ndeprecated: {str(deprecated).lower()}\n---\n\nBody of {slug}\n",
+        relative,
+    )
+
+
 def _new_doc(tmp_path: Path, name: str = "test.md") -> Path:
     """A doc that has never been synced (no wordpress_id, no hash)."""
     return _write_doc(
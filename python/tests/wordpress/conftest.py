@@ -1,9 +1,16 @@
+from collections.abc import Iterator
 from pathlib import Path
 
+import httpx
 import pytest
 
 from d2cms.config import D2CMSConfig
+from d2cms.http import make_client
+from d2cms.index import DocumentIndex
 from d2cms.report import SyncReport
+from d2cms.state import SyncState
+from d2cms.tags import TagCatalog
+from d2cms.wordpress import SyncContext
 
 WP_BASE = "http://test-wp.test/wp-json/"
 
@@ -22,3 +29,21 @@ def cfg(tmp_path: Path) -> D2CMSConfig:
 @pytest.fixture
 def report() -> SyncReport:
     return SyncReport()
+
+
+@pytest.fixture
+def client(cfg: D2CMSConfig) -> Iterator[httpx.Client]:
+    with make_client(cfg) as client:
+        yield client
+
+
+@pytest.fixture
+def ctx(cfg: D2CMSConfig, report: SyncReport, client: httpx.Client) -> SyncContext:
+    return SyncContext(
+        cfg=cfg,
+        report=report,
+        client=client,
+        tags=TagCatalog(client),
+        index=DocumentIndex(cfg.docs_dir),
+        state=SyncState(cfg.docs_dir),
+    )
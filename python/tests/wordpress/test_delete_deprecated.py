@@ -0,0 +1,84 @@
+import dataclasses
+
+import frontmatter
+import httpx
+import respx
+
+from d2cms.wordpress import _delete_deprecated, _sync_document, sync
+from tests.wordpress._helpers import DOC_KEY, PARENT_KEY, WP_BASE, _doc, _write_doc
+
+
+class TestDeleteDeprecated:
+    def test_deletes_are_queued_until_the_delete_phase(self, tmp_path, ctx):
+        doc_file = _doc(tmp_path, "docs/old.md", DOC_KEY, wordpress_id=42, deprecated=True)
+        with respx.mock:
+            route = respx.delete(f"{WP_BASE}wp/v2/docs/42").mock(
+                return_value=httpx.Response(200, json={"id": 42, "status": "trash"})
+            )
+            _sync_document(doc_file, ctx)
+            assert not route.called
+            _delete_deprecated(ctx, workers=1)
+        assert route.called
+        assert "force" not in route.calls.last.request.url.params
+        assert not doc_file.exists()
+        assert ctx.deletes == []
+
+    def test_force_mode_bypasses_the_trash(self, tmp_path, ctx):
+        ctx.cfg = dataclasses.replace(ctx.cfg, delete_mode="force")
+        doc_file = _doc(tmp_path, "docs/old.md", DOC_KEY, wordpress_id=42, deprecated=True)
+        with respx.mock:
+            route = respx.delete(f"{WP_BASE}wp/v2/docs/42").mock(
+                return_value=httpx.Response(200, json={"deleted": True, "previous": {"id": 42}})
+            )
+            _sync_document(doc_file, ctx)
+            _delete_deprecated(ctx, workers=1)
+        assert route.calls.last.request.url.params["force"] == "true"
+        assert not doc_file.exists()
+
+    def test_failed_delete_keeps_the_file(self, tmp_path, ctx, report):
+        kept = _doc(tmp_path, "docs/kept.md", DOC_KEY, wordpress_id=42, deprecated=True)
+        gone = _doc(tmp_path, "pages/gone.md", PARENT_KEY, wordpress_id=43, deprecated=True)
+        with respx.mock:
+            respx.delete(f"{WP_BASE}wp/v2/docs/42").mock(
+                return_value=httpx.Response(403, json={"code": "rest_forbidden"})
+            )
+            respx.delete(f"{WP_BASE}wp/v2/pages/43").mock(return_value=httpx.Response(200, json={"id": 43}))
+            for doc_file in (kept, gone):
+                _sync_document(doc_file, ctx)
+            _delete_deprecated(ctx, workers=2)
+        assert report.failure_count == 1
+        assert kept.exists()
+        assert not gone.exists()
+
+    def test_already_removed_post_counts_as_deleted(self, tmp_path, ctx, report):
+        doc_file = _doc(tmp_path, "docs/old.md", DOC_KEY, wordpress_id=42, deprecated=True)
+        with respx.mock:
+            respx.delete(f"{WP_BASE}wp/v2/docs/42").mock(
+                return_value=httpx.Response(410, json={"code": "rest_already_trashed"})
+            )
+            _sync_document(doc_file, ctx)
+            _delete_deprecated(ctx, workers=1)
+        assert not report.has_failures
+        assert not doc_file.exists()
+
+    def test_sync_deletes_after_writing_the_rest(self, tmp_path, cfg):
+        doc_file = _doc(tmp_path, "docs/archived.md", DOC_KEY, wordpress_id=42, deprecated=True) # walked before new.md
+        child = _write_doc(
+            tmp_path / "docs",
+            "---\ndocument_key: 00000002-0000-7000-8000-000000000000\ntitle: New\nslug: new\n"
+            "parent_key: \ntags: []\nwordpress_id: \ndocument_hash: \ndeprecated: false\n---\nContent\n",
+            "new.md",
+        )
+        order = []
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                side_effect=lambda request: order.append("post") or httpx.Response(201, json={"id": 7})
+            )
+            respx.delete(f"{WP_BASE}wp/v2/docs/42").mock(
+                side_effect=lambda request: order.append("delete") or httpx.Response(200, json={"id": 42})
+            )
+            report = sync(cfg, workers=4)
+        assert not report.has_failures
+        assert order == ["post", "delete"]
+        assert not doc_file.exists()
+        assert frontmatter.load(child).metadata["wordpress_id"] == 7
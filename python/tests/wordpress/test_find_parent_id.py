@@ -1,10 +1,13 @@
+from pathlib import Path
 from uuid import UUID
 
+import frontmatter
 import httpx
 import pytest
 import respx
 
 from d2cms.docs import D2CMSFrontmatter
+from d2cms.index import DocumentIndex
 from d2cms.wordpress import ParentNotFoundError, _find_parent_id
 from tests.wordpress._helpers import DOC_KEY, PARENT_KEY, WP_BASE
 
@@ -18,6 +21,14 @@ class TestFindParentId:
             parent_key=UUID(parent_key) if parent_key else None,
         )
 
+    def _index(self, tmp_path: Path, *, wordpress_id: str = "55", folder: str = "docs") -> DocumentIndex:
+        index = DocumentIndex(tmp_path)
+        index.add(
+            tmp_path / folder / "parent.md",
+            frontmatter.loads(f"---\ndocument_key: {PARENT_KEY}\nwordpress_id: {wordpress_id}\n---\n"),
+        )
+        return index
+
     def test_returns_none_when_no_parent_key(self):
         client = httpx.Client(base_url=WP_BASE)
         result = _find_parent_id(self._metadata(), "docs", client)
@@ -60,3 +71,44 @@ class TestFindParentId:
             )
             with pytest.raises(httpx.HTTPStatusError):
                 _find_parent_id(self._metadata(parent_key=PARENT_KEY), "docs", client)
+
+    def test_resolves_parent_from_index_without_request(self, tmp_path):
+        # No routes registered — any HTTP request would raise
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            result = _find_parent_id(
+                self._metadata(parent_key=PARENT_KEY), "docs", client, self._index(tmp_path)
+            )
+        assert result == 55
+
+    def test_falls_back_to_remote_when_index_has_no_wordpress_id(self, tmp_path):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[{"id": 77}])
+            )
+            result = _find_parent_id(
+                self._metadata(parent_key=PARENT_KEY), "docs", client, self._index(tmp_path, wordpress_id="")
+            )
+        assert route.called
+        assert result == 77
+
+    def test_falls_back_to_remote_when_key_not_indexed(self, tmp_path):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[{"id": 77}])
+            )
+            result = _find_parent_id(
+                self._metadata(parent_key=PARENT_KEY), "docs", client, DocumentIndex(tmp_path)
+            )
+        assert route.called
+        assert result == 77
+
+    def test_ignores_indexed_parent_of_another_content_type(self, tmp_path):
+        with respx.mock, httpx.Client(base_url=WP_BASE) as client:
+            route = respx.get(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(200, json=[{"id": 77}])
+            )
+            result = _find_parent_id(
+                self._metadata(parent_key=PARENT_KEY), "docs", client, self._index(tmp_path, folder="pages")
+            )
+        assert route.called
+        assert result == 77
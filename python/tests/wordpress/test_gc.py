@@ -0,0 +1,87 @@
+import json
+
+import httpx
+import respx
+
+from d2cms.wordpress import Orphan, gc
+from tests.wordpress._helpers import WP_BASE, _doc, _write_doc
+
+KEEP_KEY = "00000001-0000-7000-8000-000000000000"
+GONE_KEY = "00000002-0000-7000-8000-000000000000"
+
+
+def _mock_listing(*posts: tuple[int, str]) -> respx.Route:
+    return respx.get(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(200, json=[
+        {"id": wordpress_id, "meta": {"document_key": key, "document_hash": "h"}} for wordpress_id, key in posts
+    ], headers={"X-WP-TotalPages": "1"}))
+
+
+class TestGc:
+    def test_reports_posts_without_a_local_document(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/kept.md", KEEP_KEY, wordpress_id=1)
+        with respx.mock:
+            _mock_listing((1, KEEP_KEY), (2, GONE_KEY))
+            summary = gc(cfg)
+        assert summary.orphans == [Orphan("docs", GONE_KEY, 2)]
+        assert summary.trashed == []
+
+    def test_reports_duplicates_of_a_local_document(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/kept.md", KEEP_KEY, wordpress_id=5)
+        with respx.mock:
+            _mock_listing((3, KEEP_KEY), (5, KEEP_KEY))
+            summary = gc(cfg)
+        assert summary.orphans == [Orphan("docs", KEEP_KEY, 3, duplicate=True)]
+
+    def test_apply_trashes_orphans(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/kept.md", KEEP_KEY, wordpress_id=1)
+        with respx.mock:
+            _mock_listing((1, KEEP_KEY), (2, GONE_KEY), (3, GONE_KEY))
+            trash = respx.delete(url__regex=rf"{WP_BASE}wp/v2/docs/\d+").mock(return_value=httpx.Response(200, json={}))
+            summary = gc(cfg, apply=True, workers=2)
+        assert sorted(call.request.url.path for call in trash.calls) == [
+            "/wp-json/wp/v2/docs/2", "/wp-json/wp/v2/docs/3"
+        ]
+        assert [orphan.wordpress_id for orphan in summary.trashed] == [2, 3]
+
+    def test_apply_with_batch_size_sends_batched_deletes(self, tmp_path, cfg):
+        (tmp_path / "docs").mkdir()
+        with respx.mock:
+            _mock_listing(*((i, f"gone-{i}") for i in range(1, 4)))
+            batch = respx.post(f"{WP_BASE}batch/v1").mock(side_effect=lambda request: httpx.Response(207, json={
+                "responses": [
+                    {"status": 404 if sub["path"].endswith("/3") else 200, "body": {}}
+                    for sub in json.loads(request.content)["requests"]
+                ]
+            }))
+            summary = gc(cfg, apply=True, batch_size=2)
+        assert batch.call_count == 2
+        assert len(summary.trashed) == 3 # already gone counts as trashed
+        assert summary.failed == []
+
+    def test_records_posts_that_could_not_be_trashed(self, tmp_path, cfg):
+        (tmp_path / "docs").mkdir()
+        with respx.mock:
+            _mock_listing((2, GONE_KEY))
+            respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(403, json={"code": "rest_cannot_delete"})
+            )
+            summary = gc(cfg, apply=True)
+        assert summary.trashed == []
+        assert [orphan.wordpress_id for orphan, _ in summary.failed] == [2]
+
+    def test_does_not_trash_when_a_local_document_is_unreadable(self, tmp_path, cfg):
+        broken = _write_doc(tmp_path / "docs", "---\ntitle: [unclosed\n---\n", "broken.md")
+        with respx.mock:
+            _mock_listing((2, GONE_KEY))
+            trash = respx.delete(f"{WP_BASE}wp/v2/docs/2")
+            summary = gc(cfg, apply=True)
+        assert summary.unreadable == [broken]
+        assert not trash.called
+
+    def test_ignores_content_types_without_a_local_directory(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/kept.md", KEEP_KEY)
+        with respx.mock:
+            docs = _mock_listing()
+            summary = gc(cfg)
+        assert docs.called # respx would reject requests for wp/v2/pages or wp/v2/posts
+        assert summary.orphans == []
@@ -0,0 +1,125 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import frontmatter
+import pytest
+import respx
+
+from d2cms.docs import generate_doc_hash, update_frontmatter
+from d2cms.state import SyncState
+from d2cms.wordpress import plan_sync
+from tests.wordpress._helpers import DOC_KEY, PARENT_KEY, _doc, _synced_doc, _write_doc
+
+CHILD_KEY = "00000002-0000-7000-8000-000000000000"
+
+
+def _actions(sync_plan):
+    return {document.path: document.action for document in sync_plan.documents}
+
+
+@pytest.fixture(autouse=True)
+def no_network():
+    # Every request fails: respx rejects anything without a matching route
+    with respx.mock(assert_all_called=False):
+        yield
+
+
+class TestPlanSync:
+    def test_classifies_documents(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/new.md", "00000000-0000-7000-8000-000000000001")
+        _doc(tmp_path, "docs/changed.md", "00000000-0000-7000-8000-000000000002", wordpress_id=5)
+        _doc(tmp_path, "docs/old.md", "00000000-0000-7000-8000-000000000003", wordpress_id=6, deprecated=True)
+        _synced_doc(tmp_path, wp_id=7, name="same.md")
+
+        sync_plan = plan_sync(cfg)
+
+        assert _actions(sync_plan) == {
+            "docs/changed.md": "update",
+            "docs/new.md": "create",
+            "docs/old.md": "delete",
+            "docs/same.md": "skip",
+        }
+        assert (sync_plan.requests.post, sync_plan.requests.delete) == (2, 1)
+
+    def test_force_plans_unchanged_documents_as_updates(self, tmp_path, cfg):
+        _synced_doc(tmp_path, wp_id=7)
+        assert _actions(plan_sync(cfg, force=True)) == {"docs/test.md": "update"}
+
+    def test_files_vouched_for_by_sync_state_are_skipped_unopened(self, tmp_path, cfg):
+        doc_file = _synced_doc(tmp_path, wp_id=7)
+        synced_at = time.time() - 10
+        os.utime(doc_file, (synced_at, synced_at))
+        with SyncState(cfg.docs_dir) as state:
+            state.record(doc_file, DOC_KEY, 7, "v2:sha256:recorded", rewritten=True)
+
+        with patch("d2cms.wordpress.frontmatter.load") as load:
+            sync_plan = plan_sync(cfg)
+
+        load.assert_not_called()
+        assert sync_plan.documents[0].action == "skip"
+        assert sync_plan.documents[0].reason == "unchanged since last sync"
+
+    def test_parent_in_index_needs_no_lookup(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        _doc(tmp_path, "docs/parent/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+
+        sync_plan = plan_sync(cfg)
+
+        assert _actions(sync_plan) == {"docs/parent.md": "create", "docs/parent/child.md": "create"}
+        assert sync_plan.requests.parent_lookup == 0
+
+    def test_unknown_parent_costs_a_lookup(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+        assert plan_sync(cfg).requests.parent_lookup == 1
+
+    def test_unreadable_documents_are_blocked(self, tmp_path, cfg):
+        _write_doc(tmp_path / "docs", "---\ntitle: [unclosed\n---\n", "broken.md")
+        assert _actions(plan_sync(cfg)) == {"docs/broken.md": "blocked"}
+
+    def test_children_of_blocked_documents_are_blocked(self, tmp_path, cfg):
+        parent = _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        _doc(tmp_path, "docs/parent/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+
+        def _hash(post, relative_path, algorithm):
+            if relative_path.name == parent.name:
+                raise ValueError("cannot hash")
+            return "v2:sha256:x"
+
+        with patch("d2cms.wordpress.generate_doc_hash", side_effect=_hash):
+            sync_plan = plan_sync(cfg)
+
+        reasons = {document.path: document.reason for document in sync_plan.documents}
+        assert _actions(sync_plan) == {"docs/parent.md": "blocked", "docs/parent/child.md": "blocked"}
+        assert reasons["docs/parent/child.md"] == "parent document is blocked: docs/parent.md"
+
+    def test_cycles_are_blocked(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/a.md", PARENT_KEY, parent_key=CHILD_KEY)
+        _doc(tmp_path, "docs/b.md", CHILD_KEY, parent_key=PARENT_KEY)
+        sync_plan = plan_sync(cfg)
+        assert set(_actions(sync_plan).values()) == {"blocked"}
+        assert {d.reason for d in sync_plan.documents} == {"parent_key forms a cycle"}
+
+    def test_counts_new_tags_once(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/a.md", "00000000-0000-7000-8000-000000000001", tags="[Alpha, Beta]")
+        _doc(tmp_path, "docs/b.md", "00000000-0000-7000-8000-000000000002", tags="[alpha]")
+        known = _doc(tmp_path, "docs/known.md", "00000000-0000-7000-8000-000000000003", tags="[Beta]")
+        update_frontmatter(
+            known, wordpress_id=9, document_hash=generate_doc_hash(frontmatter.load(known), Path("docs/known.md"))
+        )
+
+        requests = plan_sync(cfg).requests
+        assert requests.tag_listing == 1
+        assert requests.tag_create == 1 # Beta is already on a synced document
+
+    def test_batches_are_counted_per_dependency_level(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        for i in range(3):
+            _doc(tmp_path, f"docs/other-{i}.md", f"00000000-0000-7000-8000-00000000001{i}")
+        _doc(tmp_path, "docs/parent/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+
+        requests = plan_sync(cfg, batch_size=2).requests
+        assert requests.post == 5
+        assert requests.batch == 3 # 4 writes in level one, 1 in level two
+        assert requests.total == 3
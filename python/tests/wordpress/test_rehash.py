@@ -0,0 +1,52 @@
+import os
+import time
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.docs import generate_doc_hash
+from d2cms.state import SyncState
+from d2cms.wordpress import rehash
+from tests.docs.test_generate_doc_hash import _make_v1_hash
+from tests.wordpress._helpers import _new_doc
+
+
+def _v1_synced_doc(tmp_path: Path, name: str) -> Path:
+    doc_file = _new_doc(tmp_path, name)
+    post = frontmatter.load(doc_file)
+    post.metadata["document_hash"] = _make_v1_hash(post, Path("docs") / name)
+    doc_file.write_text(frontmatter.dumps(post))
+    return doc_file
+
+
+class TestRehash:
+    def test_migrates_in_sync_documents_only(self, tmp_path, cfg):
+        synced = _v1_synced_doc(tmp_path, "synced.md")
+        edited = _v1_synced_doc(tmp_path, "edited.md")
+        edited.write_text(edited.read_text() + "\nEdited\n")
+
+        summary = rehash(cfg)
+
+        assert (summary.rewritten, summary.current, summary.changed) == (1, 0, [edited])
+        post = frontmatter.load(synced)
+        assert post.metadata["document_hash"] == generate_doc_hash(post, Path("docs/synced.md"))
+
+    def test_second_run_finds_nothing_to_do(self, tmp_path, cfg):
+        _v1_synced_doc(tmp_path, "synced.md")
+        rehash(cfg)
+        summary = rehash(cfg)
+        assert (summary.rewritten, summary.current) == (0, 1)
+
+    def test_refreshes_sync_state_of_rewritten_files(self, tmp_path, cfg):
+        doc_file = _v1_synced_doc(tmp_path, "synced.md")
+        old = time.time_ns() - 60_000_000_000
+        os.utime(doc_file, ns=(old, old))
+        with SyncState(tmp_path) as state:
+            state.record(doc_file, "key", 7, "old-hash")
+
+        rehash(cfg)
+
+        known = SyncState(tmp_path)._rows["docs/synced.md"]
+        assert known.wordpress_id == 7
+        assert known.document_hash.startswith("v2:")
+        assert known.mtime_ns == doc_file.stat().st_mtime_ns
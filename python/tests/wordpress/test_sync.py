@@ -1,25 +1,35 @@
+import json
+from dataclasses import replace
 from unittest.mock import ANY, patch
 
 import httpx
 import respx
 
-from d2cms.report import SyncReport
+from d2cms.http import make_client
+from d2cms.report import ReportStream, SyncReport
 from d2cms.wordpress import sync
-from tests.wordpress._helpers import WP_BASE, _new_doc
+from tests.wordpress._helpers import WP_BASE, _new_doc, _write_doc
 
 
 class TestSync:
     def test_sync_calls_sync_directory_with_docs_dir(self, cfg):
         with patch("d2cms.wordpress._sync_directory") as mock_dir:
             sync(cfg)
-        mock_dir.assert_called_once_with(cfg.docs_dir, cfg, ANY, force=False)
+        mock_dir.assert_called_once_with(cfg.docs_dir, ANY)
 
     def test_sync_uses_custom_path_when_provided(self, tmp_path, cfg):
         subdir = tmp_path / "section"
         subdir.mkdir()
         with patch("d2cms.wordpress._sync_directory") as mock_dir:
             sync(cfg, path=subdir)
-        mock_dir.assert_called_once_with(subdir, cfg, ANY, force=False)
+        mock_dir.assert_called_once_with(subdir, ANY)
+
+    def test_sync_passes_run_context(self, cfg):
+        with patch("d2cms.wordpress._sync_directory") as mock_dir:
+            sync(cfg, force=True)
+        ctx = mock_dir.call_args.args[1]
+        assert ctx.cfg is cfg
+        assert ctx.force is True
 
     def test_sync_returns_report(self, cfg):
         with patch("d2cms.wordpress._sync_directory"):
@@ -28,9 +38,137 @@ class TestSync:
 
     def test_sync_report_contains_failures(self, tmp_path, cfg):
         _new_doc(tmp_path)
-        with respx.mock:
+        with respx.mock, patch("d2cms.http.time.sleep"):
             respx.post(f"{WP_BASE}wp/v2/docs").mock(
                 return_value=httpx.Response(503, json={"code": "service_unavailable"})
             )
             report = sync(cfg)
         assert report.has_failures
+
+    def test_sync_streams_each_document_into_a_given_report(self, tmp_path, cfg):
+        _new_doc(tmp_path)
+        path = tmp_path / "results" / "run.jsonl"
+        with respx.mock, ReportStream(path, "jsonl", include_outcomes=True) as stream:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 5}))
+            report = sync(cfg, report=SyncReport(stream))
+        assert json.loads(path.read_text()) == {
+            "doc_path": "docs/test.md", "content_type": "docs", "wordpress_id": 5, "error_summary": None, "outcome": "created",
+        }
+        assert report.outcomes == {"created": 1}
+
+    def test_sync_uploads_referenced_images(self, tmp_path, cfg):
+        doc = _new_doc(tmp_path)
+        doc.write_text(doc.read_text() + "\n![diagram](img/diagram.png)\n")
+        (tmp_path / "docs" / "img").mkdir()
+        (tmp_path / "docs" / "img" / "diagram.png").write_bytes(b"\x89PNG")
+        url = "https://test-wp.test/wp-content/uploads/diagram.png"
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/media").mock(
+                return_value=httpx.Response(201, json={"id": 3, "source_url": url})
+            )
+            post = respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 5}))
+            report = sync(replace(cfg, upload_media=True))
+        assert not report.has_failures
+        assert f'<img src="{url}" alt="diagram" />' in json.loads(post.calls.last.request.content)["content"]
+
+    def test_sync_leaves_references_alone_by_default(self, tmp_path, cfg):
+        doc = _new_doc(tmp_path)
+        doc.write_text(doc.read_text() + "\n![diagram](img/diagram.png)\n")
+        (tmp_path / "docs" / "img").mkdir()
+        (tmp_path / "docs" / "img" / "diagram.png").write_bytes(b"\x89PNG")
+        with respx.mock:
+            post = respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 5}))
+            report = sync(cfg)
+        assert not report.has_failures
+        assert '<img src="img/diagram.png"' in json.loads(post.calls.last.request.content)["content"]
+
+    def test_sync_resends_content_when_only_a_referenced_image_changed(self, tmp_path, cfg):
+        cfg = replace(cfg, upload_media=True)
+        doc = _new_doc(tmp_path)
+        doc.write_text(doc.read_text() + "\n![diagram](img/diagram.png)\n")
+        image = tmp_path / "docs" / "img" / "diagram.png"
+        image.parent.mkdir()
+        image.write_bytes(b"\x89PNG first")
+
+        def _uploaded(request: httpx.Request) -> httpx.Response:
+            name = "first.png" if request.content.endswith(b"first") else "second.png"
+            return httpx.Response(201, json={"id": 3, "source_url": f"https://test-wp.test/{name}"})
+
+        with respx.mock:
+            respx.get(f"{WP_BASE}wp/v2/media").mock(return_value=httpx.Response(200, json=[]))
+            respx.post(f"{WP_BASE}wp/v2/media").mock(side_effect=_uploaded)
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 5}))
+            sync(cfg)
+            image.write_bytes(b"\x89PNG second")
+            update = respx.post(f"{WP_BASE}wp/v2/docs/5").mock(return_value=httpx.Response(200, json={"id": 5}))
+            report = sync(cfg)
+        assert not report.has_failures
+        assert "https://test-wp.test/second.png" in json.loads(update.calls.last.request.content)["content"]
+
+    def test_sync_report_counts_retries(self, tmp_path, cfg):
+        _new_doc(tmp_path)
+        with respx.mock, patch("d2cms.http.time.sleep"):
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(side_effect=[
+                httpx.Response(503),
+                httpx.Response(429),
+                httpx.Response(201, json={"id": 1}),
+            ])
+            report = sync(cfg)
+        assert not report.has_failures
+        assert report.retry_count == 2
+        assert report.retries_by_reason == {"503": 1, "429": 1}
+
+    def test_sync_builds_one_client_for_the_whole_run(self, tmp_path, cfg):
+        _new_doc(tmp_path, "a.md")
+        _new_doc(tmp_path, "b.md")
+        with (
+            respx.mock,
+            patch("d2cms.wordpress.make_client", wraps=make_client) as mock_make_client,
+        ):
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 1})
+            )
+            sync(cfg)
+        mock_make_client.assert_called_once_with(cfg, on_retry=ANY, throttle=ANY, on_response=ANY)
+
+    def test_sync_uses_concurrent_engine_when_workers_given(self, cfg):
+        with (
+            patch("d2cms.wordpress._sync_concurrent") as mock_concurrent,
+            patch("d2cms.wordpress._sync_directory") as mock_dir,
+        ):
+            sync(cfg, workers=4)
+        mock_concurrent.assert_called_once_with(cfg.docs_dir, ANY, 4)
+        mock_dir.assert_not_called()
+
+    def test_sync_loads_tag_catalog_once_for_all_documents(self, tmp_path, cfg):
+        for name in ("a.md", "b.md", "c.md"):
+            _write_doc(
+                tmp_path / "docs",
+                "---\ndocument_key: 00000001-0000-7000-8000-000000000000\ntitle: T\nslug: t\n"
+                "tags: [python]\nwordpress_id: \ndocument_hash: \n---\n\nContent\n",
+                name,
+            )
+        with respx.mock:
+            tags_route = respx.get(f"{WP_BASE}wp/v2/tags").mock(
+                return_value=httpx.Response(200, json=[{"id": 3, "name": "python", "slug": "python"}])
+            )
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 1})
+            )
+            report = sync(cfg)
+        assert not report.has_failures
+        assert tags_route.call_count == 1
+
+    def test_sync_report_records_outcomes_phases_and_requests(self, tmp_path, cfg):
+        _new_doc(tmp_path)
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 1}))
+            report = sync(cfg)
+        assert report.outcomes == {"created": 1}
+        assert {"parse", "hash", "render", "post", "write_back"} <= set(report.phases)
+        assert report.endpoints["POST wp/v2/docs"].statuses == {201: 1}
+
+        with respx.mock:
+            report = sync(cfg)
+        assert report.outcomes == {"skipped": 1}
@@ -0,0 +1,123 @@
+import json
+
+import frontmatter
+import httpx
+import respx
+
+from d2cms.wordpress import sync
+from tests.wordpress._helpers import PARENT_KEY, WP_BASE, _doc
+
+
+class _BatchEndpoint:
+    """A stand-in for WordPress' batch/v1 endpoint backed by an in-memory table of posts"""
+
+    def __init__(self, fail_slugs: frozenset[str] = frozenset()) -> None:
+        self.posts: dict[int, dict[str, object]] = {}
+        self.batches: list[list[dict[str, object]]] = []
+        self._fail_slugs = fail_slugs
+        self._next_id = 100
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        sub_requests = json.loads(request.content)["requests"]
+        self.batches.append(sub_requests)
+        return httpx.Response(207, json={"responses": [self._apply(sub) for sub in sub_requests]})
+
+    def _apply(self, sub: dict[str, object]) -> dict[str, object]:
+        body = sub.get("body") or {}
+        assert isinstance(body, dict)
+        if body.get("slug") in self._fail_slugs:
+            return {"status": 400, "body": {"code": "rest_invalid_param", "message": "Invalid parameter"}}
+
+        parts = str(sub["path"]).strip("/").split("/")
+        post_id = int(parts[3]) if len(parts) > 3 else None
+        if sub["method"] == "POST" and post_id is None:
+            post_id, self._next_id = self._next_id, self._next_id + 1
+            self.posts[post_id] = {**body, "id": post_id}
+            return {"status": 201, "body": self.posts[post_id]}
+        if post_id not in self.posts:
+            return {"status": 404, "body": {"code": "rest_post_invalid_id"}}
+        if sub["method"] == "DELETE":
+            return {"status": 200, "body": self.posts.pop(post_id)}
+        self.posts[post_id].update(body)
+        return {"status": 200, "body": self.posts[post_id]}
+
+
+def _key(i: int) -> str:
+    return f"00000000-0000-7000-8000-{i:012d}"
+
+
+class TestSyncBatched:
+    def test_groups_documents_into_batches(self, tmp_path, cfg):
+        files = [_doc(tmp_path, f"docs/doc-{i}.md", _key(i)) for i in range(5)]
+        endpoint = _BatchEndpoint()
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(side_effect=endpoint)
+            report = sync(cfg, batch_size=2)
+
+        assert not report.has_failures
+        assert [len(batch) for batch in endpoint.batches] == [2, 2, 1]
+        ids = {frontmatter.load(f).metadata["wordpress_id"] for f in files}
+        assert ids == set(endpoint.posts)
+
+    def test_children_are_sent_after_their_parent(self, tmp_path, cfg):
+        _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        child = _doc(tmp_path, "docs/parent/child.md", _key(2), parent_key=PARENT_KEY)
+        endpoint = _BatchEndpoint()
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(side_effect=endpoint)
+            report = sync(cfg, batch_size=25)
+
+        assert not report.has_failures
+        assert [[sub["body"]["slug"] for sub in batch] for batch in endpoint.batches] == [["parent"], ["child"]]
+        parent_id = next(iter(endpoint.posts))
+        assert endpoint.batches[1][0]["body"]["parent"] == parent_id
+        assert frontmatter.load(child).metadata["wordpress_id"] == parent_id + 1
+
+    def test_deletes_are_batched_after_every_update(self, tmp_path, cfg):
+        updated = _doc(tmp_path, "docs/updated.md", _key(1), wordpress_id=100)
+        removed = _doc(tmp_path, "docs/removed.md", _key(2), wordpress_id=101, deprecated=True)
+        endpoint = _BatchEndpoint()
+        endpoint.posts = {100: {"id": 100}, 101: {"id": 101}}
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(side_effect=endpoint)
+            report = sync(cfg, batch_size=25)
+
+        assert not report.has_failures
+        assert [[(sub["method"], sub["path"]) for sub in batch] for batch in endpoint.batches] == [
+            [("POST", "/wp/v2/docs/100")],
+            [("DELETE", "/wp/v2/docs/101")],
+        ]
+        assert frontmatter.load(updated).metadata["document_hash"]
+        assert not removed.exists()
+        assert set(endpoint.posts) == {100}
+
+    def test_failed_sub_request_is_recorded_per_document(self, tmp_path, cfg):
+        good = _doc(tmp_path, "docs/good.md", _key(1))
+        _doc(tmp_path, "docs/bad.md", PARENT_KEY)
+        orphan = _doc(tmp_path, "docs/bad/orphan.md", _key(3), parent_key=PARENT_KEY)
+        endpoint = _BatchEndpoint(fail_slugs=frozenset({"bad"}))
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(side_effect=endpoint)
+            report = sync(cfg, batch_size=25)
+
+        assert report.failure_count == 2 # the failed document and the child skipped after it
+        assert frontmatter.load(good).metadata["wordpress_id"] == 100
+        assert not frontmatter.load(orphan).metadata["wordpress_id"]
+        assert len(endpoint.batches) == 1
+
+    def test_failed_batch_adopts_creates_that_took_effect(self, tmp_path, cfg):
+        landed = _doc(tmp_path, "docs/landed.md", _key(1))
+        lost = _doc(tmp_path, "docs/lost.md", _key(2))
+        with respx.mock:
+            respx.post(f"{WP_BASE}batch/v1").mock(side_effect=httpx.ReadTimeout("slow"))
+            respx.get(
+                f"{WP_BASE}wp/v2/docs", params={"meta_key": "document_key", "meta_value": _key(1)}
+            ).mock(return_value=httpx.Response(200, json=[{"id": 7}]))
+            respx.get(
+                f"{WP_BASE}wp/v2/docs", params={"meta_key": "document_key", "meta_value": _key(2)}
+            ).mock(return_value=httpx.Response(200, json=[]))
+            report = sync(cfg, batch_size=25)
+
+        assert report.failure_count == 1
+        assert frontmatter.load(landed).metadata["wordpress_id"] == 7
+        assert not frontmatter.load(lost).metadata["wordpress_id"]
@@ -0,0 +1,174 @@
+import json
+import subprocess
+from dataclasses import replace
+
+import frontmatter
+import httpx
+import pytest
+import respx
+
+from d2cms.wordpress import sync
+from tests.wordpress._helpers import DOC_KEY, PARENT_KEY, WP_BASE, _doc
+
+CHILD_KEY = "00000002-0000-7000-8000-000000000000"
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _doc(tmp_path, "docs/first.md", DOC_KEY, wordpress_id="1")
+    _doc(tmp_path, "docs/second.md", CHILD_KEY, wordpress_id="2")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+class TestSyncSince:
+    def test_syncs_only_changed_documents(self, repo, cfg):
+        doc = repo / "docs" / "first.md"
+        doc.write_text(doc.read_text().replace("Body of first", "Edited"))
+        with respx.mock:
+            first = respx.post(f"{WP_BASE}wp/v2/docs/1").mock(
+                return_value=httpx.Response(200, json={"id": 1})
+            )
+            report = sync(cfg, since="HEAD")
+        assert first.called
+        assert not report.has_failures
+
+    def test_no_changes_makes_no_requests(self, repo, cfg):
+        with respx.mock:
+            report = sync(cfg, since="HEAD")
+        assert not report.has_failures
+
+    def test_deleted_file_removes_remote_post(self, repo, cfg):
+        _git(repo, "rm", "-q", "docs/second.md")
+        with respx.mock:
+            route = respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            report = sync(cfg, since="HEAD")
+        assert route.called
+        assert not report.has_failures
+
+    def test_deleted_file_already_gone_remotely_is_not_a_failure(self, repo, cfg):
+        _git(repo, "rm", "-q", "docs/second.md")
+        with respx.mock:
+            respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(404, json={"code": "rest_post_invalid_id"})
+            )
+            report = sync(cfg, since="HEAD")
+        assert not report.has_failures
+
+    def test_deleted_deprecated_file_is_not_deleted_again(self, repo, cfg):
+        _doc(repo, "docs/retired.md", PARENT_KEY, wordpress_id="3", deprecated=True)
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "deprecate")
+        _git(repo, "rm", "-q", "docs/retired.md")
+        with respx.mock:
+            report = sync(cfg, since="HEAD")
+        assert not report.has_failures
+
+    def test_failed_remote_delete_is_reported(self, repo, cfg):
+        _git(repo, "rm", "-q", "docs/second.md")
+        with respx.mock:
+            respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(403, json={"code": "rest_forbidden"})
+            )
+            report = sync(cfg, since="HEAD")
+        assert report.failure_count == 1
+        assert report._failures[0].doc_path == "docs/second.md"
+        assert report._failures[0].wordpress_id == 2
+
+    def test_deleted_file_honours_force_delete_mode(self, repo, cfg):
+        _git(repo, "rm", "-q", "docs/second.md")
+        with respx.mock:
+            route = respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            report = sync(replace(cfg, delete_mode="force"), since="HEAD")
+        assert route.calls[0].request.url.params["force"] == "true"
+        assert not report.has_failures
+
+    def test_rename_away_from_markdown_removes_remote_post(self, repo, cfg):
+        _git(repo, "mv", "docs/second.md", "docs/second.txt")
+        with respx.mock:
+            route = respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            report = sync(cfg, since="HEAD")
+        assert route.called
+        assert not report.has_failures
+
+    def test_rename_updates_existing_post(self, repo, cfg):
+        (repo / "docs" / "section").mkdir()
+        _git(repo, "mv", "docs/second.md", "docs/section/second.md")
+        with respx.mock:
+            update = respx.post(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(200, json={"id": 2})
+            )
+            report = sync(cfg, since="HEAD")
+        assert update.called
+        assert not report.has_failures
+
+    def test_rename_across_content_types_recreates_post(self, repo, cfg):
+        (repo / "pages").mkdir()
+        _git(repo, "mv", "docs/second.md", "pages/second.md")
+        with respx.mock:
+            delete = respx.delete(f"{WP_BASE}wp/v2/docs/2").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            create = respx.post(f"{WP_BASE}wp/v2/pages").mock(
+                return_value=httpx.Response(201, json={"id": 40})
+            )
+            report = sync(cfg, since="HEAD")
+        assert delete.called
+        assert create.called
+        assert not report.has_failures
+        assert frontmatter.load(repo / "pages" / "second.md").metadata["wordpress_id"] == 40
+
+    def test_pulls_in_unsynced_ancestor(self, repo, cfg):
+        _doc(repo, "docs/guide.md", PARENT_KEY)
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "parent whose sync failed")
+        _doc(repo, "docs/guide/intro.md", "00000004-0000-7000-8000-000000000000", parent_key=PARENT_KEY)
+
+        def _create(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            return httpx.Response(201, json={"id": 50 if body["slug"] == "guide" else 51})
+
+        with respx.mock:
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(side_effect=_create)
+            report = sync(cfg, since="HEAD")
+        assert not report.has_failures
+        bodies = [json.loads(call.request.content) for call in create.calls]
+        assert [body["slug"] for body in bodies] == ["guide", "intro"]
+        assert bodies[1]["parent"] == 50
+
+    def test_synced_ancestor_resolves_parent_locally(self, repo, cfg):
+        _doc(repo, "docs/first/child.md", "00000004-0000-7000-8000-000000000000", parent_key=DOC_KEY)
+        with respx.mock:
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 60})
+            )
+            report = sync(cfg, since="HEAD")
+        assert not report.has_failures
+        assert json.loads(create.calls[0].request.content)["parent"] == 1
+
+    def test_malformed_ancestor_is_recorded_not_raised(self, repo, cfg):
+        (repo / "docs" / "guide.md").write_text("---\ntitle: [unclosed\n---\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "malformed parent")
+        _doc(repo, "docs/guide/intro.md", "00000004-0000-7000-8000-000000000000")
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 61}))
+            report = sync(cfg, since="HEAD")
+        assert [failure.doc_path for failure in report._failures] == ["docs/guide.md"]
@@ -0,0 +1,91 @@
+import json
+import threading
+
+import httpx
+import respx
+
+from d2cms.wordpress import _sync_concurrent
+from tests.wordpress._helpers import PARENT_KEY, WP_BASE, _doc
+
+CHILD_KEY = "00000002-0000-7000-8000-000000000000"
+
+
+class TestSyncConcurrent:
+    def test_syncs_independent_documents(self, tmp_path, ctx, report):
+        for i in range(6):
+            _doc(tmp_path, f"docs/doc-{i}.md", f"00000000-0000-7000-8000-00000000000{i}")
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 1})
+            )
+            _sync_concurrent(tmp_path, ctx, workers=4)
+        assert route.call_count == 6
+        assert not report.has_failures
+
+    def test_parent_created_before_child(self, tmp_path, ctx, report):
+        _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        _doc(tmp_path, "docs/parent/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+        created: list[dict[str, object]] = []
+        lock = threading.Lock()
+
+        def _create(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            with lock:
+                created.append(body)
+            return httpx.Response(201, json={"id": 10 if body["slug"] == "parent" else 20})
+
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(side_effect=_create)
+            _sync_concurrent(tmp_path, ctx, workers=4)
+        assert [body["slug"] for body in created] == ["parent", "child"]
+        # Resolved from the run's index: no parent meta query was needed
+        assert created[1]["parent"] == 10
+        assert not report.has_failures
+
+    def test_descendants_of_failed_parent_are_skipped_and_reported(self, tmp_path, ctx, report):
+        _doc(tmp_path, "docs/parent.md", PARENT_KEY)
+        _doc(tmp_path, "docs/parent/child.md", CHILD_KEY, parent_key=PARENT_KEY)
+        _doc(tmp_path, "docs/parent/child/grandchild.md", "00000003-0000-7000-8000-000000000000", parent_key=CHILD_KEY)
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(500, json={"code": "internal_error"})
+            )
+            _sync_concurrent(tmp_path, ctx, workers=4)
+        assert route.call_count == 1
+        assert report.failure_count == 3
+        skipped = {f.doc_path: f for f in report._failures}
+        assert "docs/parent.md" in skipped["docs/parent/child/grandchild.md"].error_summary
+        assert skipped["docs/parent/child.md"].content_type == "docs"
+        assert "docs/parent.md" in skipped["docs/parent/child.md"].error_summary
+
+    def test_siblings_of_failed_document_still_sync(self, tmp_path, ctx, report):
+        _doc(tmp_path, "docs/broken.md", PARENT_KEY)
+        _doc(tmp_path, "docs/fine.md", CHILD_KEY)
+
+        def _create(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["slug"] == "broken":
+                return httpx.Response(500, json={})
+            return httpx.Response(201, json={"id": 5})
+
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs").mock(side_effect=_create)
+            _sync_concurrent(tmp_path, ctx, workers=2)
+        assert route.call_count == 2
+        assert report.failure_count == 1
+        assert report._failures[0].doc_path == "docs/broken.md"
+
+    def test_parent_key_cycle_is_reported(self, tmp_path, ctx, report):
+        _doc(tmp_path, "docs/a.md", PARENT_KEY, parent_key=CHILD_KEY)
+        _doc(tmp_path, "docs/b.md", CHILD_KEY, parent_key=PARENT_KEY)
+        with respx.mock:
+            _sync_concurrent(tmp_path, ctx, workers=2)
+        assert report.failure_count == 2
+        assert all("cycle" in f.error_summary for f in report._failures)
+
+    def test_skips_sync_results_directory(self, tmp_path, ctx, report):
+        results = tmp_path / "d2cms-sync-results"
+        results.mkdir()
+        (results / "20260219T120000.csv").write_text("doc_path,error\n")
+        with respx.mock:
+            _sync_concurrent(tmp_path, ctx, workers=2)
+        assert not report.has_failures
@@ -0,0 +1,80 @@
+import frontmatter
+import httpx
+import respx
+
+from d2cms.wordpress import _sync_paths
+from tests.wordpress._helpers import DOC_KEY, WP_BASE, _existing_doc, _synced_doc
+
+
+def _watched(ctx, doc_file):
+    """Index a document as the initial sync of a watch session would."""
+    ctx.index.add(doc_file, frontmatter.load(doc_file))
+    return doc_file
+
+
+class TestSyncPaths:
+    def test_modified_document_is_synced(self, tmp_path, ctx):
+        doc_file = _watched(ctx, _existing_doc(tmp_path, 1, "stale"))
+        with respx.mock:
+            update = respx.post(f"{WP_BASE}wp/v2/docs/1").mock(
+                return_value=httpx.Response(200, json={"id": 1})
+            )
+            _sync_paths({doc_file}, ctx, workers=1)
+        assert update.called
+        assert not ctx.report.has_failures
+
+    def test_own_write_back_is_not_synced_again(self, tmp_path, ctx):
+        doc_file = _watched(ctx, _existing_doc(tmp_path, 1, "stale"))
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs/1").mock(return_value=httpx.Response(200, json={"id": 1}))
+            _sync_paths({doc_file}, ctx, workers=1)
+        with respx.mock:
+            _sync_paths({doc_file}, ctx, workers=1)
+        assert not ctx.report.has_failures
+
+    def test_deleted_document_removes_remote_post(self, tmp_path, ctx):
+        doc_file = _watched(ctx, _synced_doc(tmp_path, 7))
+        doc_file.unlink()
+        with respx.mock:
+            delete = respx.delete(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            _sync_paths({doc_file}, ctx, workers=1)
+        assert delete.called
+        assert ctx.index.get(DOC_KEY) is None
+
+    def test_deleted_directory_removes_posts_inside_it(self, tmp_path, ctx):
+        doc_file = _watched(ctx, _synced_doc(tmp_path, 7, name="guide/intro.md"))
+        doc_file.unlink()
+        doc_file.parent.rmdir()
+        with respx.mock:
+            delete = respx.delete(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"deleted": True})
+            )
+            _sync_paths({doc_file.parent}, ctx, workers=1)
+        assert delete.called
+
+    def test_moved_document_updates_its_post(self, tmp_path, ctx):
+        old_path = _watched(ctx, _existing_doc(tmp_path, 1, "stale"))
+        new_path = tmp_path / "docs" / "section" / "test.md"
+        new_path.parent.mkdir()
+        old_path.rename(new_path)
+        with respx.mock:
+            update = respx.post(f"{WP_BASE}wp/v2/docs/1").mock(
+                return_value=httpx.Response(200, json={"id": 1})
+            )
+            _sync_paths({old_path, new_path}, ctx, workers=1)
+        assert update.called
+        assert ctx.index.get(DOC_KEY).path == new_path
+        assert not ctx.report.has_failures
+
+    def test_failed_delete_is_reported(self, tmp_path, ctx):
+        doc_file = _watched(ctx, _synced_doc(tmp_path, 7))
+        doc_file.unlink()
+        with respx.mock:
+            respx.delete(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(403, json={"code": "rest_forbidden"})
+            )
+            _sync_paths({doc_file}, ctx, workers=1)
+        assert ctx.report.failure_count == 1
+        assert ctx.report._failures[0].wordpress_id == 7
@@ -0,0 +1,57 @@
+import json
+from dataclasses import replace
+
+import httpx
+import respx
+
+from d2cms.cache import RenderCache
+from d2cms.wordpress import _sync_directory
+from tests.wordpress._helpers import WP_BASE, _write_doc
+
+
+def _doc(tmp_path, i):
+    return _write_doc(
+        tmp_path / "docs",
+        f"---\ndocument_key: 00000000-0000-7000-8000-00000000000{i}\ntitle: Doc {i}\nslug: doc-{i}\n"
+        "tags: []\nwordpress_id: \ndocument_hash: \ndeprecated: false\n---\n\nHello **world**\n",
+        f"doc-{i}.md",
+    )
+
+
+class TestSyncPrepared:
+    def test_sends_html_rendered_by_prepare_jobs(self, tmp_path, ctx, report):
+        for i in range(4):
+            _doc(tmp_path, i)
+        ctx = replace(ctx, jobs=2)
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 7})
+            )
+            _sync_directory(tmp_path, ctx)
+
+        assert route.call_count == 4
+        assert all(
+            "<strong>world</strong>" in json.loads(call.request.content)["content"] for call in route.calls
+        )
+        assert not ctx.prepared
+        assert not report.has_failures
+
+    def test_stores_worker_renders_in_render_cache(self, tmp_path, ctx):
+        for i in range(2):
+            _doc(tmp_path, i)
+        renders = RenderCache(tmp_path)
+        ctx = replace(ctx, jobs=2, renders=renders)
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 7}))
+            _sync_directory(tmp_path, ctx)
+
+        assert len(renders._added) == 2
+
+    def test_records_unparseable_document_as_failure(self, tmp_path, ctx, report):
+        _doc(tmp_path, 1)
+        _write_doc(tmp_path / "docs", "---\ntitle: [unclosed\n---\n", "bad.md")
+        with respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 7}))
+            _sync_directory(tmp_path, replace(ctx, jobs=2))
+
+        assert [f.doc_path for f in report._failures] == ["docs/bad.md"]
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import frontmatter
+import httpx
+import respx
+
+from d2cms.docs import generate_doc_hash
+from d2cms.wordpress import sync
+from tests.wordpress._helpers import DOC_KEY, WP_BASE, _new_doc, _synced_doc
+
+
+def _mock_sweep(*posts: tuple[int, str]) -> respx.Route:
+    return respx.get(f"{WP_BASE}wp/v2/docs", params={"_fields": "id,meta.document_key,meta.document_hash"}).mock(
+        return_value=httpx.Response(200, json=[
+            {"id": wordpress_id, "meta": {"document_key": DOC_KEY, "document_hash": document_hash}}
+            for wordpress_id, document_hash in posts
+        ], headers={"X-WP-TotalPages": "1"})
+    )
+
+
+def _hash(doc_file: Path) -> str:
+    return generate_doc_hash(frontmatter.load(doc_file), Path("docs") / doc_file.name)
+
+
+class TestSyncReconcile:
+    def test_adopts_matching_post_without_sending_it(self, tmp_path, cfg):
+        doc_file = _new_doc(tmp_path)
+        with respx.mock:
+            _mock_sweep((42, _hash(doc_file)))
+            report = sync(cfg, reconcile=True)
+
+        metadata = frontmatter.load(doc_file).metadata
+        assert metadata["wordpress_id"] == 42
+        assert metadata["document_hash"] == _hash(doc_file)
+        assert report.reconciled == {"adopted": 1, "current": 1}
+        assert not report.has_failures
+
+    def test_updates_adopted_post_when_its_content_differs(self, tmp_path, cfg):
+        doc_file = _new_doc(tmp_path)
+        with respx.mock:
+            _mock_sweep((42, "v2:sha256:stale"))
+            update = respx.post(f"{WP_BASE}wp/v2/docs/42").mock(return_value=httpx.Response(200, json={"id": 42}))
+            report = sync(cfg, reconcile=True)
+
+        assert update.called
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 42
+        assert report.reconciled == {"adopted": 1}
+
+    def test_creates_documents_wordpress_does_not_have(self, tmp_path, cfg):
+        doc_file = _new_doc(tmp_path)
+        with respx.mock:
+            _mock_sweep()
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 7}))
+            report = sync(cfg, reconcile=True)
+
+        assert create.called
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 7
+        assert report.reconciled == {}
+
+    def test_resends_unchanged_document_when_wordpress_drifted(self, tmp_path, cfg):
+        doc_file = _synced_doc(tmp_path, wp_id=42)
+        with respx.mock:
+            sync(cfg) # records the file in the local sync state
+            _mock_sweep((42, "v2:sha256:from-another-branch"))
+            update = respx.post(f"{WP_BASE}wp/v2/docs/42").mock(return_value=httpx.Response(200, json={"id": 42}))
+            report = sync(cfg, reconcile=True)
+
+        assert update.called
+        assert not report.has_failures
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 42
+
+    def test_skips_unchanged_document_wordpress_agrees_with(self, tmp_path, cfg):
+        doc_file = _synced_doc(tmp_path, wp_id=42)
+        with respx.mock:
+            _mock_sweep((42, _hash(doc_file)))
+            report = sync(cfg, reconcile=True)
+
+        assert report.reconciled == {}
+        assert not report.has_failures
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import frontmatter
+import httpx
+import pytest
+import respx
+
+from d2cms.wordpress import _sync_document
+from tests.wordpress._helpers import DOC_KEY, WP_BASE, _existing_doc, _new_doc
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("d2cms.http.time.sleep"):
+        yield
+
+
+class TestSyncRetries:
+    def test_timed_out_create_adopts_post_it_created(self, tmp_path, ctx, report):
+        doc_file = _new_doc(tmp_path)
+        with respx.mock:
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(side_effect=httpx.ReadTimeout("slow"))
+            lookup = respx.get(
+                f"{WP_BASE}wp/v2/docs", params={"meta_key": "document_key", "meta_value": DOC_KEY}
+            ).mock(return_value=httpx.Response(200, json=[{"id": 31}]))
+            assert _sync_document(doc_file, ctx)
+
+        assert create.call_count == 1
+        assert lookup.called
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 31
+        assert not report.has_failures
+
+    def test_failed_create_is_resent_when_no_post_exists(self, tmp_path, ctx, report):
+        doc_file = _new_doc(tmp_path)
+        with respx.mock:
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                side_effect=[httpx.Response(502), httpx.Response(201, json={"id": 32})]
+            )
+            respx.get(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(200, json=[]))
+            assert _sync_document(doc_file, ctx)
+
+        assert create.call_count == 2
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 32
+
+    def test_update_is_resent_without_lookup(self, tmp_path, ctx, report):
+        doc_file = _existing_doc(tmp_path, wp_id=5, stored_hash="stale")
+        with respx.mock:
+            update = respx.post(f"{WP_BASE}wp/v2/docs/5").mock(
+                side_effect=[httpx.ReadTimeout("slow"), httpx.Response(200, json={"id": 5})]
+            )
+            assert _sync_document(doc_file, ctx)
+
+        assert update.call_count == 2
+        assert not report.has_failures
@@ -0,0 +1,124 @@
+import json
+import os
+import time
+from unittest.mock import patch
+
+import frontmatter
+import httpx
+import respx
+
+from d2cms.state import STATE_DIR
+from d2cms.wordpress import sync
+from tests.wordpress._helpers import WP_BASE, _new_doc
+
+
+def _age(path):
+    old = time.time_ns() - 60_000_000_000
+    os.utime(path, ns=(old, old))
+
+
+def _first_sync(tmp_path, cfg):
+    """Sync a new doc until it settles, then age it so its fingerprint is trusted."""
+    doc_file = _new_doc(tmp_path)
+    with respx.mock:
+        respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 7}))
+        respx.post(f"{WP_BASE}wp/v2/docs/7").mock(return_value=httpx.Response(200, json={"id": 7}))
+        for _ in range(2):
+            assert not sync(cfg).has_failures
+    _age(doc_file)
+    # Written back during the sync, so one more run records a trusted fingerprint
+    with respx.mock:
+        assert not sync(cfg).has_failures
+    return doc_file
+
+
+class TestSyncStateSkipping:
+    def test_unchanged_file_is_not_opened_on_next_run(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        with respx.mock, patch("d2cms.wordpress.frontmatter.load") as mock_load:
+            report = sync(cfg)
+        mock_load.assert_not_called()
+        assert not report.has_failures
+
+    def test_state_is_stored_under_docs_dir(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        assert (tmp_path / STATE_DIR).is_dir()
+
+    def test_state_directory_is_not_synced(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        with respx.mock:
+            report = sync(cfg, rescan=True)
+        assert not report.has_failures
+
+    def test_modified_file_is_synced_again(self, tmp_path, cfg):
+        doc_file = _first_sync(tmp_path, cfg)
+        post = frontmatter.load(doc_file)
+        post.content = "New content"
+        doc_file.write_text(frontmatter.dumps(post))
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            sync(cfg)
+        assert route.called
+
+    def test_rescan_reads_every_file(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        with respx.mock, patch("d2cms.wordpress.frontmatter.load", wraps=frontmatter.load) as mock_load:
+            sync(cfg, rescan=True)
+        assert mock_load.call_count == 1
+
+    def test_force_reads_every_file(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            sync(cfg, force=True)
+        assert route.called
+
+    def test_deleting_the_state_is_safe(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        for f in (tmp_path / STATE_DIR).iterdir():
+            f.unlink()
+        with respx.mock:
+            report = sync(cfg)
+        assert not report.has_failures
+
+    def test_update_sends_only_the_changed_fields(self, tmp_path, cfg):
+        doc_file = _first_sync(tmp_path, cfg)
+        post = frontmatter.load(doc_file)
+        post["order"] = 3
+        doc_file.write_text(frontmatter.dumps(post))
+        with respx.mock, patch("d2cms.wordpress.to_html") as mock_render:
+            route = respx.post(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            assert not sync(cfg).has_failures
+        mock_render.assert_not_called()
+        body = json.loads(route.calls.last.request.content)
+        assert set(body) == {"menu_order", "meta"}
+        assert body["menu_order"] == 3
+
+    def test_content_change_does_not_resend_metadata(self, tmp_path, cfg):
+        doc_file = _first_sync(tmp_path, cfg)
+        post = frontmatter.load(doc_file)
+        post.content = "New content"
+        doc_file.write_text(frontmatter.dumps(post))
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            sync(cfg)
+        assert set(json.loads(route.calls.last.request.content)) == {"content", "meta"}
+
+    def test_force_sends_every_field(self, tmp_path, cfg):
+        _first_sync(tmp_path, cfg)
+        with respx.mock:
+            route = respx.post(f"{WP_BASE}wp/v2/docs/7").mock(
+                return_value=httpx.Response(200, json={"id": 7})
+            )
+            sync(cfg, force=True)
+        assert {"content", "title", "slug", "parent", "tags", "status"} <= set(
+            json.loads(route.calls.last.request.content)
+        )
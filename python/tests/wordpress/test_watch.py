@@ -0,0 +1,39 @@
+import threading
+
+import httpx
+import respx
+
+from d2cms.wordpress import watch
+from tests.wordpress._helpers import WP_BASE, _new_doc
+
+
+class TestWatch:
+    def test_syncs_then_picks_up_edits(self, tmp_path, cfg):
+        doc_file = _new_doc(tmp_path)
+        stop = threading.Event()
+        passes = []
+
+        def _on_sync(report, paths):
+            passes.append((paths, report.failure_count))
+            if paths is None:
+                doc_file.write_text(doc_file.read_text().replace("Content here", "Edited while watching"))
+            else:
+                stop.set()
+
+        with respx.mock:
+            create = respx.post(f"{WP_BASE}wp/v2/docs").mock(
+                return_value=httpx.Response(201, json={"id": 5})
+            )
+            update = respx.post(f"{WP_BASE}wp/v2/docs/5").mock(
+                return_value=httpx.Response(200, json={"id": 5})
+            )
+            watch(cfg, polling=True, poll_interval=0.01, debounce=0.05, stop=stop, on_sync=_on_sync)
+
+        assert create.call_count == 1
+        assert update.call_count == 1
+        assert passes == [(None, 0), ({doc_file}, 0)]
+
+    def test_returns_once_stopped(self, tmp_path, cfg):
+        stop = threading.Event()
+        with respx.mock:
+            watch(cfg, polling=True, poll_interval=0.01, stop=stop, on_sync=lambda *_: stop.set())
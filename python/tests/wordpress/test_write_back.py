@@ -0,0 +1,39 @@
+from dataclasses import replace
+from unittest.mock import patch
+
+import frontmatter
+import httpx
+import respx
+
+from d2cms.wordpress import _sync_document
+from d2cms.writeback import FrontmatterWriter
+from tests.wordpress._helpers import WP_BASE, _new_doc
+
+
+class TestWriteBack:
+    def test_queued_write_back_updates_file_and_state(self, tmp_path, ctx, report):
+        doc_file = _new_doc(tmp_path)
+        with FrontmatterWriter() as writer, respx.mock:
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 12}))
+            assert _sync_document(doc_file, replace(ctx, writer=writer))
+            writer.flush()
+
+        assert frontmatter.load(doc_file).metadata["wordpress_id"] == 12
+        assert ctx.state._rows["docs/test.md"].wordpress_id == 12
+        assert not report.has_failures
+
+    def test_failed_queued_write_back_is_reported(self, tmp_path, ctx, report):
+        doc_file = _new_doc(tmp_path)
+        with (
+            FrontmatterWriter() as writer,
+            respx.mock,
+            patch("d2cms.writeback.write_frontmatter_fields", side_effect=OSError("disk full")),
+        ):
+            respx.post(f"{WP_BASE}wp/v2/docs").mock(return_value=httpx.Response(201, json={"id": 12}))
+            _sync_document(doc_file, replace(ctx, writer=writer))
+            writer.flush()
+
+        [failure] = report._failures
+        assert failure.wordpress_id == 12
+        assert "disk full" in failure.error_summary
+        assert len(ctx.state) == 0
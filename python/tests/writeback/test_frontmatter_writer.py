@@ -0,0 +1,73 @@
+import threading
+from pathlib import Path
+
+import frontmatter
+
+from d2cms.writeback import FrontmatterWriter
+
+
+def _doc(tmp_path: Path, name: str = "doc.md") -> Path:
+    f = tmp_path / name
+    f.write_text("---\ntitle: T\nwordpress_id: \ndocument_hash: \n---\n\nBody\n")
+    return f
+
+
+class TestFrontmatterWriter:
+    def test_writes_submitted_fields(self, tmp_path):
+        doc = _doc(tmp_path)
+        with FrontmatterWriter() as writer:
+            writer.submit(doc, {"wordpress_id": 4, "document_hash": "h"})
+        post = frontmatter.load(doc)
+        assert (post.metadata["wordpress_id"], post.metadata["document_hash"]) == (4, "h")
+
+    def test_flush_waits_for_pending_writes(self, tmp_path):
+        docs = [_doc(tmp_path, f"doc-{i}.md") for i in range(20)]
+        writer = FrontmatterWriter()
+        for i, doc in enumerate(docs):
+            writer.submit(doc, {"wordpress_id": i})
+        writer.flush()
+        assert [frontmatter.load(doc).metadata["wordpress_id"] for doc in docs] == list(range(20))
+        writer.close()
+
+    def test_callback_runs_after_write(self, tmp_path):
+        doc = _doc(tmp_path)
+        seen: list[object] = []
+
+        def _callback(error: Exception | None) -> None:
+            seen.append((error, frontmatter.load(doc).metadata["wordpress_id"]))
+
+        with FrontmatterWriter() as writer:
+            writer.submit(doc, {"wordpress_id": 9}, _callback)
+        assert seen == [(None, 9)]
+
+    def test_callback_receives_write_error(self, tmp_path):
+        errors: list[Exception | None] = []
+        with FrontmatterWriter() as writer:
+            writer.submit(tmp_path / "missing.md", {"wordpress_id": 1}, errors.append)
+        assert len(errors) == 1
+        assert isinstance(errors[0], FileNotFoundError)
+
+    def test_updates_to_one_file_are_merged(self, tmp_path):
+        doc = _doc(tmp_path)
+        gate = threading.Event()
+        writer = FrontmatterWriter()
+        # Hold the writer thread so both updates land in the same batch
+        writer.submit(_doc(tmp_path, "other.md"), {}, lambda _: gate.wait())
+        writer.submit(doc, {"wordpress_id": 1})
+        writer.submit(doc, {"document_hash": "h"})
+        gate.set()
+        writer.close()
+        post = frontmatter.load(doc)
+        assert (post.metadata["wordpress_id"], post.metadata["document_hash"]) == (1, "h")
+
+    def test_close_is_idempotent(self):
+        writer = FrontmatterWriter()
+        writer.close()
+        writer.close()
+
+    def test_reports_each_write_duration(self, tmp_path):
+        doc = _doc(tmp_path)
+        durations = []
+        with FrontmatterWriter(on_write=durations.append) as writer:
+            writer.submit(doc, {"wordpress_id": 1})
+        assert len(durations) == 1